@@ -3,7 +3,11 @@ Health check endpoints for monitoring application status.
 """
 from fastapi import APIRouter
 from datetime import datetime
-from typing import Dict
+from typing import Any, Dict
+
+from app.services.nutrition import nutrition_service
+from app.services.vision import vision_service
+from app.utils.memory import process_memory
 
 router = APIRouter(tags=["health"])
 
@@ -22,6 +26,21 @@ async def health_check() -> Dict[str, str]:
     }
 
 
+@router.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    """
+    Runtime metrics for the lookup pipeline (cache hit rates, etc.)
+    and image decoding (pool timings, event-loop blocking), plus this
+    worker's memory (unique vs shared pages).
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "nutrition": nutrition_service.stats(),
+        "vision": vision_service.stats(),
+        "process": process_memory()
+    }
+
+
 @router.get("/")
 async def root() -> Dict[str, str]:
     """
@@ -5,8 +5,10 @@ import logging
 from fastapi import APIRouter, Request, Response, HTTPException, BackgroundTasks
 from typing import Dict, Any, Optional
 
+from app.config import settings
 from app.services.whatsapp import whatsapp_service
 from app.models.message import WhatsAppWebhookPayload, ImageMessage
+from app.utils.deadline import Deadline
 from app.utils.formatting import format_error_message, format_welcome_message
 
 logger = logging.getLogger(__name__)
@@ -57,6 +59,9 @@ async def receive_webhook(
     Returns:
         200 OK immediately (processing continues in background)
     """
+    # The response budget starts now, not when the background task runs
+    deadline = Deadline(settings.response_timeout_seconds)
+
     try:
         # Get raw body for signature validation
         body = await request.body()
@@ -80,7 +85,8 @@ async def receive_webhook(
                 # Process image in background to return 200 quickly
                 background_tasks.add_task(
                     whatsapp_service.process_meal_image,
-                    image_msg
+                    image_msg,
+                    deadline
                 )
                 logger.info(f"Queued image processing for {image_msg.sender}")
             else:
@@ -14,6 +14,8 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     max_image_size_mb: int = 10
     response_timeout_seconds: int = 8
+    # Part of the response budget kept back for building and sending the reply
+    response_reply_reserve_seconds: float = 1.0
 
     # WhatsApp Cloud API
     whatsapp_api_token: str
@@ -23,6 +25,94 @@ class Settings(BaseSettings):
 
     # USDA FoodData Central API
     usda_api_key: str
+    usda_timeout_seconds: float = 5.0
+    usda_max_connections: int = 20
+    usda_max_keepalive_connections: int = 10
+    usda_keepalive_expiry_seconds: float = 30.0
+    usda_max_concurrent_lookups: int = 4
+    # Request a single search result and decode only that result
+    usda_trimmed_fetch: bool = True
+
+    # USDA circuit breaker: open when, over the last window_size calls, the
+    # failure or slow-call rate reaches its threshold; retry after open_seconds
+    usda_breaker_window_size: int = 20
+    usda_breaker_min_calls: int = 5
+    usda_breaker_failure_rate_threshold: float = 0.5
+    usda_breaker_slow_call_seconds: float = 2.0
+    usda_breaker_slow_call_rate_threshold: float = 0.5
+    usda_breaker_open_seconds: float = 30.0
+
+    # Hedged USDA requests (off by default): if a search is slower than this
+    # percentile of recent latency, send one duplicate and use the first answer.
+    # max_ratio caps duplicates as a share of all searches.
+    usda_hedging_enabled: bool = False
+    usda_hedge_percentile: float = 95.0
+    usda_hedge_max_ratio: float = 0.05
+    usda_hedge_min_samples: int = 20
+
+    # Client-side token bucket for the API key's hourly quota (0 disables).
+    # Lookups queue for a token up to max_wait, or less when the request
+    # deadline is closer; otherwise they fall back to cache/defaults.
+    # Each of usda_quota_workers processes sharing the key gets an equal share;
+    # python -m app.prefork sets it to its worker count, set it yourself for
+    # uvicorn --workers N.
+    usda_quota_per_hour: int = 1000
+    usda_quota_burst: int = 20
+    usda_quota_workers: int = 1
+    usda_quota_max_wait_seconds: float = 5.0
+
+    # Nutrition source: "usda_api" (live API) or "local" (imported FDC database)
+    nutrition_source: str = "usda_api"
+    fdc_database_path: str = "data/fdc.db"
+    food_match_min_score: float = 0.35
+
+    # Nutrition lookup cache
+    nutrition_cache_max_entries: int = 2048
+    nutrition_cache_ttl_seconds: int = 86400
+    # Labels with no match are cached separately, for a shorter time
+    nutrition_negative_cache_max_entries: int = 1024
+    nutrition_negative_cache_ttl_seconds: int = 900
+    # Distinct labels tracked in the /metrics default-fallback report
+    nutrition_fallback_labels_tracked: int = 200
+
+    # Persistent nutrition store (SQLite, shared by workers; empty path disables)
+    nutrition_store_path: Optional[str] = "data/nutrition_cache.db"
+    nutrition_store_ttl_seconds: int = 30 * 86400
+    nutrition_store_batch_size: int = 32
+    nutrition_store_flush_interval_seconds: float = 5.0
+
+    # Vision: workers for image decoding/preprocessing (off the event loop).
+    # "thread" pool, or "process" pool (one model copy per worker, no GIL contention)
+    vision_decode_workers: int = 2
+    vision_executor: str = "thread"
+    # Vision backend: "demo" (simulated detections) or "onnx" (local CPU classifier)
+    vision_backend: str = "demo"
+    vision_model_path: str = "models/food101.onnx"
+    # One label per line; defaults to <model>.labels.txt
+    vision_model_labels_path: Optional[str] = None
+    # Threads per inference; 0 = CPU cores / vision_decode_workers (no oversubscription)
+    vision_intra_op_threads: int = 0
+    vision_top_k: int = 3
+    # Micro-batching: concurrent images share one forward pass (1 = no batching).
+    # Pays off when per-call overhead dominates (large models, many cores); measure first.
+    vision_max_batch_size: int = 1
+    vision_max_batch_wait_ms: float = 10.0
+    # Re-sent / forwarded photos: detections cached by perceptual hash (0 disables).
+    # Only the 64-bit hash is kept, never pixels.
+    vision_cache_max_entries: int = 1024
+    vision_cache_ttl_seconds: int = 86400
+    # Hamming distance (of 64 bits) still treated as the same photo
+    vision_cache_max_distance: int = 4
+    # Flat/low-texture photos hash alike; hashes with fewer set (or clear) bits are not cached
+    vision_cache_min_detail_bits: int = 8
+    vision_min_confidence: float = 0.2
+
+    # Preforked server (python -m app.prefork): workers forked after preloading.
+    # Workers exiting sooner than min_uptime count as crashes: restarts back off,
+    # and after max_worker_crashes in a row the master exits with an error.
+    server_workers: int = 2
+    server_worker_min_uptime_seconds: float = 10.0
+    server_max_worker_crashes: int = 5
 
     # Hugging Face (Optional)
     hugging_face_token: Optional[str] = None
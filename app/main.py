@@ -9,6 +9,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api import health, webhooks
+from app.services.nutrition import nutrition_service
+from app.services.vision import vision_service
 
 # Configure logging
 logging.basicConfig(
@@ -25,9 +27,13 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting SnapCalories API in {settings.environment} mode")
     logger.info(f"Max image size: {settings.max_image_size_mb}MB")
     logger.info(f"Response timeout: {settings.response_timeout_seconds}s")
+    await nutrition_service.startup()
+    await vision_service.startup()
     yield
     # Shutdown
     logger.info("Shutting down SnapCalories API")
+    await vision_service.shutdown()
+    await nutrition_service.shutdown()
 
 
 # Initialize FastAPI application
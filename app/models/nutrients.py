@@ -0,0 +1,225 @@
+"""
+Nutrient registry and the fixed-layout nutrient vectors built from it.
+
+NUTRIENT_REGISTRY is the single list of tracked nutrients. It is compiled
+once at import into slot indexes, USDA ID lookups, %DV arrays and display
+sections, so the lookup/aggregation hot path never scans mapping dicts.
+Every nutrient lives at a fixed slot, so scaling, summing and %DV are
+single array operations instead of per-key dict loops.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Nutrient kinds; vitamins and minerals with a daily value are reported as %DV
+MACRO = 'macro'
+ENERGY = 'energy'
+VITAMIN = 'vitamin'
+MINERAL = 'mineral'
+
+# Section headings of the %DV part of the nutrition message, in display order
+DV_SECTION_TITLES: Tuple[Tuple[str, str], ...] = (
+    (VITAMIN, 'Vitamins'),
+    (MINERAL, 'Minerals'),
+)
+
+
+class NutrientSpec(NamedTuple):
+    """Registry entry describing one tracked nutrient."""
+    key: str
+    usda_ids: Tuple[int, ...]
+    unit: str
+    label: str
+    kind: str
+    daily_value: Optional[float] = None
+    default_per_100g: float = 0.0
+
+
+# Single source of truth for tracked nutrients. Slot order follows this tuple.
+# DVs are per 2000 calorie diet; defaults are the fallback profile used when
+# no food data is available.
+NUTRIENT_REGISTRY: Tuple[NutrientSpec, ...] = (
+    NutrientSpec('protein', (1003,), 'g', 'Protein', MACRO, default_per_100g=15.0),
+    NutrientSpec('carbs', (1005,), 'g', 'Carbohydrates', MACRO, default_per_100g=25.0),
+    NutrientSpec('fat', (1004,), 'g', 'Fat', MACRO, default_per_100g=8.0),
+    NutrientSpec('fiber', (1079,), 'g', 'Fiber', MACRO, default_per_100g=3.0),
+    NutrientSpec('calories', (1008,), 'kcal', 'Calories', ENERGY, default_per_100g=200.0),
+    NutrientSpec('vitamin_a', (1106,), 'mcg RAE', 'Vitamin A', VITAMIN, 900, 50.0),
+    NutrientSpec('vitamin_c', (1162,), 'mg', 'Vitamin C', VITAMIN, 90, 10.0),
+    NutrientSpec('vitamin_b12', (1178,), 'mcg', 'Vitamin B12', VITAMIN, 2.4, 0.5),
+    NutrientSpec('iron', (1089,), 'mg', 'Iron', MINERAL, 18, 2.0),
+    NutrientSpec('magnesium', (1090,), 'mg', 'Magnesium', MINERAL, 420, 30.0),
+    NutrientSpec('potassium', (1092,), 'mg', 'Potassium', MINERAL, 4700, 200.0),
+)
+
+
+class NutrientTables(NamedTuple):
+    """Lookup tables compiled from a nutrient registry."""
+    keys: Tuple[str, ...]
+    index: Dict[str, int]
+    usda_slots: Dict[Any, int]
+    usda_mapping: Dict[str, str]
+    dv_keys: Tuple[str, ...]
+    dv_fields: Tuple[str, ...]
+    dv_slots: np.ndarray
+    dv_reference: np.ndarray
+    dv_sections: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...]
+    defaults: np.ndarray
+
+
+def dv_field_name(key: str) -> str:
+    """MicroNutrients field holding the %DV of a nutrient."""
+    return f"{key}_dv"
+
+
+def compile_registry(registry: Iterable[NutrientSpec]) -> NutrientTables:
+    """
+    Compile a nutrient registry into lookup tables and index arrays.
+
+    Args:
+        registry: Nutrient specs, in slot order
+
+    Returns:
+        NutrientTables for the registry
+    """
+    specs = tuple(registry)
+    keys = tuple(spec.key for spec in specs)
+    if len(set(keys)) != len(keys):
+        raise ValueError(f"Duplicate nutrient keys in registry: {keys}")
+    index = {key: slot for slot, key in enumerate(keys)}
+
+    # USDA nutrient ID -> slot; accepts both int and str IDs
+    usda_slots: Dict[Any, int] = {}
+    usda_mapping: Dict[str, str] = {}
+    for slot, spec in enumerate(specs):
+        for usda_id in spec.usda_ids:
+            if usda_id in usda_slots:
+                raise ValueError(f"USDA nutrient ID {usda_id} mapped to more than one nutrient")
+            usda_slots[usda_id] = slot
+            usda_slots[str(usda_id)] = slot
+            usda_mapping[str(usda_id)] = spec.key
+
+    dv_specs = [spec for spec in specs if spec.daily_value]
+    dv_keys = tuple(spec.key for spec in dv_specs)
+
+    sections: List[Tuple[str, Tuple[Tuple[str, str], ...]]] = []
+    for kind, title in DV_SECTION_TITLES:
+        lines = tuple((dv_field_name(spec.key), spec.label) for spec in dv_specs if spec.kind == kind)
+        if lines:
+            sections.append((title, lines))
+
+    return NutrientTables(
+        keys=keys,
+        index=index,
+        usda_slots=usda_slots,
+        usda_mapping=usda_mapping,
+        dv_keys=dv_keys,
+        dv_fields=tuple(dv_field_name(key) for key in dv_keys),
+        dv_slots=np.array([index[key] for key in dv_keys], dtype=np.intp),
+        dv_reference=np.array([spec.daily_value for spec in dv_specs], dtype=np.float64),
+        dv_sections=tuple(sections),
+        defaults=np.array([spec.default_per_100g for spec in specs], dtype=np.float64),
+    )
+
+
+NUTRIENT_TABLES = compile_registry(NUTRIENT_REGISTRY)
+
+# Slot order of every NutrientVector
+NUTRIENT_KEYS: Tuple[str, ...] = NUTRIENT_TABLES.keys
+NUTRIENT_INDEX: Dict[str, int] = NUTRIENT_TABLES.index
+
+# USDA FoodData Central nutrient ID -> slot / internal nutrient key
+USDA_NUTRIENT_SLOTS: Dict[Any, int] = NUTRIENT_TABLES.usda_slots
+USDA_NUTRIENT_MAPPING: Dict[str, str] = NUTRIENT_TABLES.usda_mapping
+
+# Nutrients reported as % Daily Value, laid out against vector slots
+DAILY_VALUES: Dict[str, float] = {
+    spec.key: spec.daily_value for spec in NUTRIENT_REGISTRY if spec.daily_value
+}
+
+
+class NutrientVector(Mapping[str, float]):
+    """
+    Immutable nutrient amounts in NUTRIENT_KEYS order.
+    Behaves as a read-only Mapping so existing dict-style callers
+    (nutrition_data.get('calories')) keep working.
+
+    degraded marks amounts that were estimated because the nutrition source
+    could not be consulted; it carries through scaling and summing.
+    """
+
+    __slots__ = ('values', 'degraded')
+
+    def __init__(self, values: Iterable[float], degraded: bool = False):
+        """
+        Wrap nutrient amounts.
+
+        Args:
+            values: One amount per slot, in NUTRIENT_KEYS order
+            degraded: True if the amounts are a fallback estimate
+        """
+        array = np.array(values, dtype=np.float64)
+        if array.shape != (len(NUTRIENT_KEYS),):
+            raise ValueError(f"Expected {len(NUTRIENT_KEYS)} nutrient values, got shape {array.shape}")
+        array.setflags(write=False)
+        self.values = array
+        self.degraded = degraded
+
+    @classmethod
+    def _wrap(cls, array: np.ndarray, degraded: bool = False) -> "NutrientVector":
+        """Adopt a freshly computed array without copying or re-validating it."""
+        vector = cls.__new__(cls)
+        array.setflags(write=False)
+        vector.values = array
+        vector.degraded = degraded
+        return vector
+
+    @classmethod
+    def zeros(cls) -> "NutrientVector":
+        """Vector with every nutrient at zero."""
+        return cls(np.zeros(len(NUTRIENT_KEYS)))
+
+    @classmethod
+    def from_dict(cls, nutrients: Mapping[str, float]) -> "NutrientVector":
+        """Build a vector from a key -> amount mapping (missing keys are zero)."""
+        if isinstance(nutrients, cls):
+            return nutrients
+        return cls([float(nutrients.get(key, 0.0)) for key in NUTRIENT_KEYS])
+
+    @classmethod
+    def sum(cls, vectors: Iterable["NutrientVector"]) -> "NutrientVector":
+        """Element-wise sum, accumulated in input order."""
+        total = np.zeros(len(NUTRIENT_KEYS))
+        degraded = False
+        for vector in vectors:
+            total += vector.values
+            degraded = degraded or vector.degraded
+        return cls._wrap(total, degraded)
+
+    def scaled(self, factor: float) -> "NutrientVector":
+        """Return every amount multiplied by factor."""
+        return NutrientVector._wrap(self.values * factor, self.degraded)
+
+    def as_degraded(self) -> "NutrientVector":
+        """Return the same amounts marked as a fallback estimate."""
+        return NutrientVector._wrap(self.values, degraded=True)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Plain dict copy (e.g. for JSON)."""
+        return dict(zip(NUTRIENT_KEYS, self.values.tolist()))
+
+    def __getitem__(self, key: str) -> float:
+        return float(self.values[NUTRIENT_INDEX[key]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(NUTRIENT_KEYS)
+
+    def __len__(self) -> int:
+        return len(NUTRIENT_KEYS)
+
+    def __repr__(self) -> str:
+        return f"NutrientVector({self.to_dict()})"
+
+
+# Fallback per-100g profile used when no food data is available
+DEFAULT_NUTRIENTS_PER_100G = NutrientVector(NUTRIENT_TABLES.defaults)
@@ -1,9 +1,11 @@
 """
 Nutrition data models for food analysis and results.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 from typing import Optional, List
 
+from app.models.nutrients import NUTRIENT_REGISTRY, dv_field_name
+
 
 class MacroNutrients(BaseModel):
     """Macronutrient breakdown in grams."""
@@ -13,14 +15,20 @@ class MacroNutrients(BaseModel):
     fiber: float = Field(..., ge=0, description="Fiber in grams")
 
 
-class MicroNutrients(BaseModel):
-    """Micronutrient breakdown with Daily Value percentages."""
-    vitamin_a_dv: Optional[float] = Field(None, ge=0, le=1000, description="Vitamin A as % DV")
-    vitamin_c_dv: Optional[float] = Field(None, ge=0, le=1000, description="Vitamin C as % DV")
-    vitamin_b12_dv: Optional[float] = Field(None, ge=0, le=1000, description="Vitamin B12 as % DV")
-    iron_dv: Optional[float] = Field(None, ge=0, le=1000, description="Iron as % DV")
-    magnesium_dv: Optional[float] = Field(None, ge=0, le=1000, description="Magnesium as % DV")
-    potassium_dv: Optional[float] = Field(None, ge=0, le=1000, description="Potassium as % DV")
+# Micronutrient breakdown with Daily Value percentages; one <key>_dv field
+# per registry nutrient that has a daily value
+MicroNutrients = create_model(
+    'MicroNutrients',
+    __doc__="Micronutrient breakdown with Daily Value percentages.",
+    **{
+        dv_field_name(spec.key): (
+            Optional[float],
+            Field(None, ge=0, le=1000, description=f"{spec.label} as % DV")
+        )
+        for spec in NUTRIENT_REGISTRY
+        if spec.daily_value
+    }
+)
 
 
 class FoodItem(BaseModel):
@@ -38,6 +46,10 @@ class NutritionResult(BaseModel):
     micros: Optional[MicroNutrients] = None
     detected_foods: List[FoodItem] = Field(default_factory=list)
     overall_confidence: float = Field(..., ge=0, le=1, description="Overall confidence score (0-1)")
+    degraded: bool = Field(
+        default=False,
+        description="True if some values are defaults because the nutrition source was unavailable"
+    )
     disclaimer: str = Field(
         default="This is an AI estimate. For medical nutrition advice, consult a healthcare professional.",
         description="Disclaimer message"
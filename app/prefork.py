@@ -0,0 +1,187 @@
+"""
+Preload-then-fork server mode.
+
+`uvicorn --workers N` starts N fresh interpreters, and each one loads its
+own copy of the vision model, the food match index and the nutrient
+tables. Instead, this loads all read-only assets once in a master process
+and then forks the uvicorn workers. The workers share those pages copy-on-
+write. gc.freeze() moves the preloaded objects out of the garbage
+collector's reach, so collections in the workers do not dirty them. The
+local FoodData Central database is memory-mapped by SQLite, so its pages
+come from the shared page cache anyway.
+
+Usage:
+    python -m app.prefork --workers 4 --port 8000
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import uvicorn
+
+from app.config import settings
+from app.utils.memory import process_memory
+
+logger = logging.getLogger(__name__)
+
+# Delay before replacing a crashed worker, doubled per crash in a row
+RESTART_BACKOFF_SECONDS = 0.5
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+
+
+def preload():
+    """
+    Import the application and load read-only assets before forking.
+
+    Returns:
+        The FastAPI application
+    """
+    from app.main import app
+    from app.services.nutrition import nutrition_service
+    from app.services.vision import vision_service
+
+    started = time.perf_counter()
+    nutrition_service.preload()
+    vision_service.preload()
+
+    # Keep the collector from touching (and un-sharing) everything loaded so far
+    gc.collect()
+    gc.freeze()
+
+    memory = process_memory()
+    logger.info(
+        f"Preloaded assets in {time.perf_counter() - started:.2f}s "
+        f"(master RSS {memory.get('rss_mb', '?')}MB)"
+    )
+    return app
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    """Create the listening socket shared by all workers."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _fork_worker(app, sock: socket.socket) -> int:
+    """Fork one uvicorn worker serving the shared socket; returns its PID."""
+    pid = os.fork()
+    if pid:
+        return pid
+
+    # Worker: default signal handling, uvicorn installs its own graceful shutdown
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=settings.log_level.lower(), lifespan="on")
+    server = uvicorn.Server(config)
+    exit_code = 1
+    try:
+        server.run(sockets=[sock])
+        # uvicorn returns without starting when the app's lifespan startup fails
+        exit_code = 0 if server.started else 1
+    finally:
+        os._exit(exit_code)
+
+
+def serve(workers: int, host: str, port: int) -> int:
+    """
+    Preload, fork workers and supervise them until SIGINT/SIGTERM.
+
+    Workers that die unexpectedly are replaced. A worker that exits within
+    SERVER_WORKER_MIN_UPTIME_SECONDS counts as a crash: replacements back off
+    exponentially, and after SERVER_MAX_WORKER_CRASHES crashes in a row the
+    master stops the remaining workers and exits with an error instead of
+    forking in a loop.
+
+    Args:
+        workers: Number of worker processes
+        host: Bind address
+        port: Bind port
+
+    Returns:
+        Exit code (1 if workers kept crashing)
+    """
+    # Workers split the USDA key's hourly quota (read when the app is imported)
+    settings.usda_quota_workers = max(1, workers)
+    app = preload()
+    sock = _bind(host, port)
+    # pid -> (worker slot, fork time)
+    children: Dict[int, Tuple[int, float]] = {}
+    stopping = False
+    crashes = 0
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for worker in range(max(1, workers)):
+        children[_fork_worker(app, sock)] = (worker, time.monotonic())
+    logger.info(f"Serving on {host}:{port} with {len(children)} preforked workers: {sorted(children)}")
+
+    exit_code = 0
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        child = children.pop(pid, None)
+        if child is None or stopping:
+            continue
+
+        worker, started_at = child
+        if time.monotonic() - started_at >= settings.server_worker_min_uptime_seconds:
+            crashes = 0
+            logger.warning(f"Worker {pid} exited (status {status}), starting a replacement")
+            children[_fork_worker(app, sock)] = (worker, time.monotonic())
+            continue
+
+        crashes += 1
+        if crashes >= settings.server_max_worker_crashes:
+            logger.error(f"Worker {pid} exited right after start (status {status}), "
+                         f"{crashes} crashes in a row; shutting down")
+            stop(signal.SIGTERM, None)
+            exit_code = 1
+            continue
+
+        backoff = min(MAX_RESTART_BACKOFF_SECONDS, RESTART_BACKOFF_SECONDS * 2 ** (crashes - 1))
+        logger.warning(f"Worker {pid} exited right after start (status {status}), "
+                       f"restarting in {backoff:.1f}s ({crashes} crashes in a row)")
+        time.sleep(backoff)
+        if not stopping:
+            children[_fork_worker(app, sock)] = (worker, time.monotonic())
+
+    sock.close()
+    logger.info("All workers stopped")
+    return exit_code
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Run SnapCalories with assets preloaded once and shared by forked workers."
+    )
+    parser.add_argument("--workers", type=int, default=settings.server_workers,
+                        help=f"Worker processes (default: {settings.server_workers})")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port (default: 8000)")
+    args = parser.parse_args(argv)
+
+    return serve(args.workers, args.host, args.port)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
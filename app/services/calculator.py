@@ -2,8 +2,11 @@
 Nutrition calculation engine for macros, calories, and micronutrients.
 """
 import logging
-from typing import Dict, List
+from typing import List, Mapping
 
+import numpy as np
+
+from app.models.nutrients import DAILY_VALUES, NUTRIENT_TABLES, NutrientVector
 from app.models.nutrition import MacroNutrients, MicroNutrients, NutritionResult, FoodItem
 
 logger = logging.getLogger(__name__)
@@ -12,22 +15,15 @@ logger = logging.getLogger(__name__)
 class NutritionCalculator:
     """Calculator for nutrition values and daily value percentages."""
 
-    # Daily Value (DV) reference values based on 2000 calorie diet
-    DAILY_VALUES = {
-        'vitamin_a': 900,  # mcg RAE
-        'vitamin_c': 90,   # mg
-        'vitamin_b12': 2.4,  # mcg
-        'iron': 18,  # mg
-        'magnesium': 420,  # mg
-        'potassium': 4700,  # mg
-    }
-
-    def calculate_macros(self, nutrition_data: Dict[str, float]) -> MacroNutrients:
+    # Daily Value (DV) reference values based on 2000 calorie diet, from the nutrient registry
+    DAILY_VALUES = DAILY_VALUES
+
+    def calculate_macros(self, nutrition_data: Mapping[str, float]) -> MacroNutrients:
         """
         Extract macronutrient values.
 
         Args:
-            nutrition_data: Dict with nutrition values
+            nutrition_data: NutrientVector (or dict) with nutrition values
 
         Returns:
             MacroNutrients object
@@ -39,7 +35,7 @@ class NutritionCalculator:
             fiber=nutrition_data.get('fiber', 0.0)
         )
 
-    def calculate_calories(self, macros: MacroNutrients, nutrition_data: Dict[str, float]) -> float:
+    def calculate_calories(self, macros: MacroNutrients, nutrition_data: Mapping[str, float]) -> float:
         """
         Calculate total calories.
         Uses provided calories if available, otherwise calculates from macros.
@@ -65,42 +61,20 @@ class NutritionCalculator:
 
         return round(calculated, 0)
 
-    def calculate_micronutrients(self, nutrition_data: Dict[str, float]) -> MicroNutrients:
+    def calculate_micronutrients(self, nutrition_data: Mapping[str, float]) -> MicroNutrients:
         """
         Calculate micronutrient values with Daily Value percentages.
 
         Args:
-            nutrition_data: Dict with nutrition values
+            nutrition_data: NutrientVector (or dict) with nutrition values
 
         Returns:
             MicroNutrients object with DV percentages
         """
-        return MicroNutrients(
-            vitamin_a_dv=self._calculate_dv_percentage(
-                nutrition_data.get('vitamin_a', 0.0),
-                self.DAILY_VALUES['vitamin_a']
-            ),
-            vitamin_c_dv=self._calculate_dv_percentage(
-                nutrition_data.get('vitamin_c', 0.0),
-                self.DAILY_VALUES['vitamin_c']
-            ),
-            vitamin_b12_dv=self._calculate_dv_percentage(
-                nutrition_data.get('vitamin_b12', 0.0),
-                self.DAILY_VALUES['vitamin_b12']
-            ),
-            iron_dv=self._calculate_dv_percentage(
-                nutrition_data.get('iron', 0.0),
-                self.DAILY_VALUES['iron']
-            ),
-            magnesium_dv=self._calculate_dv_percentage(
-                nutrition_data.get('magnesium', 0.0),
-                self.DAILY_VALUES['magnesium']
-            ),
-            potassium_dv=self._calculate_dv_percentage(
-                nutrition_data.get('potassium', 0.0),
-                self.DAILY_VALUES['potassium']
-            )
-        )
+        values = NutrientVector.from_dict(nutrition_data).values
+        percentages = np.rint(values[NUTRIENT_TABLES.dv_slots] / NUTRIENT_TABLES.dv_reference * 100.0)
+
+        return MicroNutrients(**dict(zip(NUTRIENT_TABLES.dv_fields, percentages.tolist())))
 
     def _calculate_dv_percentage(self, amount: float, daily_value: float) -> float:
         """
@@ -121,7 +95,7 @@ class NutritionCalculator:
 
     def create_nutrition_result(
         self,
-        nutrition_data: Dict[str, float],
+        nutrition_data: Mapping[str, float],
         detected_foods: List[FoodItem],
         overall_confidence: float
     ) -> NutritionResult:
@@ -129,7 +103,8 @@ class NutritionCalculator:
         Create complete NutritionResult from all data.
 
         Args:
-            nutrition_data: Aggregated nutrition data
+            nutrition_data: Aggregated nutrition data (a degraded NutrientVector
+                marks the result degraded)
             detected_foods: List of detected food items
             overall_confidence: Overall detection confidence
 
@@ -145,7 +120,8 @@ class NutritionCalculator:
             macros=macros,
             micros=micros,
             detected_foods=detected_foods,
-            overall_confidence=overall_confidence
+            overall_confidence=overall_confidence,
+            degraded=getattr(nutrition_data, 'degraded', False)
         )
 
 
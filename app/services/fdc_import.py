@@ -0,0 +1,309 @@
+"""
+Bulk-import USDA FoodData Central downloads into the local food database.
+
+Supports the Foundation and SR Legacy downloads in either format:
+  - CSV: a directory containing food.csv and food_nutrient.csv
+  - JSON: the single FoodData_Central_*_json_*.json file
+
+Input is streamed row by row / food by food, so memory use stays flat
+regardless of dump size. Only nutrients in USDA_NUTRIENT_MAPPING are kept.
+
+Usage:
+    python -m app.services.fdc_import --db data/fdc.db path/to/foundation path/to/sr_legacy.json
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, TextIO, Tuple
+
+from app.models.nutrients import USDA_NUTRIENT_MAPPING
+from app.services.food_database import SCHEMA
+
+logger = logging.getLogger(__name__)
+
+# FDC data types served by the /foods/search "Foundation" and "SR Legacy" filters
+CSV_DATA_TYPES = {
+    "foundation_food": "Foundation",
+    "sr_legacy_food": "SR Legacy",
+}
+JSON_DATA_TYPES = {"Foundation", "SR Legacy"}
+
+BATCH_SIZE = 5000
+READ_CHUNK_CHARS = 1 << 20
+
+NUTRIENT_IDS = {int(nutrient_id) for nutrient_id in USDA_NUTRIENT_MAPPING}
+
+
+def iter_json_array_items(fp: TextIO, chunk_chars: int = READ_CHUNK_CHARS) -> Iterator[Any]:
+    """
+    Stream the elements of the first JSON array in a file.
+    FDC JSON downloads are a single object wrapping one large array of foods,
+    so this yields one food at a time without loading the whole file.
+
+    Args:
+        fp: Text file positioned at the start of the document
+        chunk_chars: Characters to read per chunk
+
+    Yields:
+        Decoded array elements
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = -1
+
+    # Locate the opening bracket of the array
+    while position < 0:
+        chunk = fp.read(chunk_chars)
+        if not chunk:
+            return
+        buffer += chunk
+        position = buffer.find("[")
+    buffer = buffer[position + 1:]
+    position = 0
+
+    while True:
+        # Skip separators between elements
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer):
+                break
+            chunk = fp.read(chunk_chars)
+            if not chunk:
+                return
+            buffer, position = chunk, 0
+
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = fp.read(chunk_chars)
+            if not chunk:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield item
+        position = end
+        if position > chunk_chars:
+            buffer, position = buffer[position:], 0
+
+
+def iter_json_foods(path: Path) -> Iterator[Tuple[Tuple[int, str, str], List[Tuple[int, int, float]]]]:
+    """
+    Stream foods and their mapped nutrients from an FDC JSON download.
+
+    Args:
+        path: JSON file path
+
+    Yields:
+        ((fdc_id, description, data_type), [(fdc_id, nutrient_id, amount), ...])
+    """
+    with open(path, encoding="utf-8") as fp:
+        for food in iter_json_array_items(fp):
+            data_type = food.get("dataType")
+            if data_type not in JSON_DATA_TYPES:
+                continue
+
+            fdc_id = int(food["fdcId"])
+            nutrients = []
+            for entry in food.get("foodNutrients", []):
+                nutrient_id = entry.get("nutrient", {}).get("id")
+                amount = entry.get("amount")
+                if nutrient_id in NUTRIENT_IDS and amount is not None:
+                    nutrients.append((fdc_id, nutrient_id, float(amount)))
+
+            yield (fdc_id, food["description"], data_type), nutrients
+
+
+def _batched(rows: Iterable[Any], size: int = BATCH_SIZE) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most `size` items."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _column_indexes(header: List[str], *names: str) -> Tuple[int, ...]:
+    """Resolve CSV column positions by header name."""
+    try:
+        return tuple(header.index(name) for name in names)
+    except ValueError as e:
+        raise ValueError(f"Unexpected FDC CSV header {header}: {str(e)}")
+
+
+def import_csv_directory(conn: sqlite3.Connection, directory: Path) -> Tuple[int, int]:
+    """
+    Import a FoodData Central CSV download directory.
+
+    Args:
+        conn: Open database connection
+        directory: Directory with food.csv and food_nutrient.csv
+
+    Returns:
+        (foods imported, nutrient rows imported)
+    """
+    fdc_ids: Set[int] = set()
+
+    def food_rows() -> Iterator[Tuple[int, str, str]]:
+        with open(directory / "food.csv", newline="", encoding="utf-8") as fp:
+            reader = csv.reader(fp)
+            columns = _column_indexes(next(reader), "fdc_id", "data_type", "description")
+            id_col, type_col, description_col = columns
+            for row in reader:
+                data_type = CSV_DATA_TYPES.get(row[type_col])
+                if data_type is None:
+                    continue
+                fdc_id = int(row[id_col])
+                fdc_ids.add(fdc_id)
+                yield fdc_id, row[description_col], data_type
+
+    def nutrient_rows() -> Iterator[Tuple[int, int, float]]:
+        with open(directory / "food_nutrient.csv", newline="", encoding="utf-8") as fp:
+            reader = csv.reader(fp)
+            columns = _column_indexes(next(reader), "fdc_id", "nutrient_id", "amount")
+            id_col, nutrient_col, amount_col = columns
+            for row in reader:
+                amount = row[amount_col]
+                if not amount:
+                    continue
+                nutrient_id = int(row[nutrient_col])
+                if nutrient_id not in NUTRIENT_IDS:
+                    continue
+                fdc_id = int(row[id_col])
+                if fdc_id in fdc_ids:
+                    yield fdc_id, nutrient_id, float(amount)
+
+    foods = nutrients = 0
+    for batch in _batched(food_rows()):
+        conn.executemany("INSERT OR REPLACE INTO foods VALUES (?, ?, ?)", batch)
+        foods += len(batch)
+    for batch in _batched(nutrient_rows()):
+        conn.executemany("INSERT OR REPLACE INTO food_nutrients VALUES (?, ?, ?)", batch)
+        nutrients += len(batch)
+
+    return foods, nutrients
+
+
+def import_json_file(conn: sqlite3.Connection, path: Path) -> Tuple[int, int]:
+    """
+    Import a FoodData Central JSON download.
+
+    Args:
+        conn: Open database connection
+        path: JSON file path
+
+    Returns:
+        (foods imported, nutrient rows imported)
+    """
+    foods = nutrients = 0
+    for batch in _batched(iter_json_foods(path), size=500):
+        conn.executemany(
+            "INSERT OR REPLACE INTO foods VALUES (?, ?, ?)",
+            [food for food, _ in batch]
+        )
+        rows = [row for _, food_nutrients in batch for row in food_nutrients]
+        conn.executemany("INSERT OR REPLACE INTO food_nutrients VALUES (?, ?, ?)", rows)
+        foods += len(batch)
+        nutrients += len(rows)
+
+    return foods, nutrients
+
+
+def build_database(db_path: str, sources: List[str]) -> Dict[str, Any]:
+    """
+    Build the local database from one or more FDC downloads.
+    Writes to a temporary file and atomically replaces db_path when done,
+    so running workers never observe a half-built database.
+
+    Args:
+        db_path: Destination SQLite file
+        sources: CSV directories and/or JSON files
+
+    Returns:
+        Import summary (counts, timing, size)
+    """
+    start = time.perf_counter()
+    destination = Path(db_path)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = destination.with_suffix(destination.suffix + ".importing")
+    if temp_path.exists():
+        temp_path.unlink()
+
+    conn = sqlite3.connect(str(temp_path), isolation_level=None)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(SCHEMA)
+
+    total_foods = total_nutrients = 0
+    conn.execute("BEGIN")
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            foods, nutrients = import_csv_directory(conn, path)
+        elif path.suffix.lower() == ".json":
+            foods, nutrients = import_json_file(conn, path)
+        else:
+            conn.close()
+            temp_path.unlink()
+            raise ValueError(f"Unsupported FDC source (expected CSV directory or .json): {source}")
+
+        logger.info(f"Imported {foods} foods / {nutrients} nutrient rows from {source}")
+        total_foods += foods
+        total_nutrients += nutrients
+
+    conn.execute("INSERT INTO foods_fts(foods_fts) VALUES ('rebuild')")
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    conn.execute("VACUUM")
+    conn.close()
+
+    os.replace(temp_path, destination)
+
+    return {
+        "foods": total_foods,
+        "nutrient_rows": total_nutrients,
+        "seconds": round(time.perf_counter() - start, 2),
+        "size_bytes": destination.stat().st_size,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Import USDA FoodData Central downloads into the local food database."
+    )
+    parser.add_argument("sources", nargs="+", help="CSV download directories or JSON files")
+    parser.add_argument("--db", default="data/fdc.db", help="Output database path (default: data/fdc.db)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    try:
+        summary = build_database(args.db, args.sources)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Import failed: {str(e)}")
+        return 1
+
+    logger.info(
+        f"Wrote {args.db}: {summary['foods']} foods, {summary['nutrient_rows']} nutrient rows, "
+        f"{summary['size_bytes'] / (1024 * 1024):.1f}MB in {summary['seconds']}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
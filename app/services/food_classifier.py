@@ -0,0 +1,254 @@
+"""
+Local CPU food recognition with an ONNX image classifier.
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from app.config import settings
+from app.utils.image import load_image_for_model
+
+try:
+    import onnxruntime
+except ImportError:  # Optional: only needed with VISION_BACKEND=onnx
+    onnxruntime = None
+
+logger = logging.getLogger(__name__)
+
+# ImageNet normalization used by food-101 style classifiers
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape(3, 1, 1)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape(3, 1, 1)
+
+
+class ClassifierUnavailableError(Exception):
+    """Raised when the local classifier cannot be loaded."""
+
+
+class FoodClassifier:
+    """
+    ONNX Runtime image classifier producing Hugging Face style predictions
+    ({'label': ..., 'score': ...}).
+
+    The inference session is created once per process (load) and reused by
+    every request; warmup runs a few dummy inferences so the first real
+    image does not pay for lazy kernel initialization.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        labels_path: Optional[str] = None,
+        intra_op_threads: int = 1,
+        input_size: int = 224,
+        top_k: int = 3
+    ):
+        """
+        Initialize classifier (the model is not loaded yet).
+
+        Args:
+            model_path: Path to the .onnx model (NCHW float32 input, one score per label)
+            labels_path: Text file with one label per line, in output order
+            intra_op_threads: ONNX Runtime threads used by a single inference
+            input_size: Model input height/width (overridden by a static model shape)
+            top_k: Number of predictions returned per image
+        """
+        self.model_path = model_path
+        self.labels_path = labels_path
+        self.intra_op_threads = max(1, intra_op_threads)
+        self.input_size = input_size
+        self.top_k = top_k
+
+        self.labels: List[str] = []
+        self._session = None
+        self._input_name: Optional[str] = None
+        self._lock = threading.Lock()
+
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.images = 0
+        self.inference_seconds = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        """True once the inference session exists."""
+        return self._session is not None
+
+    def load(self) -> None:
+        """
+        Create the inference session (once; later calls are no-ops).
+
+        Raises:
+            ClassifierUnavailableError: If onnxruntime, the model or the labels are missing
+        """
+        with self._lock:
+            if self._session is not None:
+                return
+            if onnxruntime is None:
+                raise ClassifierUnavailableError("onnxruntime is not installed (pip install onnxruntime)")
+            if not Path(self.model_path).is_file():
+                raise ClassifierUnavailableError(f"Model not found: {self.model_path}")
+
+            started = time.perf_counter()
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = self.intra_op_threads
+            # Concurrency comes from the decode pool, not from parallel graph branches
+            options.inter_op_num_threads = 1
+            options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = onnxruntime.InferenceSession(
+                self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+            )
+
+            model_input = session.get_inputs()[0]
+            height, width = model_input.shape[2:4]
+            if isinstance(height, int) and isinstance(width, int):
+                if height != width:
+                    raise ClassifierUnavailableError(f"Non-square model input {height}x{width}")
+                self.input_size = height
+
+            labels = self._read_labels()
+            outputs = session.get_outputs()[0].shape[-1]
+            if isinstance(outputs, int) and outputs != len(labels):
+                raise ClassifierUnavailableError(
+                    f"Model has {outputs} outputs but {len(labels)} labels were given"
+                )
+
+            self.labels = labels
+            self._input_name = model_input.name
+            self._session = session
+            self.load_seconds = time.perf_counter() - started
+
+        logger.info(
+            f"Loaded food classifier {self.model_path} ({len(self.labels)} labels, "
+            f"{self.intra_op_threads} threads) in {self.load_seconds * 1000:.0f}ms"
+        )
+
+    def _read_labels(self) -> List[str]:
+        """Read labels, defaulting to <model>.labels.txt next to the model."""
+        path = Path(self.labels_path) if self.labels_path else Path(self.model_path).with_suffix(".labels.txt")
+        if not path.is_file():
+            raise ClassifierUnavailableError(f"Labels not found: {path}")
+        return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    def warmup(self, runs: int = 2) -> None:
+        """
+        Load the model if needed and run dummy inferences.
+
+        Args:
+            runs: Number of warmup inferences
+        """
+        self.load()
+        started = time.perf_counter()
+        dummy = np.zeros((1, 3, self.input_size, self.input_size), dtype=np.float32)
+        for _ in range(runs):
+            self._session.run(None, {self._input_name: dummy})
+        self.warmup_seconds = time.perf_counter() - started
+        logger.info(f"Food classifier warmed up in {self.warmup_seconds * 1000:.0f}ms")
+
+    @property
+    def resize_side(self) -> int:
+        """Short side images are resized to before the center crop (size * 256/224, standard eval transform)."""
+        return round(self.input_size * 256 / 224)
+
+    def preprocess(self, image: Image.Image) -> np.ndarray:
+        """
+        Resize, center-crop and normalize an image for the model.
+
+        Args:
+            image: Freshly opened PIL image, any mode (decoded at reduced scale)
+
+        Returns:
+            float32 array of shape (3, input_size, input_size)
+        """
+        self.load()  # The model may fix input_size
+        return self.to_model_input(np.asarray(load_image_for_model(image, self.resize_side)))
+
+    def to_model_input(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        Center-crop and normalize an image already resized to resize_side.
+
+        Args:
+            pixels: RGB uint8 array of shape (height, width, 3)
+
+        Returns:
+            float32 array of shape (3, input_size, input_size)
+        """
+        size = self.input_size
+        height, width = pixels.shape[:2]
+        top, left = (height - size) // 2, (width - size) // 2
+        pixels = pixels[top:top + size, left:left + size]
+
+        pixels = pixels.astype(np.float32).transpose(2, 0, 1) / 255.0
+        return (pixels - IMAGENET_MEAN) / IMAGENET_STD
+
+    def classify(self, batch: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """
+        Run the model on preprocessed images.
+
+        Args:
+            batch: float32 array of shape (N, 3, input_size, input_size)
+
+        Returns:
+            Top-k predictions per image, best first
+        """
+        self.load()
+        started = time.perf_counter()
+        scores = self._session.run(None, {self._input_name: batch})[0]
+        self.inference_seconds += time.perf_counter() - started
+        self.images += len(batch)
+
+        return [self._top_predictions(row) for row in np.asarray(scores, dtype=np.float32)]
+
+    def predict(self, image: Image.Image) -> List[Dict[str, Any]]:
+        """
+        Classify a single image.
+
+        Args:
+            image: PIL image
+
+        Returns:
+            Top-k predictions, best first
+        """
+        return self.classify(self.preprocess(image)[np.newaxis])[0]
+
+    def _top_predictions(self, row: np.ndarray) -> List[Dict[str, Any]]:
+        """Turn one output row (logits or probabilities) into top-k predictions."""
+        if row.min() < 0 or abs(float(row.sum()) - 1.0) > 1e-3:
+            row = np.exp(row - row.max())
+            row /= row.sum()
+
+        k = min(self.top_k, len(row))
+        top = np.argpartition(row, -k)[-k:]
+        top = top[np.argsort(row[top])[::-1]]
+        return [{"label": self.labels[i], "score": float(row[i])} for i in top]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load, warmup and inference timings."""
+        return {
+            "loaded": self.loaded,
+            "intra_op_threads": self.intra_op_threads,
+            "load_ms": round(self.load_seconds * 1000, 1) if self.load_seconds is not None else None,
+            "warmup_ms": round(self.warmup_seconds * 1000, 1) if self.warmup_seconds is not None else None,
+            "images": self.images,
+            "inference_ms_avg": round(self.inference_seconds / self.images * 1000, 2) if self.images else 0.0,
+        }
+
+
+def default_intra_op_threads() -> int:
+    """Split the CPU cores between the decode workers so inferences never oversubscribe."""
+    return max(1, (os.cpu_count() or 1) // max(1, settings.vision_decode_workers))
+
+
+# Global instance (loaded in the app lifespan when VISION_BACKEND=onnx)
+food_classifier = FoodClassifier(
+    model_path=settings.vision_model_path,
+    labels_path=settings.vision_model_labels_path,
+    intra_op_threads=settings.vision_intra_op_threads or default_intra_op_threads(),
+    top_k=settings.vision_top_k
+)
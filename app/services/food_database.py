@@ -0,0 +1,168 @@
+"""
+Local FoodData Central database (offline nutrition source).
+Built by app.services.fdc_import from the USDA Foundation / SR Legacy downloads.
+"""
+import logging
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS foods (
+    fdc_id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    data_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS food_nutrients (
+    fdc_id INTEGER NOT NULL,
+    nutrient_id INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    PRIMARY KEY (fdc_id, nutrient_id)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS foods_fts USING fts5(
+    description,
+    content='foods',
+    content_rowid='fdc_id',
+    tokenize='porter unicode61'
+);
+"""
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class FoodDatabase:
+    """Read-only access to the imported FoodData Central catalogue."""
+
+    def __init__(self, path: str):
+        """
+        Initialize database handle. The file is opened lazily on first use.
+
+        Args:
+            path: SQLite database file produced by the importer
+        """
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database read-only (lock held)."""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro",
+                uri=True,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA query_only=ON")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._conn = conn
+            logger.info(f"Opened local FoodData Central database: {self.path}")
+        return self._conn
+
+    @staticmethod
+    def _match_expression(food_name: str, operator: str) -> Optional[str]:
+        """Build an FTS5 query from the tokens of a food label."""
+        tokens = _TOKEN_PATTERN.findall(food_name.lower())
+        if not tokens:
+            return None
+        return f" {operator} ".join(f'"{token}"' for token in tokens)
+
+    def search(self, food_name: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Full-text search the catalogue.
+        All label tokens must match; falls back to any-token matching.
+
+        Args:
+            food_name: Food label to search for
+            limit: Maximum number of results
+
+        Returns:
+            Foods in USDA search-result shape, best match first
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = []
+            for operator in ("AND", "OR"):
+                expression = self._match_expression(food_name, operator)
+                if expression is None:
+                    return []
+
+                rows = conn.execute(
+                    "SELECT f.fdc_id, f.description, f.data_type "
+                    "FROM foods_fts JOIN foods f ON f.fdc_id = foods_fts.rowid "
+                    "WHERE foods_fts MATCH ? "
+                    "ORDER BY bm25(foods_fts), length(f.description), f.fdc_id "
+                    "LIMIT ?",
+                    (expression, limit)
+                ).fetchall()
+                if rows:
+                    break
+
+            return [self._load_food(conn, *row) for row in rows]
+
+    def get_food(self, fdc_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a single food by FDC ID.
+
+        Args:
+            fdc_id: FoodData Central ID
+
+        Returns:
+            Food in USDA search-result shape, or None
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT fdc_id, description, data_type FROM foods WHERE fdc_id = ?",
+                (fdc_id,)
+            ).fetchone()
+            return self._load_food(conn, *row) if row else None
+
+    @staticmethod
+    def _load_food(
+        conn: sqlite3.Connection,
+        fdc_id: int,
+        description: str,
+        data_type: str
+    ) -> Dict[str, Any]:
+        """Assemble a food record with its nutrients (lock held)."""
+        nutrients = conn.execute(
+            "SELECT nutrient_id, amount FROM food_nutrients WHERE fdc_id = ?",
+            (fdc_id,)
+        ).fetchall()
+
+        return {
+            "fdcId": fdc_id,
+            "description": description,
+            "dataType": data_type,
+            "foodNutrients": [
+                {"nutrientId": nutrient_id, "value": amount}
+                for nutrient_id, amount in nutrients
+            ],
+        }
+
+    def list_foods(self) -> List[Tuple[int, str]]:
+        """
+        Return the catalogue as (fdc_id, description) pairs, ordered by ID.
+
+        Returns:
+            All foods in the database
+        """
+        with self._lock:
+            return self._connect().execute(
+                "SELECT fdc_id, description FROM foods ORDER BY fdc_id"
+            ).fetchall()
+
+    def count_foods(self) -> int:
+        """Return the number of foods in the catalogue."""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM foods").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,168 @@
+"""
+Fuzzy food-name matching over the local food catalogue.
+Resolves vision labels ("Grilled Chicken Breast") to catalogue descriptions
+("Chicken, broilers or fryers, breast, meat only, cooked, grilled") without
+touching the network.
+"""
+import logging
+import re
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Weight of character-trigram similarity vs. whole-word overlap in the score
+TRIGRAM_WEIGHT = 0.6
+TOKEN_WEIGHT = 0.4
+
+
+class FoodMatch(NamedTuple):
+    """Scored match candidate."""
+    food_id: int
+    description: str
+    score: float
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(tokens: Iterable[str]) -> Set[str]:
+    """Character trigrams of each token, padded so word boundaries count."""
+    grams = set()
+    for token in tokens:
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _InvertedIndex:
+    """Term -> document postings packed into flat arrays."""
+
+    def __init__(self, documents: List[Set[str]]):
+        postings: Dict[str, List[int]] = {}
+        for doc, terms in enumerate(documents):
+            for term in terms:
+                postings.setdefault(term, []).append(doc)
+
+        self.doc_count = len(documents)
+        self.term_slots: Dict[str, Tuple[int, int]] = {}
+        flat: List[int] = []
+        for term in sorted(postings):
+            start = len(flat)
+            flat.extend(postings[term])
+            self.term_slots[term] = (start, len(flat))
+
+        self.postings = np.asarray(flat, dtype=np.uint32)
+        self.doc_sizes = np.fromiter((len(terms) for terms in documents), dtype=np.float32,
+                                     count=len(documents))
+
+    def count_shared(self, terms: Iterable[str]) -> np.ndarray:
+        """Count, per document, how many of the given terms it contains."""
+        slices = [
+            self.postings[start:end]
+            for start, end in (self.term_slots[term] for term in terms if term in self.term_slots)
+        ]
+        if not slices:
+            return np.zeros(self.doc_count, dtype=np.float32)
+        return np.bincount(np.concatenate(slices), minlength=self.doc_count).astype(np.float32)
+
+    def nbytes(self) -> int:
+        """Size of the packed arrays."""
+        return self.postings.nbytes + self.doc_sizes.nbytes
+
+
+class FoodMatchIndex:
+    """
+    Token + trigram index with deterministic scored lookups.
+
+    Score is a weighted blend of trigram Dice similarity (tolerates plurals,
+    typos and word order) and the fraction of label words that appear whole
+    in the description. Ties break on shorter description, then lower ID.
+    """
+
+    def __init__(self, foods: Iterable[Tuple[int, str]]):
+        """
+        Build the index.
+
+        Args:
+            foods: (food_id, description) pairs
+        """
+        ids = []
+        self.descriptions: List[str] = []
+        token_sets = []
+        trigram_sets = []
+        for food_id, description in foods:
+            tokens = tokenize(description)
+            ids.append(food_id)
+            self.descriptions.append(description)
+            token_sets.append(set(tokens))
+            trigram_sets.append(trigrams(tokens))
+
+        self.food_ids = np.asarray(ids, dtype=np.int64)
+        self._description_lengths = np.fromiter(
+            (len(description) for description in self.descriptions), dtype=np.int32,
+            count=len(self.descriptions)
+        )
+        self._tokens = _InvertedIndex(token_sets)
+        self._trigrams = _InvertedIndex(trigram_sets)
+
+        logger.info(
+            f"Built food match index: {len(self.descriptions)} foods, "
+            f"{len(self._trigrams.term_slots)} trigrams, {len(self._tokens.term_slots)} tokens"
+        )
+
+    def __len__(self) -> int:
+        return len(self.descriptions)
+
+    def search(self, label: str, limit: int = 5, min_score: float = 0.0) -> List[FoodMatch]:
+        """
+        Find the best catalogue matches for a label.
+
+        Args:
+            label: Food label to resolve
+            limit: Maximum number of candidates
+            min_score: Minimum score (0-1) for a candidate to be returned
+
+        Returns:
+            Candidates sorted best first
+        """
+        query_tokens = set(tokenize(label))
+        if not query_tokens or not self.descriptions:
+            return []
+        query_trigrams = trigrams(query_tokens)
+
+        shared_trigrams = self._trigrams.count_shared(query_trigrams)
+        shared_tokens = self._tokens.count_shared(query_tokens)
+
+        dice = 2.0 * shared_trigrams / (len(query_trigrams) + self._trigrams.doc_sizes)
+        coverage = shared_tokens / len(query_tokens)
+        scores = TRIGRAM_WEIGHT * dice + TOKEN_WEIGHT * coverage
+
+        candidates = np.flatnonzero((scores >= min_score) & (shared_trigrams > 0))
+        if len(candidates) > limit:
+            # Keep everything tied with the limit-th best so tie-breaking stays exact
+            kth_score = np.partition(scores[candidates], -limit)[-limit]
+            candidates = candidates[scores[candidates] >= kth_score]
+
+        ranked = sorted(
+            candidates.tolist(),
+            key=lambda doc: (-scores[doc], self._description_lengths[doc], self.food_ids[doc])
+        )
+        return [
+            FoodMatch(int(self.food_ids[doc]), self.descriptions[doc], round(float(scores[doc]), 4))
+            for doc in ranked[:limit]
+        ]
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the packed index arrays (excluding descriptions)."""
+        return (
+            self._tokens.nbytes()
+            + self._trigrams.nbytes()
+            + self.food_ids.nbytes
+            + self._description_lengths.nbytes
+        )
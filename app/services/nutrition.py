@@ -1,62 +1,671 @@
 """
 USDA FoodData Central API integration for nutrition data.
 """
+import asyncio
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import time
+from collections import Counter
+from typing import Optional, Dict, Any, List, Mapping
+import httpx
 import requests
 
 from app.config import settings
 from app.models.nutrition import FoodItem
+from app.models.nutrients import (
+    DEFAULT_NUTRIENTS_PER_100G,
+    NUTRIENT_KEYS,
+    USDA_NUTRIENT_SLOTS,
+    NutrientVector,
+)
+from app.services.food_database import FoodDatabase
+from app.services.food_index import FoodMatchIndex
+from app.services.nutrition_store import NutritionStore
+from app.utils.cache import LRUCache
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.deadline import Deadline
+from app.utils.hedging import HedgePolicy, hedged_call
+from app.utils.rate_limit import RateLimitExceeded, TokenBucket
+from app.utils.singleflight import SingleFlight
+from app.utils.usda import first_search_result
 
 logger = logging.getLogger(__name__)
 
 
+class NutritionUnavailableError(Exception):
+    """A lookup could not be performed (upstream error, open circuit or no time left)."""
+
+
 class NutritionService:
-    """Service for fetching nutrition data from USDA FoodData Central."""
+    """
+    Service for fetching nutrition data from USDA FoodData Central.
+    Answers from the live API or, with NUTRITION_SOURCE=local, entirely from
+    the imported FoodData Central database (see app.services.fdc_import).
+    """
 
     def __init__(self):
         """Initialize USDA API client."""
         self.base_url = settings.usda_api_base_url
         self.api_key = settings.usda_api_key
+        self.timeout = settings.usda_timeout_seconds
+
+        # Long-lived HTTP clients (created lazily, closed on shutdown)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._session: Optional[requests.Session] = None
+
+        # Per-100g nutrient profiles keyed on the normalized food name
+        self._cache = LRUCache(
+            max_entries=settings.nutrition_cache_max_entries,
+            ttl_seconds=settings.nutrition_cache_ttl_seconds
+        )
+
+        # Labels with no match, remembered briefly so repeats skip the lookup
+        self._negative_cache = LRUCache(
+            max_entries=settings.nutrition_negative_cache_max_entries,
+            ttl_seconds=settings.nutrition_negative_cache_ttl_seconds
+        )
+
+        # Lookup outcomes, plus the labels that most often fall back to defaults
+        self._lookup_counts: Counter = Counter()
+        self._fallback_labels: Counter = Counter()
+
+        # Offline mode: the whole catalogue is local, no network involved
+        self._food_db: Optional[FoodDatabase] = None
+        self._food_index: Optional[FoodMatchIndex] = None
+        if settings.nutrition_source == "local":
+            self._food_db = FoodDatabase(settings.fdc_database_path)
+
+        # Second tier: on-disk store shared across restarts and workers
+        self._store: Optional[NutritionStore] = None
+        if settings.nutrition_store_path and self._food_db is None:
+            self._store = NutritionStore(
+                path=settings.nutrition_store_path,
+                ttl_seconds=settings.nutrition_store_ttl_seconds,
+                batch_size=settings.nutrition_store_batch_size,
+                flush_interval_seconds=settings.nutrition_store_flush_interval_seconds
+            )
+        self._flush_task: Optional[asyncio.Task] = None
+        # Store writes from the async path, run in threads (see _remember_nutrients_async)
+        self._store_writes: set = set()
+
+        # Concurrent cache misses for the same food share one upstream lookup
+        self._inflight = SingleFlight()
+
+        # Stop calling USDA while it is failing or slow; answer from cache/defaults
+        self._breaker = CircuitBreaker(
+            name="usda",
+            window_size=settings.usda_breaker_window_size,
+            min_calls=settings.usda_breaker_min_calls,
+            failure_rate_threshold=settings.usda_breaker_failure_rate_threshold,
+            slow_call_seconds=settings.usda_breaker_slow_call_seconds,
+            slow_call_rate_threshold=settings.usda_breaker_slow_call_rate_threshold,
+            open_seconds=settings.usda_breaker_open_seconds
+        )
+
+        # Client-side share of the API key's hourly quota, split evenly between
+        # the worker processes using the key. The refill rate leaves room for
+        # the burst, so a full hour never exceeds the share.
+        self._quota: Optional[TokenBucket] = None
+        if settings.usda_quota_per_hour > 0:
+            quota = settings.usda_quota_per_hour / max(1, settings.usda_quota_workers)
+            burst = min(settings.usda_quota_burst, quota // 2)
+            self._quota = TokenBucket(
+                rate_per_second=(quota - burst) / 3600.0,
+                capacity=burst
+            )
+
+        # Optional duplicate request when the first is slower than usual;
+        # hedges only go out if a quota token is free right away
+        self._hedge_policy: Optional[HedgePolicy] = None
+        if settings.usda_hedging_enabled:
+            self._hedge_policy = HedgePolicy(
+                percentile=settings.usda_hedge_percentile,
+                max_hedge_ratio=settings.usda_hedge_max_ratio,
+                min_samples=settings.usda_hedge_min_samples,
+                admit=self._quota.try_take if self._quota is not None else None
+            )
+
+    async def startup(self) -> None:
+        """Create the pooled async HTTP client (called from app lifespan)."""
+        self._get_client()
+
+        if self._food_db is not None:
+            self._get_food_index()
+
+        if self._store is not None:
+            await asyncio.to_thread(self._store.purge_expired)
+            self._flush_task = asyncio.create_task(self._flush_store_periodically())
+
+        logger.info(
+            f"USDA client ready (max connections: {settings.usda_max_connections}, "
+            f"keep-alive: {settings.usda_max_keepalive_connections})"
+        )
+
+    def preload(self) -> None:
+        """
+        Build read-only lookup structures before workers are forked
+        (python -m app.prefork), so every worker shares their pages.
+        """
+        if self._food_db is not None:
+            self._get_food_index()
+            # SQLite connections must not cross fork; each worker reopens its own
+            self._food_db.close()
+
+    async def shutdown(self) -> None:
+        """Close pooled HTTP connections and flush the store (called from app lifespan)."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        if self._store is not None:
+            if self._store_writes:
+                await asyncio.gather(*self._store_writes, return_exceptions=True)
+            await asyncio.to_thread(self._store.close)
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+        if self._food_db is not None:
+            self._food_db.close()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared async HTTP client, creating it on first use.
 
-    def search_food(self, food_name: str) -> Optional[Dict[str, Any]]:
+        Returns:
+            httpx.AsyncClient with a keep-alive connection pool
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.usda_max_connections,
+                    max_keepalive_connections=settings.usda_max_keepalive_connections,
+                    keepalive_expiry=settings.usda_keepalive_expiry_seconds
+                )
+            )
+        return self._client
+
+    async def _flush_store_periodically(self) -> None:
+        """Flush batched store writes so they do not wait for the next put."""
+        while True:
+            await asyncio.sleep(settings.nutrition_store_flush_interval_seconds)
+            # May wait on another worker's write lock; keep it off the event loop
+            await asyncio.to_thread(self._store.flush)
+
+    def _get_session(self) -> requests.Session:
+        """Return the shared blocking HTTP session for the sync API."""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    def _search_params(self, food_name: str) -> Dict[str, Any]:
+        """Build query parameters for the USDA food search endpoint."""
+        return {
+            "api_key": self.api_key,
+            "query": food_name,
+            # Only the best match is used; trimmed mode asks for just that one
+            "pageSize": 1 if settings.usda_trimmed_fetch else 5,
+            "dataType": ["Foundation", "SR Legacy"]
+        }
+
+    def _parse_search_response(self, food_name: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Pick the best match from a raw USDA search response body.
+
+        Args:
+            food_name: Name that was searched
+            body: Response body
+
+        Returns:
+            Best matching food data or None
+        """
+        if settings.usda_trimmed_fetch:
+            food = first_search_result(body)
+            return self._select_best_match(food_name, {"foods": [food] if food else []})
+        return self._select_best_match(food_name, json.loads(body))
+
+    def _select_best_match(self, food_name: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Pick the best match from a USDA search response.
+
+        Args:
+            food_name: Name that was searched
+            data: Parsed search response
+
+        Returns:
+            Best matching food data or None
+        """
+        if data.get('foods') and len(data['foods']) > 0:
+            # Return the best match (first result)
+            best_match = data['foods'][0]
+            logger.info(f"Found match for '{food_name}': {best_match.get('description')}")
+            return best_match
+
+        logger.warning(f"No USDA data found for: {food_name}")
+        return None
+
+    def _get_food_index(self) -> FoodMatchIndex:
+        """Return the fuzzy match index over the local catalogue, building it once."""
+        if self._food_index is None:
+            self._food_index = FoodMatchIndex(self._food_db.list_foods())
+        return self._food_index
+
+    def _search_local(self, food_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a label against the local FoodData Central database
+        using the fuzzy match index.
+
+        Args:
+            food_name: Name of the food to search
+
+        Returns:
+            Best matching food data or None
+
+        Raises:
+            sqlite3.Error: If the database cannot be read
+        """
+        matches = self._get_food_index().search(
+            food_name,
+            limit=1,
+            min_score=settings.food_match_min_score
+        )
+        foods = [self._food_db.get_food(matches[0].food_id)] if matches else []
+        return self._select_best_match(food_name, {"foods": foods})
+
+    def _fetch_food(self, food_name: str) -> Optional[Dict[str, Any]]:
         """
-        Search for food in USDA database.
+        Look up a food (blocking). Unlike search_food, errors propagate,
+        so "no match" (None) can be told apart from a failed lookup.
 
         Args:
             food_name: Name of the food to search
 
         Returns:
             Best matching food data or None
+
+        Raises:
+            CircuitOpenError: If USDA calls are currently suspended
         """
+        if self._food_db is not None:
+            return self._search_local(food_name)
+
+        self._breaker.check()
+        started = None
         try:
-            url = f"{self.base_url}/foods/search"
-            params = {
-                "api_key": self.api_key,
-                "query": food_name,
-                "pageSize": 5,
-                "dataType": ["Foundation", "SR Legacy"]
-            }
-
-            response = requests.get(url, params=params, timeout=5)
+            if self._quota is not None:
+                self._quota.acquire_blocking(max_wait=settings.usda_quota_max_wait_seconds)
+            started = time.perf_counter()
+            response = self._get_session().get(
+                f"{self.base_url}/foods/search",
+                params=self._search_params(food_name),
+                timeout=self.timeout
+            )
             response.raise_for_status()
+        except Exception:
+            self._settle_failed_call(started)
+            raise
+        self._breaker.record_success(time.perf_counter() - started)
+
+        return self._parse_search_response(food_name, response.content)
+
+    async def _fetch_food_async(self, food_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a food without blocking the event loop; errors propagate.
+
+        Args:
+            food_name: Name of the food to search
+
+        Returns:
+            Best matching food data or None
+
+        Raises:
+            CircuitOpenError: If USDA calls are currently suspended
+        """
+        if self._food_db is not None:
+            # Local lookups are sub-millisecond; no need to leave the loop
+            return self._search_local(food_name)
+
+        self._breaker.check()
+        started = None
+        try:
+            if self._quota is not None:
+                await self._quota.acquire(max_wait=settings.usda_quota_max_wait_seconds)
+            started = time.perf_counter()
+            if self._hedge_policy is not None:
+                response = await hedged_call(lambda: self._send_search(food_name), self._hedge_policy)
+            else:
+                response = await self._send_search(food_name)
+        except BaseException:
+            # Cancellation counts too, so a half-open trial call is always settled
+            self._settle_failed_call(started)
+            raise
+        self._breaker.record_success(time.perf_counter() - started)
+
+        return self._parse_search_response(food_name, response.content)
+
+    def _settle_failed_call(self, started: Optional[float]) -> None:
+        """
+        Report a failed fetch to the circuit breaker.
+
+        Args:
+            started: When the request was sent, or None if it never was
+                (e.g. no quota token in time)
+        """
+        if started is None:
+            self._breaker.release()
+        else:
+            self._breaker.record_failure(time.perf_counter() - started)
+
+    async def _send_search(self, food_name: str) -> httpx.Response:
+        """
+        Send one USDA search request.
+
+        Args:
+            food_name: Name of the food to search
+
+        Returns:
+            Successful response
 
-            data = response.json()
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx status
+        """
+        response = await self._get_client().get(
+            "/foods/search",
+            params=self._search_params(food_name)
+        )
+        response.raise_for_status()
+        return response
+
+    def search_food(self, food_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Search for food in USDA database (blocking).
 
-            if data.get('foods') and len(data['foods']) > 0:
-                # Return the best match (first result)
-                best_match = data['foods'][0]
-                logger.info(f"Found match for '{food_name}': {best_match.get('description')}")
-                return best_match
+        Args:
+            food_name: Name of the food to search
 
-            logger.warning(f"No USDA data found for: {food_name}")
+        Returns:
+            Best matching food data or None
+        """
+        try:
+            return self._fetch_food(food_name)
+        except Exception as e:
+            logger.error(f"Error searching USDA for '{food_name}': {str(e)}")
             return None
 
+    async def search_food_async(self, food_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Search for food in USDA database without blocking the event loop.
+
+        Args:
+            food_name: Name of the food to search
+
+        Returns:
+            Best matching food data or None
+        """
+        try:
+            return await self._fetch_food_async(food_name)
         except Exception as e:
             logger.error(f"Error searching USDA for '{food_name}': {str(e)}")
             return None
 
-    def get_nutrition_for_food(self, food_item: FoodItem) -> Dict[str, float]:
+    @staticmethod
+    def normalize_food_name(food_name: str) -> str:
+        """Normalize a food label for use as a cache key."""
+        return " ".join(food_name.lower().split())
+
+    def get_food_nutrients(self, food_name: str) -> Optional[NutrientVector]:
+        """
+        Get per-100g nutrients for a food, served from cache when possible.
+
+        Args:
+            food_name: Name of the food
+
+        Returns:
+            Nutrient values per 100g, or None if no match or the lookup failed
+        """
+        try:
+            return self._lookup_food_nutrients(food_name)
+        except NutritionUnavailableError:
+            return None
+
+    async def get_food_nutrients_async(
+        self,
+        food_name: str,
+        deadline: Optional[Deadline] = None
+    ) -> Optional[NutrientVector]:
+        """
+        Get per-100g nutrients for a food, served from cache when possible (async).
+
+        Args:
+            food_name: Name of the food
+            deadline: Request deadline; the lookup is abandoned when it runs out
+
+        Returns:
+            Nutrient values per 100g, or None if no match or the lookup failed
+        """
+        try:
+            return await self._lookup_food_nutrients_async(food_name, deadline)
+        except NutritionUnavailableError:
+            return None
+
+    def _lookup_food_nutrients(self, food_name: str) -> Optional[NutrientVector]:
+        """
+        Resolve per-100g nutrients from cache or the nutrition source (blocking).
+
+        Args:
+            food_name: Name of the food
+
+        Returns:
+            Nutrient values per 100g, or None if no match
+
+        Raises:
+            NutritionUnavailableError: If the source could not be consulted
+        """
+        key = self.normalize_food_name(food_name)
+        nutrients = self._get_cached_nutrients(key)
+        if nutrients is not None or self._is_known_miss(key):
+            return nutrients
+
+        try:
+            food_data = self._fetch_food(food_name)
+        except Exception as e:
+            raise self._lookup_failed(food_name, e) from e
+
+        return self._remember_lookup(key, food_data)
+
+    async def _lookup_food_nutrients_async(
+        self,
+        food_name: str,
+        deadline: Optional[Deadline] = None
+    ) -> Optional[NutrientVector]:
+        """
+        Resolve per-100g nutrients from cache or the nutrition source (async).
+        Cache tiers are always consulted; the source only within the deadline.
+
+        Args:
+            food_name: Name of the food
+            deadline: Request deadline (None waits for the source's own timeout)
+
+        Returns:
+            Nutrient values per 100g, or None if no match
+
+        Raises:
+            NutritionUnavailableError: If the source could not be consulted in time
+        """
+        key = self.normalize_food_name(food_name)
+        nutrients = await self._get_cached_nutrients_async(key)
+        if nutrients is not None or self._is_known_miss(key):
+            return nutrients
+
+        def lookup():
+            return self._inflight.do(key, lambda: self._resolve_food_nutrients(food_name, key))
+
+        if deadline is None:
+            return await lookup()
+
+        budget = deadline.remaining(settings.response_reply_reserve_seconds)
+        if self._quota is not None and self._food_db is None and self._quota.projected_wait() > budget:
+            # Out of quota for longer than we can wait; do not join the queue
+            self._lookup_counts["quota_skipped"] += 1
+            logger.warning(f"USDA quota wait exceeds deadline, skipping lookup for '{food_name}'")
+            raise NutritionUnavailableError(food_name)
+
+        if budget > 0:
+            try:
+                # The shared lookup keeps running after we give up, so a late
+                # answer still lands in the cache for the next meal
+                return await asyncio.wait_for(lookup(), timeout=budget)
+            except asyncio.TimeoutError:
+                pass
+
+        self._lookup_counts["deadline_exceeded"] += 1
+        logger.warning(f"Deadline reached, skipping nutrition lookup for '{food_name}'")
+        raise NutritionUnavailableError(food_name)
+
+    async def _resolve_food_nutrients(self, food_name: str, key: str) -> Optional[NutrientVector]:
+        """
+        Fetch, extract and cache a profile (runs once per key at a time).
+
+        Args:
+            food_name: Name of the food as first requested
+            key: Normalized food name
+
+        Returns:
+            Nutrient values per 100g, or None if no match
+
+        Raises:
+            NutritionUnavailableError: If the source could not be consulted
+        """
+        try:
+            food_data = await self._fetch_food_async(food_name)
+        except Exception as e:
+            raise self._lookup_failed(food_name, e) from e
+
+        nutrients = self._remember_lookup(key, food_data, persist=False)
+        if nutrients is not None:
+            self._remember_nutrients_async(key, nutrients)
+        return nutrients
+
+    def _lookup_failed(self, food_name: str, error: Exception) -> NutritionUnavailableError:
+        """
+        Count and log a lookup that could not be performed.
+
+        Args:
+            food_name: Name of the food
+            error: Exception raised by the fetch
+
+        Returns:
+            Error for the caller to raise
+        """
+        if isinstance(error, CircuitOpenError):
+            self._lookup_counts["short_circuited"] += 1
+            logger.warning(f"USDA circuit open, skipping lookup for '{food_name}'")
+        elif isinstance(error, RateLimitExceeded):
+            self._lookup_counts["quota_exhausted"] += 1
+            logger.warning(f"USDA quota exhausted, skipping lookup for '{food_name}'")
+        else:
+            self._lookup_counts["errors"] += 1
+            logger.error(f"Error searching USDA for '{food_name}': {str(error)}")
+        return NutritionUnavailableError(food_name)
+
+    def _remember_lookup(
+        self,
+        key: str,
+        food_data: Optional[Dict[str, Any]],
+        persist: bool = True
+    ) -> Optional[NutrientVector]:
+        """
+        Cache the outcome of a completed lookup: the extracted profile,
+        or a negative entry when the source had no match.
+
+        Args:
+            key: Normalized food name
+            food_data: Best matching food data, or None if nothing matched
+            persist: Also write the profile to the on-disk store (blocking)
+
+        Returns:
+            Nutrient values per 100g, or None if no match
+        """
+        if not food_data:
+            self._lookup_counts["not_found"] += 1
+            self._negative_cache.set(key, True)
+            return None
+
+        self._lookup_counts["found"] += 1
+        nutrients = self._extract_nutrients(food_data)
+        self._cache.set(key, nutrients)
+        if persist and self._store is not None:
+            self._store.put(key, nutrients)
+        return nutrients
+
+    def _is_known_miss(self, key: str) -> bool:
+        """Return True if the label recently had no match at the source."""
+        if self._negative_cache.get(key) is None:
+            return False
+        self._lookup_counts["negative_cache_hits"] += 1
+        return True
+
+    def _get_cached_nutrients(self, key: str) -> Optional[NutrientVector]:
+        """
+        Look up a profile in the memory cache, then the on-disk store.
+        Store hits are promoted into the memory cache.
+
+        Args:
+            key: Normalized food name
+
+        Returns:
+            Nutrient values per 100g, or None if neither tier has it
+        """
+        nutrients = self._cache.get(key)
+        if nutrients is not None or self._store is None:
+            return nutrients
+
+        nutrients = self._store.get(key)
+        if nutrients is not None:
+            self._cache.set(key, nutrients)
+        return nutrients
+
+    async def _get_cached_nutrients_async(self, key: str) -> Optional[NutrientVector]:
+        """
+        Look up a profile in the memory cache, then the on-disk store.
+        The store is read in a thread: SQLite may wait on another worker's
+        write lock, which must not stall the event loop.
+
+        Args:
+            key: Normalized food name
+
+        Returns:
+            Nutrient values per 100g, or None if neither tier has it
+        """
+        nutrients = self._cache.get(key)
+        if nutrients is not None or self._store is None:
+            return nutrients
+
+        nutrients = await asyncio.to_thread(self._store.get, key)
+        if nutrients is not None:
+            self._cache.set(key, nutrients)
+        return nutrients
+
+    def _remember_nutrients_async(self, key: str, nutrients: NutrientVector) -> None:
+        """
+        Write a resolved profile to the on-disk store in a thread, without
+        making the caller wait (a put may flush the batch); shutdown waits
+        for writes still running.
+        """
+        if self._store is None:
+            return
+        task = asyncio.ensure_future(asyncio.to_thread(self._store.put, key, nutrients))
+        self._store_writes.add(task)
+        task.add_done_callback(self._store_writes.discard)
+
+    def get_nutrition_for_food(self, food_item: FoodItem) -> NutrientVector:
         """
         Get nutrition data for a food item and scale to portion.
 
@@ -64,25 +673,64 @@ class NutritionService:
             food_item: FoodItem with name and quantity
 
         Returns:
-            Dict with nutrition values scaled to portion
+            Nutrition values scaled to portion
         """
-        # Search USDA database
-        food_data = self.search_food(food_item.name)
+        try:
+            nutrients = self._lookup_food_nutrients(food_item.name)
+        except NutritionUnavailableError:
+            return self._get_degraded_nutrition(food_item)
 
-        if not food_data:
+        return self._nutrition_for_portion(food_item, nutrients)
+
+    async def get_nutrition_for_food_async(
+        self,
+        food_item: FoodItem,
+        deadline: Optional[Deadline] = None
+    ) -> NutrientVector:
+        """
+        Get nutrition data for a food item and scale to portion (async).
+
+        Args:
+            food_item: FoodItem with name and quantity
+            deadline: Request deadline; defaults are used once it runs out
+
+        Returns:
+            Nutrition values scaled to portion
+        """
+        try:
+            nutrients = await self._lookup_food_nutrients_async(food_item.name, deadline)
+        except NutritionUnavailableError:
+            return self._get_degraded_nutrition(food_item)
+
+        return self._nutrition_for_portion(food_item, nutrients)
+
+    def _nutrition_for_portion(
+        self,
+        food_item: FoodItem,
+        nutrients: Optional[NutrientVector]
+    ) -> NutrientVector:
+        """
+        Scale per-100g nutrients to the detected portion.
+
+        Args:
+            food_item: FoodItem with name and quantity
+            nutrients: Nutrient values per 100g, or None if nothing matched
+
+        Returns:
+            Nutrition values scaled to portion
+        """
+        if nutrients is None:
             # Return default values if not found
             logger.warning(f"Using default values for: {food_item.name}")
+            self._record_fallback(food_item.name)
             return self._get_default_nutrition(food_item)
 
-        # Extract nutrients from USDA data
-        nutrients = self._extract_nutrients(food_data)
-
         # Scale to portion size
         scaled_nutrients = self._scale_to_portion(nutrients, food_item.quantity)
 
         return scaled_nutrients
 
-    def _extract_nutrients(self, food_data: Dict[str, Any]) -> Dict[str, float]:
+    def _extract_nutrients(self, food_data: Dict[str, Any]) -> NutrientVector:
         """
         Extract relevant nutrients from USDA food data.
 
@@ -90,50 +738,20 @@ class NutritionService:
             food_data: USDA food data response
 
         Returns:
-            Dict of nutrient values per 100g
-        """
-        nutrients = {
-            'protein': 0.0,
-            'carbs': 0.0,
-            'fat': 0.0,
-            'fiber': 0.0,
-            'calories': 0.0,
-            # Micronutrients
-            'vitamin_a': 0.0,
-            'vitamin_c': 0.0,
-            'vitamin_b12': 0.0,
-            'iron': 0.0,
-            'magnesium': 0.0,
-            'potassium': 0.0,
-        }
-
-        # USDA nutrient ID mapping
-        nutrient_mapping = {
-            '1003': 'protein',  # Protein
-            '1005': 'carbs',    # Carbohydrate
-            '1004': 'fat',      # Total lipid (fat)
-            '1079': 'fiber',    # Fiber
-            '1008': 'calories', # Energy (kcal)
-            '1106': 'vitamin_a',  # Vitamin A
-            '1162': 'vitamin_c',  # Vitamin C
-            '1178': 'vitamin_b12',  # Vitamin B-12
-            '1089': 'iron',     # Iron
-            '1090': 'magnesium',  # Magnesium
-            '1092': 'potassium',  # Potassium
-        }
+            NutrientVector of values per 100g
+        """
+        values = [0.0] * len(NUTRIENT_KEYS)
 
-        if 'foodNutrients' in food_data:
-            for nutrient in food_data['foodNutrients']:
-                nutrient_id = str(nutrient.get('nutrientId', ''))
-                if nutrient_id in nutrient_mapping:
-                    key = nutrient_mapping[nutrient_id]
-                    value = nutrient.get('value', 0.0)
-                    nutrients[key] = float(value)
+        for nutrient in food_data.get('foodNutrients', ()):
+            slot = USDA_NUTRIENT_SLOTS.get(nutrient.get('nutrientId'))
+            if slot is not None:
+                values[slot] = float(nutrient.get('value', 0.0))
 
+        nutrients = NutrientVector(values)
         logger.debug(f"Extracted nutrients: {nutrients}")
         return nutrients
 
-    def _scale_to_portion(self, nutrients: Dict[str, float], grams: float) -> Dict[str, float]:
+    def _scale_to_portion(self, nutrients: NutrientVector, grams: float) -> NutrientVector:
         """
         Scale nutrient values from 100g to actual portion.
 
@@ -144,10 +762,9 @@ class NutritionService:
         Returns:
             Scaled nutrient values
         """
-        scale_factor = grams / 100.0
-        return {key: value * scale_factor for key, value in nutrients.items()}
+        return nutrients.scaled(grams / 100.0)
 
-    def _get_default_nutrition(self, food_item: FoodItem) -> Dict[str, float]:
+    def _get_default_nutrition(self, food_item: FoodItem) -> NutrientVector:
         """
         Return default/estimated nutrition values when USDA data unavailable.
 
@@ -155,53 +772,118 @@ class NutritionService:
             food_item: Food item needing default values
 
         Returns:
-            Dict with estimated nutrition values
-        """
-        # Very basic defaults (should be improved with a local database)
-        defaults_per_100g = {
-            'protein': 15.0,
-            'carbs': 25.0,
-            'fat': 8.0,
-            'fiber': 3.0,
-            'calories': 200.0,
-            'vitamin_a': 50.0,
-            'vitamin_c': 10.0,
-            'vitamin_b12': 0.5,
-            'iron': 2.0,
-            'magnesium': 30.0,
-            'potassium': 200.0,
+            Estimated nutrition values scaled to portion
+        """
+        return self._scale_to_portion(DEFAULT_NUTRIENTS_PER_100G, food_item.quantity)
+
+    def _get_degraded_nutrition(self, food_item: FoodItem) -> NutrientVector:
+        """
+        Default values, marked degraded, for an item whose lookup could not run.
+
+        Args:
+            food_item: Food item needing default values
+
+        Returns:
+            Estimated nutrition values scaled to portion
+        """
+        logger.warning(f"Nutrition lookup unavailable, using default values for: {food_item.name}")
+        # Not a missing label: keep it out of the fallback report
+        self._lookup_counts["degraded"] += 1
+        return self._get_default_nutrition(food_item).as_degraded()
+
+    def _record_fallback(self, food_name: str) -> None:
+        """Count a label with no match that was answered with default values."""
+        self._lookup_counts["defaults_used"] += 1
+        key = self.normalize_food_name(food_name)
+        if key not in self._fallback_labels and (
+            len(self._fallback_labels) >= settings.nutrition_fallback_labels_tracked
+        ):
+            # Make room by dropping the rarest label seen so far
+            rarest, _ = min(self._fallback_labels.items(), key=lambda item: item[1])
+            del self._fallback_labels[rarest]
+        self._fallback_labels[key] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return nutrition lookup metrics."""
+        return {
+            "lookups": {
+                outcome: self._lookup_counts[outcome]
+                for outcome in (
+                    "found", "not_found", "errors", "short_circuited",
+                    "quota_exhausted", "quota_skipped", "deadline_exceeded",
+                    "negative_cache_hits", "defaults_used", "degraded"
+                )
+            },
+            "top_fallback_labels": [
+                {"label": label, "count": count}
+                for label, count in self._fallback_labels.most_common(20)
+            ],
+            "cache": self._cache.stats(),
+            "negative_cache": self._negative_cache.stats(),
+            "store": self._store.stats() if self._store is not None else None,
+            "single_flight": self._inflight.stats(),
+            "circuit_breaker": self._breaker.stats(),
+            "hedging": self._hedge_policy.stats() if self._hedge_policy is not None else None,
+            "quota": self._quota.stats() if self._quota is not None else None,
         }
 
-        return self._scale_to_portion(defaults_per_100g, food_item.quantity)
+    def aggregate_meal_nutrition(self, food_items: List[FoodItem]) -> NutrientVector:
+        """
+        Get total nutrition for all food items in a meal (blocking).
+
+        Args:
+            food_items: List of detected food items
 
-    def aggregate_meal_nutrition(self, food_items: List[FoodItem]) -> Dict[str, float]:
+        Returns:
+            Aggregated nutrition values
         """
-        Get total nutrition for all food items in a meal.
+        return self._sum_nutrition(
+            [self.get_nutrition_for_food(food_item) for food_item in food_items]
+        )
+
+    async def aggregate_meal_nutrition_async(
+        self,
+        food_items: List[FoodItem],
+        deadline: Optional[Deadline] = None
+    ) -> NutrientVector:
+        """
+        Get total nutrition for all food items in a meal (async).
+        Lookups run concurrently, capped by settings.usda_max_concurrent_lookups.
 
         Args:
             food_items: List of detected food items
+            deadline: Request deadline; items not resolved in time use defaults
 
         Returns:
             Aggregated nutrition values
         """
-        total = {
-            'protein': 0.0,
-            'carbs': 0.0,
-            'fat': 0.0,
-            'fiber': 0.0,
-            'calories': 0.0,
-            'vitamin_a': 0.0,
-            'vitamin_c': 0.0,
-            'vitamin_b12': 0.0,
-            'iron': 0.0,
-            'magnesium': 0.0,
-            'potassium': 0.0,
-        }
+        semaphore = asyncio.Semaphore(max(1, settings.usda_max_concurrent_lookups))
+
+        async def lookup(food_item: FoodItem) -> NutrientVector:
+            async with semaphore:
+                return await self.get_nutrition_for_food_async(food_item, deadline)
+
+        # gather() keeps input order, so the sum below is independent of
+        # which lookup finishes first
+        nutrition_per_item = await asyncio.gather(
+            *(lookup(food_item) for food_item in food_items)
+        )
+
+        return self._sum_nutrition(list(nutrition_per_item))
 
-        for food_item in food_items:
-            nutrition = self.get_nutrition_for_food(food_item)
-            for key in total.keys():
-                total[key] += nutrition.get(key, 0.0)
+    def _sum_nutrition(self, nutrition_per_item: List[Mapping[str, float]]) -> NutrientVector:
+        """
+        Sum per-item nutrition values into meal totals.
+
+        Args:
+            nutrition_per_item: Portion-scaled nutrition for each food item
+
+        Returns:
+            Aggregated nutrition values
+        """
+        total = NutrientVector.sum(
+            NutrientVector.from_dict(nutrition) for nutrition in nutrition_per_item
+        )
 
         logger.info(f"Total meal nutrition: {total}")
         return total
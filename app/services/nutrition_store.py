@@ -0,0 +1,218 @@
+"""
+Persistent SQLite store for resolved food nutrient profiles.
+Second cache tier under the in-memory lookup cache; survives restarts and
+deploys and can be shared by several uvicorn workers on the same host.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models.nutrients import NutrientVector
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS food_nutrients (
+    food_key TEXT PRIMARY KEY,
+    nutrients TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class NutritionStore:
+    """SQLite (WAL mode) store of per-100g nutrient profiles keyed on food name."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        batch_size: int = 32,
+        flush_interval_seconds: float = 5.0,
+        busy_timeout_ms: int = 5000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize store. The database is opened lazily on first use.
+
+        Args:
+            path: SQLite database file path
+            ttl_seconds: How long stored profiles stay valid
+            batch_size: Pending writes that trigger a flush
+            flush_interval_seconds: Max age of pending writes before a flush
+            busy_timeout_ms: How long to wait on another worker's write lock
+            clock: Wall-clock time source (injectable for tests)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.busy_timeout_ms = busy_timeout_ms
+        self._clock = clock
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, NutrientVector] = {}
+        self._last_flush = clock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.flushes = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and apply WAL/concurrency pragmas (lock held)."""
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000.0,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened nutrition store: {self.path}")
+        return self._conn
+
+    def get(self, key: str) -> Optional[NutrientVector]:
+        """
+        Look up a stored profile.
+
+        Args:
+            key: Normalized food name
+
+        Returns:
+            Nutrient values per 100g, or None if missing/expired
+        """
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.hits += 1
+                return pending
+
+            try:
+                row = self._connect().execute(
+                    "SELECT nutrients FROM food_nutrients WHERE food_key = ? AND expires_at > ?",
+                    (key, self._clock())
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.errors += 1
+                logger.error(f"Nutrition store read failed for '{key}': {str(e)}")
+                return None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return NutrientVector.from_dict(json.loads(row[0]))
+
+    def put(self, key: str, nutrients: NutrientVector) -> None:
+        """
+        Queue a profile for writing; flushes once the batch is full or stale.
+
+        Args:
+            key: Normalized food name
+            nutrients: Nutrient values per 100g
+        """
+        with self._lock:
+            self._pending[key] = nutrients
+            due = (
+                len(self._pending) >= self.batch_size
+                or self._clock() - self._last_flush >= self.flush_interval_seconds
+            )
+
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all pending profiles in a single transaction.
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            self._last_flush = self._clock()
+            if not self._pending:
+                return 0
+
+            now = self._clock()
+            rows: List[Tuple[str, str, float, float]] = [
+                # Stored keyed by name so rows survive changes to the slot layout
+                (key, json.dumps(nutrients.to_dict()), now, now + self.ttl_seconds)
+                for key, nutrients in self._pending.items()
+            ]
+
+            try:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO food_nutrients "
+                    "(food_key, nutrients, updated_at, expires_at) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self.errors += 1
+                logger.error(f"Nutrition store flush failed ({len(rows)} rows): {str(e)}")
+                if self._conn is not None and self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                return 0
+
+            self._pending.clear()
+            self.writes += len(rows)
+            self.flushes += 1
+            return len(rows)
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired rows.
+
+        Returns:
+            Number of rows deleted
+        """
+        with self._lock:
+            try:
+                cursor = self._connect().execute(
+                    "DELETE FROM food_nutrients WHERE expires_at <= ?",
+                    (self._clock(),)
+                )
+            except sqlite3.Error as e:
+                self.errors += 1
+                logger.error(f"Nutrition store purge failed: {str(e)}")
+                return 0
+
+        if cursor.rowcount:
+            logger.info(f"Purged {cursor.rowcount} expired nutrition profiles")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store hit/miss/write counters."""
+        return {
+            "path": self.path,
+            "pending_writes": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "flushes": self.flushes,
+            "errors": self.errors,
+        }
@@ -1,13 +1,29 @@
 """
 Food recognition using Hugging Face vision models.
 """
+import asyncio
 import logging
-from typing import List, Dict, Any
+import multiprocessing
+import time
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Iterator, List, Dict, Any, Optional, TypeVar, Union
+import numpy as np
 from huggingface_hub import InferenceClient
-from PIL import Image
 
 from app.config import settings
 from app.models.nutrition import FoodItem
+from app.services import vision_worker
+from app.services.food_classifier import FoodClassifier, food_classifier
+from app.services.vision_worker import ImageSource
+from app.utils.batching import MicroBatcher
+from app.utils.cache import PerceptualHashCache
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+T = TypeVar("T")
+
+# What callers hand in: a file path or the downloaded image bytes
+MealImage = Union[str, bytes, memoryview]
 
 logger = logging.getLogger(__name__)
 
@@ -16,45 +32,360 @@ class VisionService:
     """Service for AI-powered food recognition."""
 
     def __init__(self):
-        """Initialize Hugging Face client."""
-        # Note: Using demo mode for MVP testing
-        # In production, integrate with updated Hugging Face API or other vision service
+        """Initialize vision backend (demo mode or local ONNX classifier)."""
         self.client = None
-        self.demo_mode = True  # Enable demo mode for testing
+        self.demo_mode = settings.vision_backend != "onnx"
+        # Local CPU model, loaded once in startup (VISION_BACKEND=onnx)
+        self.classifier: Optional[FoodClassifier] = None if self.demo_mode else food_classifier
+
+        # Image decoding/preprocessing runs here, never on the event loop.
+        # Process mode: each worker owns a model copy and runs whole images.
+        self._executor: Optional[Executor] = None
+        self._process_mode = settings.vision_executor == "process"
+        # Concurrent images share one forward pass (VISION_MAX_BATCH_SIZE=1 disables)
+        self._batcher: Optional[MicroBatcher] = None
+        if self.classifier is not None and not self._process_mode and settings.vision_max_batch_size > 1:
+            self._batcher = MicroBatcher(
+                self._classify_batch,
+                max_batch_size=settings.vision_max_batch_size,
+                max_wait_seconds=settings.vision_max_batch_wait_ms / 1000
+            )
+        # Detections of recent photos by perceptual hash (no pixels kept)
+        self._result_cache: Optional[PerceptualHashCache] = None
+        if settings.vision_cache_max_entries > 0:
+            self._result_cache = PerceptualHashCache(
+                max_entries=settings.vision_cache_max_entries,
+                ttl_seconds=settings.vision_cache_ttl_seconds,
+                max_distance=settings.vision_cache_max_distance,
+                min_detail_bits=settings.vision_cache_min_detail_bits
+            )
+
+        self._images = 0
+        self._decode_seconds = 0.0
+        self._decode_seconds_max = 0.0
+        self._inference_seconds = 0.0
+        self._queue_wait_seconds = 0.0
+        self._loop_blocking_seconds = 0.0
+        self._loop_blocking_seconds_max = 0.0
+
+    async def startup(self) -> None:
+        """
+        Start the image decoding pool and load/warm up the local model
+        (called from app lifespan).
+
+        Raises:
+            ClassifierUnavailableError: If the ONNX backend is selected but cannot load
+        """
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+
+        if self._process_mode:
+            # Start every worker now so model loading happens before traffic
+            await asyncio.gather(*(
+                loop.run_in_executor(executor, vision_worker.worker_ready)
+                for _ in range(max(1, settings.vision_decode_workers))
+            ))
+        elif self.classifier is not None:
+            await loop.run_in_executor(executor, self.classifier.warmup)
+
+        logger.info(
+            f"Vision pool ready ({settings.vision_decode_workers} "
+            f"{'processes' if self._process_mode else 'threads'})"
+        )
+
+    def preload(self) -> None:
+        """
+        Load the local model before workers are forked (python -m app.prefork).
+
+        ONNX Runtime starts no pool threads with a single intra-op thread, so
+        the session survives fork and its weights stay shared copy-on-write.
+        Parallelism then comes from the number of workers.
+        """
+        if self.classifier is None or self._process_mode:
+            return
+        self.classifier.intra_op_threads = 1
+        self.classifier.load()
+
+    async def shutdown(self) -> None:
+        """Stop the image decoding pool (called from app lifespan)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        """Return the bounded decoding pool, creating it on first use."""
+        if self._executor is None:
+            workers = max(1, settings.vision_decode_workers)
+            if self._process_mode:
+                # spawn, not fork: the parent runs an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=vision_worker.init_worker,
+                    initargs=(self.classifier is not None,)
+                )
+            else:
+                # Pillow and ONNX Runtime release the GIL, so threads scale across cores
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="vision-decode"
+                )
+        return self._executor
+
+    @contextmanager
+    def _image_source(self, image: MealImage) -> Iterator[ImageSource]:
+        """
+        Turn a meal image into what the pool jobs read.
+
+        Threads decode paths and bytes directly; worker processes get
+        in-memory images through a shared memory segment, removed on exit.
+
+        Args:
+            image: File path or encoded image bytes
+
+        Yields:
+            ImageSource for _prepare_image / vision_worker jobs
+        """
+        if self._process_mode and not isinstance(image, str):
+            with vision_worker.share_image(image) as source:
+                yield source
+        else:
+            yield image
+
+    def _prepare_image(self, source: ImageSource, submitted_at: float) -> Dict[str, Any]:
+        """
+        Open and preprocess an image (runs in the decoding pool).
+
+        Args:
+            source: Path, bytes or shared memory segment of the meal image
+            submitted_at: perf_counter() when the job was queued
+
+        Returns:
+            Image metadata, the model input (None in demo mode) plus
+            queue-wait and decode timings
+        """
+        return vision_worker.prepare_image(source, submitted_at, self.classifier)
+
+    async def _within_deadline(
+        self,
+        job: Awaitable[T],
+        deadline: Optional[Deadline],
+        stage: str
+    ) -> T:
+        """
+        Await a pool job, giving up when the request deadline runs out.
+
+        Args:
+            job: Awaitable result of the stage
+            deadline: Request deadline (None = no limit)
+            stage: Stage name (for the error message)
+
+        Returns:
+            The job's result
+
+        Raises:
+            DeadlineExceeded: If the stage did not finish in time
+        """
+        if deadline is None:
+            return await job
 
-    async def analyze_food_image(self, image_path: str) -> List[FoodItem]:
+        try:
+            return await asyncio.wait_for(
+                job, timeout=deadline.remaining(settings.response_reply_reserve_seconds)
+            )
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline exceeded during {stage} ({deadline.elapsed():.2f}s)")
+
+    async def _prepare_image_off_loop(
+        self,
+        source: ImageSource,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        Run _prepare_image in the decoding pool, within the deadline if given.
+
+        Args:
+            source: Path, bytes or shared memory segment of the meal image
+            deadline: Request deadline
+
+        Returns:
+            Image metadata from _prepare_image (with predictions in process mode)
+
+        Raises:
+            DeadlineExceeded: If decoding did not finish in time
+        """
+        # Worker processes also classify, returning predictions instead of the tensor
+        prepare = vision_worker.process_image if self._process_mode else self._prepare_image
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(self._get_executor(), prepare, source, time.perf_counter())
+        return await self._within_deadline(job, deadline, "image decoding")
+
+    async def _classify_batch(self, model_inputs: List[np.ndarray]) -> List[List[Dict[str, Any]]]:
+        """
+        Run one forward pass over several preprocessed images in the pool.
+
+        Args:
+            model_inputs: Preprocessed images from _prepare_image
+
+        Returns:
+            Predictions per image, in order
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), self.classifier.classify, np.stack(model_inputs)
+        )
+
+    async def _classify_off_loop(
+        self,
+        model_input: np.ndarray,
+        deadline: Optional[Deadline] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Classify one preprocessed image, batched with concurrent requests when enabled.
+
+        Args:
+            model_input: Preprocessed image from _prepare_image
+            deadline: Request deadline
+
+        Returns:
+            Predictions for the image
+
+        Raises:
+            DeadlineExceeded: If inference did not finish in time
+        """
+        if self._batcher is not None:
+            return await self._within_deadline(self._batcher.submit(model_input), deadline, "food recognition")
+
+        results = await self._within_deadline(self._classify_batch([model_input]), deadline, "food recognition")
+        return results[0]
+
+    def _record_timings(self, image_info: Dict[str, Any], loop_blocking_seconds: float) -> None:
+        """Accumulate per-image decode and event-loop blocking times."""
+        self._images += 1
+        self._decode_seconds += image_info["decode_seconds"]
+        self._decode_seconds_max = max(self._decode_seconds_max, image_info["decode_seconds"])
+        self._inference_seconds += image_info["inference_seconds"]
+        self._queue_wait_seconds += image_info["queue_wait_seconds"]
+        self._loop_blocking_seconds += loop_blocking_seconds
+        self._loop_blocking_seconds_max = max(self._loop_blocking_seconds_max, loop_blocking_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return decoding pool, inference (incl. batch wait) and event-loop blocking metrics."""
+        images = self._images or 1
+        return {
+            "backend": "demo" if self.demo_mode else "onnx",
+            "executor": "process" if self._process_mode else "thread",
+            "decode_workers": settings.vision_decode_workers,
+            "images": self._images,
+            "decode_ms_avg": round(self._decode_seconds / images * 1000, 2),
+            "decode_ms_max": round(self._decode_seconds_max * 1000, 2),
+            "inference_ms_avg": round(self._inference_seconds / images * 1000, 2),
+            "queue_wait_ms_avg": round(self._queue_wait_seconds / images * 1000, 2),
+            "loop_blocking_ms_avg": round(self._loop_blocking_seconds / images * 1000, 3),
+            "loop_blocking_ms_max": round(self._loop_blocking_seconds_max * 1000, 3),
+            # In process mode the model lives in the workers
+            "classifier": self.classifier.stats() if self.classifier is not None and not self._process_mode else None,
+            "batching": self._batcher.stats() if self._batcher is not None else None,
+            "result_cache": self._result_cache.stats() if self._result_cache is not None else None,
+        }
+
+    async def analyze_food_image(
+        self,
+        image: MealImage,
+        deadline: Optional[Deadline] = None
+    ) -> List[FoodItem]:
         """
         Analyze food image and return detected items.
 
         Args:
-            image_path: Path to the meal image
+            image: Path to the meal image, or its encoded bytes as downloaded
+                (bytes or memoryview; never written to disk)
+            deadline: Request deadline; analysis is not started once it has run out
 
         Returns:
             List of detected FoodItem objects
+
+        Raises:
+            DeadlineExceeded: If the deadline ran out before analysis finished
         """
-        try:
-            logger.info(f"Analyzing image: {image_path}")
+        if deadline is not None:
+            deadline.check("vision analysis", settings.response_reply_reserve_seconds)
+
+        # Time spent on the event loop = wall time minus time awaiting the pool
+        started = time.perf_counter()
+        awaited = 0.0
 
-            # Verify image exists
-            with Image.open(image_path) as img:
-                width, height = img.size
-                logger.info(f"Image size: {width}x{height}")
+        try:
+            if isinstance(image, str):
+                logger.info(f"Analyzing image: {image}")
+            else:
+                logger.info(f"Analyzing in-memory image ({memoryview(image).nbytes} bytes)")
+
+            with self._image_source(image) as source:
+                image_hash = None
+                if self._result_cache is not None:
+                    wait_started = time.perf_counter()
+                    image_hash = await self._within_deadline(
+                        asyncio.get_running_loop().run_in_executor(
+                            self._get_executor(), vision_worker.hash_image, source
+                        ),
+                        deadline,
+                        "image hashing"
+                    )
+                    awaited += time.perf_counter() - wait_started
+
+                    cached = self._result_cache.get(image_hash)
+                    if cached is not None:
+                        logger.info(f"Same or near-identical photo seen recently, reusing {len(cached)} detections")
+                        return [food.model_copy() for food in cached]
+
+                # Verify image exists (decoded in the pool, off the event loop)
+                wait_started = time.perf_counter()
+                image_info = await self._prepare_image_off_loop(source, deadline)
+                awaited += time.perf_counter() - wait_started
+            logger.info(f"Image size: {image_info['width']}x{image_info['height']}")
+
+            predictions = image_info.pop("predictions", [])
+            image_info.setdefault("inference_seconds", 0.0)
+            if image_info.get("model_input") is not None:
+                wait_started = time.perf_counter()
+                predictions = await self._classify_off_loop(image_info.pop("model_input"), deadline)
+                image_info["inference_seconds"] = time.perf_counter() - wait_started
+                awaited += image_info["inference_seconds"]
 
             # DEMO MODE: Simulate food detection for testing
-            # TODO: Integrate with updated Hugging Face Serverless API or OpenAI Vision
             if self.demo_mode:
                 logger.info("Running in DEMO mode - simulating food detection")
-                detected_foods = self._simulate_food_detection(image_path)
+                detected_foods = self._simulate_food_detection(image)
             else:
-                # Production: Use actual AI vision API here
-                # This will be updated once you're ready for production
-                detected_foods = []
+                # Local classifier already ran in the pool
+                detected_foods = [
+                    self._create_food_item(prediction)
+                    for prediction in predictions
+                    if prediction["score"] >= settings.vision_min_confidence
+                ]
+                for food in detected_foods:
+                    logger.info(f"Detected: {food.name} ({food.quantity}g, confidence: {food.confidence:.0%})")
 
             if not detected_foods:
                 logger.warning("No food items detected")
 
+            if image_hash is not None and detected_foods:
+                self._result_cache.set(image_hash, [food.model_copy() for food in detected_foods])
+
+            loop_blocking = time.perf_counter() - started - awaited
+            self._record_timings(image_info, loop_blocking)
+            logger.info(
+                f"Image decoded in {image_info['decode_seconds'] * 1000:.1f}ms "
+                f"(queued {image_info['queue_wait_seconds'] * 1000:.1f}ms, "
+                f"inference {image_info['inference_seconds'] * 1000:.1f}ms), "
+                f"event loop blocked {loop_blocking * 1000:.2f}ms"
+            )
+
             return detected_foods
 
+        except DeadlineExceeded:
+            raise
+
         except Exception as e:
             logger.error(f"Error analyzing image: {str(e)}")
             raise Exception(f"Vision analysis failed: {str(e)}")
@@ -64,7 +395,7 @@ class VisionService:
         Create FoodItem from prediction.
 
         Args:
-            prediction: Prediction dict from Hugging Face
+            prediction: {'label', 'score'} prediction (Hugging Face style)
 
         Returns:
             FoodItem object
@@ -124,13 +455,13 @@ class VisionService:
 
         return round(adjusted_portion, 0)
 
-    def _simulate_food_detection(self, image_path: str) -> List[FoodItem]:
+    def _simulate_food_detection(self, image: MealImage) -> List[FoodItem]:
         """
         Simulate food detection for demo/testing purposes.
         In production, replace with actual AI vision API.
 
         Args:
-            image_path: Path to image
+            image: Path or bytes of the image
 
         Returns:
             List of simulated food detections
@@ -0,0 +1,192 @@
+"""
+Image work for the vision pool, in threads or in worker processes
+(VISION_EXECUTOR=process).
+
+Images come as a file path or as the downloaded bytes. Threads decode the
+bytes in place; in process mode each worker loads the classifier once
+(init_worker) and in-memory images are handed over through a shared memory
+segment, so no image data is pickled through the pool's pipe.
+"""
+import io
+import logging
+import os
+import signal
+import time
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from PIL import Image
+
+from app.services.food_classifier import FoodClassifier, food_classifier
+from app.utils.image import check_image_header, dhash, prepare_image_for_model
+
+logger = logging.getLogger(__name__)
+
+# A file path, encoded image bytes, or (shared memory segment name, size in bytes)
+ImageSource = Union[str, bytes, memoryview, Tuple[str, int]]
+
+# Worker process state (set by init_worker)
+_worker_classifier: Optional[FoodClassifier] = None
+
+
+@contextmanager
+def share_image(data: Union[bytes, memoryview]) -> Iterator[Tuple[str, int]]:
+    """
+    Copy image bytes into a shared memory segment for a worker process.
+    The segment is removed when the block exits.
+
+    Args:
+        data: Encoded image bytes
+
+    Yields:
+        ImageSource for the worker: (segment name, size)
+    """
+    segment = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    try:
+        segment.buf[:len(data)] = data
+        yield segment.name, len(data)
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+@contextmanager
+def open_image(source: ImageSource) -> Iterator[Image.Image]:
+    """
+    Open an image from a path, in-memory bytes or a shared memory segment.
+
+    Args:
+        source: File path, encoded bytes or (segment name, size)
+
+    Yields:
+        Opened (lazily decoded) PIL image
+    """
+    if isinstance(source, str):
+        with Image.open(source) as img:
+            yield img
+        return
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # BytesIO shares an immutable bytes buffer instead of copying it
+        with Image.open(io.BytesIO(source)) as img:
+            yield img
+        return
+
+    name, size = source
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        with segment.buf[:size] as view:
+            encoded = io.BytesIO(view)
+        with Image.open(encoded) as img:
+            yield img
+    finally:
+        segment.close()
+
+
+def encoded_size(source: ImageSource) -> int:
+    """Size in bytes of the encoded image."""
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    if isinstance(source, tuple):
+        return source[1]
+    return memoryview(source).nbytes
+
+
+def hash_image(source: ImageSource) -> int:
+    """
+    Perceptual hash from a reduced-scale decode, once the header checks pass.
+
+    Args:
+        source: File path, encoded bytes or (segment name, size)
+
+    Returns:
+        64-bit dHash
+
+    Raises:
+        ImageRejectedError: If the image fails the format, size or dimension checks
+    """
+    with open_image(source) as img:
+        check_image_header(img, encoded_size(source))
+        return dhash(img)
+
+
+def prepare_image(
+    source: ImageSource,
+    submitted_at: float,
+    classifier: Optional[FoodClassifier] = None
+) -> Dict[str, Any]:
+    """
+    Validate and preprocess an image, opening and decoding it once.
+
+    Args:
+        source: File path, encoded bytes or (segment name, size)
+        submitted_at: perf_counter() when the job was queued
+        classifier: Classifier whose preprocessing to apply (None in demo mode:
+            the image is only checked, not decoded)
+
+    Returns:
+        Image metadata (width, height, format, orientation), the model input
+        (None without classifier) plus queue-wait and decode timings
+
+    Raises:
+        ImageRejectedError: If the image fails the format, size or dimension checks
+    """
+    started = time.perf_counter()
+    short_side = None
+    if classifier is not None:
+        classifier.load()  # The model may fix input_size
+        short_side = classifier.resize_side
+
+    with open_image(source) as img:
+        pixels, image_info = prepare_image_for_model(img, short_side, encoded_size(source))
+
+    image_info["model_input"] = classifier.to_model_input(pixels) if pixels is not None else None
+    image_info["queue_wait_seconds"] = started - submitted_at
+    image_info["decode_seconds"] = time.perf_counter() - started
+    return image_info
+
+
+def init_worker(load_classifier: bool) -> None:
+    """
+    Process pool initializer: load and warm up the model once per worker.
+
+    Args:
+        load_classifier: Whether the local classifier is in use
+    """
+    global _worker_classifier
+
+    # Ctrl-C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if load_classifier:
+        food_classifier.warmup()
+        _worker_classifier = food_classifier
+
+
+def worker_ready() -> bool:
+    """No-op job used to start (and initialize) worker processes ahead of traffic."""
+    time.sleep(0.05)  # Keep this worker busy so the next job starts another one
+    return _worker_classifier is None or _worker_classifier.loaded
+
+
+def process_image(source: ImageSource, submitted_at: float) -> Dict[str, Any]:
+    """
+    Decode, preprocess and classify an image in a worker process.
+
+    Args:
+        source: File path or (segment name, size)
+        submitted_at: perf_counter() when the job was queued (system-wide clock)
+
+    Returns:
+        prepare_image's metadata and timings, with predictions (empty in
+        demo mode) and inference_seconds instead of the model input
+    """
+    image_info = prepare_image(source, submitted_at, _worker_classifier)
+    model_input = image_info.pop("model_input")
+
+    started = time.perf_counter()
+    image_info["predictions"] = []
+    if model_input is not None:
+        image_info["predictions"] = _worker_classifier.classify(model_input[None])[0]
+    image_info["inference_seconds"] = time.perf_counter() - started
+    return image_info
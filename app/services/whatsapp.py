@@ -1,6 +1,7 @@
 """
 WhatsApp Cloud API integration for sending/receiving messages.
 """
+import asyncio
 import logging
 import hmac
 import hashlib
@@ -10,14 +11,18 @@ import httpx
 from app.config import settings
 from app.models.message import WhatsAppResponse, ImageMessage
 from app.models.nutrition import NutritionResult
+from app.utils.deadline import Deadline, DeadlineExceeded
 from app.utils.formatting import format_nutrition_message, format_error_message
-from app.utils.image import ensure_temp_dir
+from app.utils.image import StreamingImageValidator
 from app.services.vision import vision_service
 from app.services.nutrition import nutrition_service
 from app.services.calculator import nutrition_calculator
 
 logger = logging.getLogger(__name__)
 
+# Read size for streamed media downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class WhatsAppService:
     """Service for WhatsApp Cloud API integration."""
@@ -111,70 +116,118 @@ class WhatsAppService:
             logger.error(f"Error sending message: {str(e)}")
             return False
 
-    async def download_image(self, media_id: str) -> Optional[str]:
+    async def download_image(self, media_id: str, deadline: Optional[Deadline] = None) -> Optional[bytes]:
         """
-        Download image from WhatsApp.
+        Download image from WhatsApp into memory (it is never written to disk).
+
+        The body is streamed: the download is abandoned as soon as it passes
+        MAX_IMAGE_SIZE_MB (or the announced Content-Length does), and format
+        and dimensions are checked as soon as the image header arrives.
 
         Args:
             media_id: WhatsApp media ID
+            deadline: Request deadline; the whole download (both requests and
+                every chunk) must finish before the reply reserve is reached
 
         Returns:
-            Path to downloaded image or None
-        """
-        try:
-            # First, get media URL
-            url = f"{settings.whatsapp_api_base_url}/{media_id}"
-            headers = {"Authorization": f"Bearer {self.api_token}"}
+            Encoded image bytes or None
 
-            async with httpx.AsyncClient() as client:
-                # Get media URL
-                response = await client.get(url, headers=headers, timeout=10.0)
-                response.raise_for_status()
-                media_url = response.json()["url"]
-
-                # Download the image
-                response = await client.get(media_url, headers=headers, timeout=15.0)
-                response.raise_for_status()
+        Raises:
+            DeadlineExceeded: If the download did not finish in time
+        """
+        if deadline is None:
+            deadline = Deadline(settings.response_timeout_seconds)
 
-                # Save to temp directory
-                temp_dir = ensure_temp_dir()
-                image_path = temp_dir / f"{media_id}.jpg"
+        try:
+            # httpx timeouts apply per connect/read, so a trickling server
+            # could otherwise hold the download open past the deadline
+            return await asyncio.wait_for(
+                self._fetch_media(media_id, deadline),
+                timeout=deadline.remaining(settings.response_reply_reserve_seconds)
+            )
 
-                with open(image_path, "wb") as f:
-                    f.write(response.content)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline exceeded during image download ({deadline.elapsed():.2f}s)")
 
-                logger.info(f"Image downloaded: {image_path}")
-                return str(image_path)
+        except DeadlineExceeded:
+            raise
 
         except Exception as e:
             logger.error(f"Error downloading image: {str(e)}")
             return None
 
-    async def process_meal_image(self, image_msg: ImageMessage) -> None:
+    async def _fetch_media(self, media_id: str, deadline: Deadline) -> bytes:
+        """
+        Look up the media URL and stream the image (see download_image).
+
+        Args:
+            media_id: WhatsApp media ID
+            deadline: Request deadline (caps each request's timeout)
+
+        Returns:
+            Encoded image bytes
+        """
+        # First, get media URL
+        url = f"{settings.whatsapp_api_base_url}/{media_id}"
+        headers = {"Authorization": f"Bearer {self.api_token}"}
+
+        async with httpx.AsyncClient() as client:
+            # Get media URL
+            deadline.check("media URL lookup")
+            response = await client.get(url, headers=headers, timeout=deadline.timeout(10.0))
+            response.raise_for_status()
+            media_url = response.json()["url"]
+
+            # Download the image
+            deadline.check("image download")
+            async with client.stream(
+                "GET", media_url, headers=headers, timeout=deadline.timeout(15.0)
+            ) as response:
+                response.raise_for_status()
+                content_length = response.headers.get("Content-Length")
+                validator = StreamingImageValidator(
+                    settings.max_image_size_bytes,
+                    int(content_length) if content_length and content_length.isdigit() else None
+                )
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    validator.feed(chunk)
+                image_bytes = validator.finish()
+
+            logger.info(
+                f"Image downloaded: {media_id} ({validator.format} "
+                f"{validator.width}x{validator.height}, {len(image_bytes)} bytes)"
+            )
+            return image_bytes
+
+    async def process_meal_image(self, image_msg: ImageMessage, deadline: Optional[Deadline] = None) -> None:
         """
         Complete pipeline: download, analyze, calculate, respond.
+        Every stage runs within one response deadline; nutrition lookups that
+        do not fit fall back to cached or default values.
 
         Args:
             image_msg: ImageMessage with sender and media info
+            deadline: Response deadline (started when the webhook arrived)
         """
-        image_paths = []
+        if deadline is None:
+            deadline = Deadline(settings.response_timeout_seconds)
 
         try:
             # 1. Download image
             logger.info(f"Processing meal image from {image_msg.sender}")
-            image_path = await self.download_image(image_msg.media_id)
+            image_bytes = await self.download_image(image_msg.media_id, deadline)
 
-            if not image_path:
+            if not image_bytes:
+                error_type = "timeout" if deadline.expired() else "invalid_image"
                 await self.send_message(
                     image_msg.sender,
-                    format_error_message("invalid_image")
+                    format_error_message(error_type)
                 )
                 return
 
-            image_paths.append(image_path)
-
-            # 2. Analyze with AI vision
-            detected_foods = await vision_service.analyze_food_image(image_path)
+            # 2. Analyze with AI vision (straight from memory; GDPR: the photo
+            # never touches the filesystem and is dropped with this request)
+            detected_foods = await vision_service.analyze_food_image(image_bytes, deadline)
 
             if not detected_foods:
                 await self.send_message(
@@ -184,7 +237,7 @@ class WhatsAppService:
                 return
 
             # 3. Get nutrition data
-            nutrition_data = nutrition_service.aggregate_meal_nutrition(detected_foods)
+            nutrition_data = await nutrition_service.aggregate_meal_nutrition_async(detected_foods, deadline)
 
             # 4. Calculate overall confidence
             overall_confidence = await vision_service.calculate_overall_confidence(detected_foods)
@@ -200,7 +253,17 @@ class WhatsAppService:
             message = format_nutrition_message(result)
             await self.send_message(image_msg.sender, message)
 
-            logger.info(f"Successfully processed meal for {image_msg.sender}")
+            logger.info(
+                f"Successfully processed meal for {image_msg.sender} "
+                f"in {deadline.elapsed():.2f}s"
+            )
+
+        except DeadlineExceeded as e:
+            logger.warning(f"Meal analysis ran out of time: {str(e)}")
+            await self.send_message(
+                image_msg.sender,
+                format_error_message("timeout")
+            )
 
         except Exception as e:
             logger.error(f"Error processing meal image: {str(e)}")
@@ -209,11 +272,6 @@ class WhatsAppService:
                 format_error_message("api_error", str(e))
             )
 
-        finally:
-            # 7. Cleanup (GDPR compliance)
-            from app.utils.image import cleanup_temp_images
-            cleanup_temp_images(image_paths)
-
 
 # Global instance
 whatsapp_service = WhatsAppService()
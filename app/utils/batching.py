@@ -0,0 +1,135 @@
+"""
+Micro-batching of concurrent async calls.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collect items submitted concurrently and process them in batches.
+
+    A batch is dispatched as soon as max_batch_size items are waiting, or
+    max_wait_seconds after its first item arrived, whichever comes first.
+    Each caller gets back the result at its own position in the batch.
+    Callers cancelled before dispatch (e.g. on a deadline) are dropped from
+    the batch.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.01
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            process_batch: Coroutine function returning one result per item, in order
+            max_batch_size: Most items per batch
+            max_wait_seconds: Longest time the first item of a batch waits for company
+        """
+        self._process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+
+        self._pending: List[Tuple[T, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: set = set()
+
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.total_queue_seconds = 0.0
+
+    async def submit(self, item: T) -> R:
+        """
+        Add an item to the next batch and wait for its result.
+
+        Args:
+            item: Input for process_batch
+
+        Returns:
+            The item's result
+
+        Raises:
+            Exception: Whatever process_batch raised for the batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._dispatch)
+
+        return await future
+
+    def _dispatch(self) -> None:
+        """Start processing the waiting items (up to max_batch_size)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = [entry for entry in self._pending[:self.max_batch_size] if not entry[1].done()]
+        del self._pending[:self.max_batch_size]
+
+        if self._pending:
+            # Overflow starts the next batch's wait now
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait_seconds, self._dispatch)
+
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future, float]]) -> None:
+        """Process one batch and resolve its callers' futures."""
+        dispatched = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        self.total_queue_seconds += sum(dispatched - queued for _, _, queued in batch)
+
+        try:
+            results = await self._process_batch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch of {len(batch)} items returned {len(results)} results")
+        except asyncio.CancelledError:
+            for _, future, _ in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} failed: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch counts, sizes and queueing time."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_seen": self.max_batch_seen,
+            "avg_queue_ms": round(self.total_queue_seconds / self.items * 1000, 2) if self.items else 0.0,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,223 @@
+"""
+In-process caching utilities.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Bounded in-memory cache with LRU eviction and per-entry TTL.
+    Safe to share between the event loop and worker threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries kept before evicting
+            ttl_seconds: Default time-to-live for entries
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key, refreshing its LRU position on hit.
+
+        Args:
+            key: Cache key
+            default: Value returned on miss
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Optional TTL override for this entry
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class PerceptualHashCache(LRUCache):
+    """
+    LRU + TTL cache keyed by perceptual image hashes.
+    A lookup that misses exactly falls back to the closest stored hash within
+    max_distance differing bits, so re-sent or re-compressed copies of a
+    photo hit. Keys are plain integers; callers never store image data.
+
+    Flat or low-texture pictures (a dark photo, an empty plate) all hash to
+    nearly the same value, so unrelated photos would match. Hashes with
+    fewer than min_detail_bits set (or clear) are neither stored nor looked up.
+    """
+
+    # Size of the hashes (dhash with hash_size=8)
+    HASH_BITS = 64
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_distance: int = 4,
+        min_detail_bits: int = 0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries kept before evicting
+            ttl_seconds: Default time-to-live for entries
+            max_distance: Largest Hamming distance treated as the same image
+            min_detail_bits: Fewest set (and clear) bits a hash needs to be cached
+            clock: Monotonic time source (injectable for tests)
+        """
+        super().__init__(max_entries, ttl_seconds, clock)
+        self.max_distance = max_distance
+        self.min_detail_bits = min_detail_bits
+        self.near_hits = 0
+        self.low_detail = 0
+
+    def has_detail(self, key: int) -> bool:
+        """True if the hash carries enough information to identify a photo."""
+        ones = key.bit_count()
+        return min(ones, self.HASH_BITS - ones) >= self.min_detail_bits
+
+    def get(self, key: int, default: Any = None) -> Any:
+        """
+        Look up a hash, accepting the nearest stored hash within max_distance.
+
+        Args:
+            key: Perceptual hash
+            default: Value returned on miss
+
+        Returns:
+            Cached value or default (always for low-detail hashes)
+        """
+        with self._lock:
+            if not self.has_detail(key):
+                self.low_detail += 1
+                return default
+
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                best_key, best_distance = key, 0
+            else:
+                best_key, best_distance = self._nearest(key, now)
+
+            if best_key is None:
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            if best_distance:
+                self.near_hits += 1
+            return self._entries[best_key][1]
+
+    def set(self, key: int, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value under a hash; low-detail hashes are not stored.
+
+        Args:
+            key: Perceptual hash
+            value: Value to cache
+            ttl_seconds: Time-to-live override (defaults to the cache TTL)
+        """
+        if self.has_detail(key):
+            super().set(key, value, ttl_seconds)
+
+    def _nearest(self, key: int, now: float) -> Tuple[Optional[int], int]:
+        """Closest live hash within max_distance, dropping expired entries (lock held)."""
+        best_key, best_distance = None, self.max_distance + 1
+        expired = []
+        for stored, (expires_at, _) in self._entries.items():
+            if expires_at <= now:
+                expired.append(stored)
+                continue
+            distance = (stored ^ key).bit_count()
+            if distance < best_distance:
+                best_key, best_distance = stored, distance
+
+        for stored in expired:
+            del self._entries[stored]
+        self.expirations += len(expired)
+        return best_key, best_distance
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters, including near-duplicate hits."""
+        stats = super().stats()
+        stats["near_hits"] = self.near_hits
+        stats["max_distance"] = self.max_distance
+        stats["low_detail"] = self.low_detail
+        return stats
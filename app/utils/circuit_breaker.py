@@ -0,0 +1,189 @@
+"""
+Circuit breaker for calls to a flaky or slow upstream service.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a rolling window of recent calls.
+
+    The circuit opens when, over the last window_size calls (and at least
+    min_calls), the share of failed calls or of calls slower than
+    slow_call_seconds reaches its threshold. While open, callers are
+    rejected immediately. After open_seconds a single trial call is let
+    through (half-open): a fast success closes the circuit, anything else
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 2.0,
+        slow_call_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize breaker in the closed state.
+
+        Args:
+            name: Upstream name (for logs and metrics)
+            window_size: Number of recent calls considered
+            min_calls: Calls needed in the window before the breaker can open
+            failure_rate_threshold: Failed-call share (0-1) that opens the circuit
+            slow_call_seconds: Duration above which a call counts as slow
+            slow_call_rate_threshold: Slow-call share (0-1) that opens the circuit
+            open_seconds: How long to reject calls before a trial call
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self.min_calls = max(1, min_calls)
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self._clock = clock
+
+        # (failed, slow) per call, most recent last
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=max(1, window_size))
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half-open once open_seconds have passed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Resolve the current state (lock held)."""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a call may go to the upstream.
+        Callers that are allowed must report the outcome with record_success
+        or record_failure (or release, if the call was never made).
+
+        Returns:
+            True if the call may proceed
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self) -> None:
+        """
+        Like allow_request, but raise when the call is not allowed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+    def release(self) -> None:
+        """Give back an allowed call that was abandoned before reaching the upstream."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self, duration_seconds: float) -> None:
+        """
+        Report a completed call.
+
+        Args:
+            duration_seconds: How long the call took
+        """
+        self._record(failed=False, slow=duration_seconds >= self.slow_call_seconds)
+
+    def record_failure(self, duration_seconds: float) -> None:
+        """
+        Report a failed call.
+
+        Args:
+            duration_seconds: How long the call took before failing
+        """
+        self._record(failed=True, slow=duration_seconds >= self.slow_call_seconds)
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        """Add a call outcome to the window and update the state."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if failed or slow:
+                    self._open()
+                else:
+                    self._state = self.CLOSED
+                    self._window.clear()
+                return
+
+            if state == self.OPEN:
+                # Late result of a call started before the circuit opened
+                return
+
+            self._window.append((failed, slow))
+            if len(self._window) < self.min_calls:
+                return
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        """Move to the open state (lock held)."""
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._window.clear()
+        self.times_opened += 1
+
+    def _rates(self) -> Tuple[float, float]:
+        """Failure and slow-call shares of the window (lock held)."""
+        if not self._window:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        return failures / len(self._window), slow / len(self._window)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return breaker state and window counters."""
+        with self._lock:
+            state = self._current_state()
+            failure_rate, slow_rate = self._rates()
+            return {
+                "name": self.name,
+                "state": state,
+                "window_calls": len(self._window),
+                "failure_rate": round(failure_rate, 4),
+                "slow_call_rate": round(slow_rate, 4),
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
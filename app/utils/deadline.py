@@ -0,0 +1,79 @@
+"""
+Request deadlines shared by every stage of a pipeline.
+"""
+import time
+from typing import Callable
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage starts after the request's time budget is spent."""
+
+
+class Deadline:
+    """
+    Absolute point in time by which a request must be answered.
+    Created once when the request arrives and passed down, so each stage
+    only gets whatever budget the previous stages left over.
+    """
+
+    def __init__(self, budget_seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Start the clock.
+
+        Args:
+            budget_seconds: Total time allowed from now
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.budget_seconds = budget_seconds
+        self._clock = clock
+        self._started_at = clock()
+        self._expires_at = self._started_at + budget_seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the deadline was created."""
+        return self._clock() - self._started_at
+
+    def remaining(self, reserve_seconds: float = 0.0) -> float:
+        """
+        Seconds left, never negative.
+
+        Args:
+            reserve_seconds: Budget to hold back for later stages
+
+        Returns:
+            Remaining budget
+        """
+        return max(0.0, self._expires_at - self._clock() - reserve_seconds)
+
+    def expired(self, reserve_seconds: float = 0.0) -> bool:
+        """Return True if no budget is left (after holding back reserve_seconds)."""
+        return self.remaining(reserve_seconds) <= 0.0
+
+    def timeout(self, cap_seconds: float, reserve_seconds: float = 0.0) -> float:
+        """
+        Timeout for a single operation: its own cap, or less if the budget is shorter.
+
+        Args:
+            cap_seconds: The operation's usual timeout
+            reserve_seconds: Budget to hold back for later stages
+
+        Returns:
+            Timeout in seconds
+        """
+        return min(cap_seconds, self.remaining(reserve_seconds))
+
+    def check(self, stage: str, reserve_seconds: float = 0.0) -> None:
+        """
+        Ensure there is budget left before starting a stage.
+
+        Args:
+            stage: Stage name (for the error message)
+            reserve_seconds: Budget to hold back for later stages
+
+        Raises:
+            DeadlineExceeded: If the budget is spent
+        """
+        if self.expired(reserve_seconds):
+            raise DeadlineExceeded(
+                f"Deadline exceeded before {stage} ({self.elapsed():.2f}s of {self.budget_seconds}s used)"
+            )
@@ -1,6 +1,7 @@
 """
 Response formatting utilities for WhatsApp messages.
 """
+from app.models.nutrients import NUTRIENT_TABLES
 from app.models.nutrition import NutritionResult
 
 
@@ -26,32 +27,21 @@ def format_nutrition_message(result: NutritionResult) -> str:
         f"• Fiber: {result.macros.fiber:.1f}g",
     ]
 
-    # Add micronutrients if available
+    # Add micronutrients if available, grouped into registry sections
     if result.micros:
+        for title, lines in NUTRIENT_TABLES.dv_sections:
+            message_parts.extend(["", f"*{title}:*"])
+            for field, label in lines:
+                percentage = getattr(result.micros, field)
+                if percentage is not None:
+                    message_parts.append(f"• {label}: {percentage:.0f}% DV")
+
+    if result.degraded:
         message_parts.extend([
             "",
-            "*Vitamins:*",
+            "⚠️ _Nutrition database temporarily unavailable – some values are rough estimates._"
         ])
 
-        if result.micros.vitamin_a_dv is not None:
-            message_parts.append(f"• Vitamin A: {result.micros.vitamin_a_dv:.0f}% DV")
-        if result.micros.vitamin_c_dv is not None:
-            message_parts.append(f"• Vitamin C: {result.micros.vitamin_c_dv:.0f}% DV")
-        if result.micros.vitamin_b12_dv is not None:
-            message_parts.append(f"• Vitamin B12: {result.micros.vitamin_b12_dv:.0f}% DV")
-
-        message_parts.extend([
-            "",
-            "*Minerals:*",
-        ])
-
-        if result.micros.iron_dv is not None:
-            message_parts.append(f"• Iron: {result.micros.iron_dv:.0f}% DV")
-        if result.micros.magnesium_dv is not None:
-            message_parts.append(f"• Magnesium: {result.micros.magnesium_dv:.0f}% DV")
-        if result.micros.potassium_dv is not None:
-            message_parts.append(f"• Potassium: {result.micros.potassium_dv:.0f}% DV")
-
     # Add confidence and disclaimer
     message_parts.extend([
         "",
@@ -0,0 +1,202 @@
+"""
+Hedged requests: when a call is slower than usual, race one duplicate
+against it and keep whichever answers first.
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of recent call durations with percentile lookup."""
+
+    def __init__(self, window_size: int = 512):
+        """
+        Initialize tracker.
+
+        Args:
+            window_size: Number of most recent durations kept
+        """
+        self._samples: Deque[float] = deque(maxlen=max(1, window_size))
+        self._lock = threading.Lock()
+
+    def record(self, duration_seconds: float) -> None:
+        """Add a completed call's duration."""
+        with self._lock:
+            self._samples.append(duration_seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window.
+
+        Args:
+            percent: Percentile (0-100)
+
+        Returns:
+            Duration in seconds, or None if no samples yet
+        """
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percent / 100.0 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class HedgePolicy:
+    """
+    When to hedge, and how often we may.
+
+    The hedge delay is a percentile of recently observed latency. Hedges are
+    paid for from a credit balance that grows by max_hedge_ratio per primary
+    call (capped at max_burst), so duplicates never exceed that share of
+    traffic even during a long slowdown. An optional admit callback can veto
+    individual hedges (e.g. when no rate-limit token is free).
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.1,
+        min_samples: int = 20,
+        min_delay_seconds: float = 0.01,
+        window_size: int = 512,
+        max_burst: float = 10.0,
+        admit: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Initialize policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            max_hedge_ratio: Maximum hedges per primary call (0-1)
+            min_samples: Observations needed before hedging starts
+            min_delay_seconds: Never hedge sooner than this
+            window_size: Number of recent latencies considered
+            max_burst: Maximum hedge credits that can accumulate
+            admit: Called before each hedge; returning False skips it
+        """
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self.max_burst = max(1.0, max_burst)
+        self.latency = LatencyTracker(window_size)
+        self._admit = admit
+
+        self._lock = threading.Lock()
+        self._credits = 0.0
+
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_denied = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Seconds to wait for the primary before hedging.
+
+        Returns:
+            Delay, or None while there are too few observations
+        """
+        if len(self.latency) < self.min_samples:
+            return None
+        return max(self.min_delay_seconds, self.latency.percentile(self.percentile))
+
+    def start_call(self) -> None:
+        """Count a primary call and earn hedge credit for it."""
+        with self._lock:
+            self.calls += 1
+            self._credits = min(self.max_burst, self._credits + self.max_hedge_ratio)
+
+    def try_acquire_hedge(self) -> bool:
+        """
+        Spend one hedge credit if available.
+
+        Returns:
+            True if a hedge may be sent
+        """
+        with self._lock:
+            if self._credits >= 1.0 and (self._admit is None or self._admit()):
+                self._credits -= 1.0
+                self.hedges += 1
+                return True
+            self.hedges_denied += 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging counters and the current delay."""
+        delay = self.hedge_delay()
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedges_denied": self.hedges_denied,
+            "hedge_ratio": round(self.hedges / self.calls, 4) if self.calls else 0.0,
+            "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+            "latency_samples": len(self.latency),
+        }
+
+
+async def hedged_call(fn: Callable[[], Awaitable[T]], policy: HedgePolicy) -> T:
+    """
+    Run fn(), racing one duplicate call if the first is slower than the policy's delay.
+    The losing call is cancelled. If the first call to finish fails while the
+    other is still running, the other call's result is used instead.
+
+    Args:
+        fn: Zero-argument coroutine function making one upstream request
+        policy: Hedge policy (latency history and hedge budget)
+
+    Returns:
+        Result of whichever call succeeded first
+    """
+    async def timed() -> T:
+        started = time.perf_counter()
+        result = await fn()
+        policy.latency.record(time.perf_counter() - started)
+        return result
+
+    policy.start_call()
+    delay = policy.hedge_delay()
+    if delay is None:
+        return await timed()
+
+    primary = asyncio.ensure_future(timed())
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or not policy.try_acquire_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(timed())
+        tasks.add(hedge)
+        logger.debug(f"Primary call exceeded {delay * 1000:.0f}ms, sent hedge")
+
+        pending = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded:
+                winner = primary if primary in succeeded else hedge
+                if winner is hedge:
+                    policy.hedge_wins += 1
+                return winner.result()
+            if not pending:
+                # Both failed; surface the primary's error
+                return primary.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
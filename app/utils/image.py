@@ -3,9 +3,11 @@ Image processing utilities for validation, resizing, and cleanup.
 """
 import os
 import logging
+import math
 from pathlib import Path
-from typing import Tuple
-from PIL import Image
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from PIL import ExifTags, Image, ImageFile
 import base64
 
 from app.config import settings
@@ -14,6 +16,21 @@ logger = logging.getLogger(__name__)
 
 # Supported image formats
 SUPPORTED_FORMATS = {"JPEG", "JPG", "PNG"}
+MIN_IMAGE_DIMENSION = 200
+# Give up looking for an image header after this many bytes (JPEG metadata
+# segments before the frame header can take a few hundred KB)
+MAX_HEADER_BYTES = 512 * 1024
+
+# EXIF orientation -> transpose that turns the stored pixels upright
+EXIF_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
 TEMP_IMAGE_DIR = Path("temp_images")
 
 
@@ -52,7 +69,7 @@ def validate_image(image_path: str) -> Tuple[bool, str]:
 
             # Check dimensions (minimum 480x480 recommended)
             width, height = img.size
-            if width < 200 or height < 200:
+            if width < MIN_IMAGE_DIMENSION or height < MIN_IMAGE_DIMENSION:
                 return False, f"Image too small ({width}x{height}). Minimum 480x480 recommended"
 
         return True, ""
@@ -62,6 +79,214 @@ def validate_image(image_path: str) -> Tuple[bool, str]:
         return False, f"Invalid image file: {str(e)}"
 
 
+class ImageRejectedError(ValueError):
+    """Raised when an image fails the size, format or dimension checks."""
+
+
+def check_image_header(img: Image.Image, encoded_size: Optional[int] = None) -> None:
+    """
+    Check format, dimensions and size using only the parsed header
+    (nothing is decoded).
+
+    Args:
+        img: Opened PIL image
+        encoded_size: Size of the encoded image in bytes, if known
+
+    Raises:
+        ImageRejectedError: If the image is not acceptable
+    """
+    if encoded_size is not None and encoded_size > settings.max_image_size_bytes:
+        size_mb = encoded_size / (1024 * 1024)
+        raise ImageRejectedError(f"Image too large ({size_mb:.1f}MB). Max size: {settings.max_image_size_mb}MB")
+    if img.format not in SUPPORTED_FORMATS:
+        raise ImageRejectedError(f"Unsupported format: {img.format}. Supported: {', '.join(SUPPORTED_FORMATS)}")
+    width, height = img.size
+    if width < MIN_IMAGE_DIMENSION or height < MIN_IMAGE_DIMENSION:
+        raise ImageRejectedError(f"Image too small ({width}x{height})")
+    if Image.MAX_IMAGE_PIXELS and width * height > Image.MAX_IMAGE_PIXELS:
+        raise ImageRejectedError(f"Image has too many pixels ({width}x{height})")
+
+
+class StreamingImageValidator:
+    """
+    Validate an image while it is being downloaded.
+
+    Every chunk is checked against the size cap, so an oversized upload is
+    abandoned at the cap instead of being buffered whole. Chunks also go to
+    an incremental parser until the image header has arrived; format and
+    dimensions are then checked while the rest is still in flight. Pixels
+    are decoded later, in the vision pool, at the scale the model needs.
+    """
+
+    def __init__(self, max_bytes: int, declared_size: Optional[int] = None):
+        """
+        Initialize validator.
+
+        Args:
+            max_bytes: Size cap for the encoded image
+            declared_size: Content-Length announced by the server, if any
+
+        Raises:
+            ImageRejectedError: If the declared size is already over the cap
+        """
+        self.max_bytes = max_bytes
+        if declared_size is not None and declared_size > max_bytes:
+            raise ImageRejectedError(self._too_large(declared_size))
+
+        self._chunks: List[bytes] = []
+        self._parser: Optional[ImageFile.Parser] = ImageFile.Parser()
+        self.size = 0
+        self.format: Optional[str] = None
+        self.width: Optional[int] = None
+        self.height: Optional[int] = None
+
+    def _too_large(self, size: int) -> str:
+        """Error message for an image over the cap."""
+        return (
+            f"Image too large ({size / (1024 * 1024):.1f}MB). "
+            f"Max size: {self.max_bytes / (1024 * 1024):.0f}MB"
+        )
+
+    @property
+    def header_checked(self) -> bool:
+        """True once format and dimensions have been validated."""
+        return self.format is not None
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Add the next downloaded chunk.
+
+        Args:
+            chunk: Bytes as received
+
+        Raises:
+            ImageRejectedError: On exceeding the cap, or a bad header
+        """
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise ImageRejectedError(self._too_large(self.size))
+        self._chunks.append(chunk)
+
+        if self._parser is None:
+            return
+        try:
+            self._parser.feed(chunk)
+        except Image.DecompressionBombError as e:
+            raise ImageRejectedError(str(e))
+        if self._parser.image is not None:
+            self._check_header(self._parser.image)
+        elif self.size > MAX_HEADER_BYTES:
+            raise ImageRejectedError("Not a recognizable image")
+
+    def _check_header(self, img: Image.Image) -> None:
+        """Validate format and dimensions, then stop parsing."""
+        self._parser = None
+        check_image_header(img)
+        self.format = img.format
+        self.width, self.height = img.size
+
+    def finish(self) -> bytes:
+        """
+        Complete the download.
+
+        Returns:
+            The encoded image
+
+        Raises:
+            ImageRejectedError: If no valid image header was found
+        """
+        if not self.header_checked:
+            raise ImageRejectedError("Not a recognizable image")
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def exif_orientation(image: Image.Image) -> int:
+    """EXIF orientation tag (1 = upright, also when missing or invalid)."""
+    try:
+        orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+    except Exception:  # Corrupt EXIF must not fail the photo
+        return 1
+    return orientation if orientation in EXIF_TRANSPOSE else 1
+
+
+def load_image_for_model(image: Image.Image, short_side: int) -> Image.Image:
+    """
+    Decode an image directly at (about) the resolution a model needs,
+    turned upright according to its EXIF orientation.
+
+    JPEGs are decoded at reduced scale (1/2, 1/4 or 1/8 via DCT scaling),
+    other formats are shrunk by an integer factor with reduce(); only the
+    last, small step is a real resample. The full-resolution bitmap of a
+    12-megapixel photo is never materialized for JPEGs. Orientation is
+    applied to the small result, where a transpose is cheap.
+
+    Args:
+        image: Freshly opened PIL image (draft mode is applied to it)
+        short_side: Target length of the shorter side in pixels
+
+    Returns:
+        Upright RGB image whose shorter side is short_side
+    """
+    orientation = exif_orientation(image)
+    width, height = image.size
+    scale = short_side / min(width, height)
+    target = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    if scale < 1:
+        # Only ever picks a scale that keeps the image >= target
+        image.draft("RGB", (math.ceil(width * scale), math.ceil(height * scale)))
+    image = image.convert("RGB")
+
+    factor = min(image.size[0] // target[0], image.size[1] // target[1])
+    if factor >= 2:
+        image = image.reduce(factor)
+
+    if image.size != target:
+        image = image.resize(target, Image.Resampling.BILINEAR)
+    if orientation != 1:
+        image = image.transpose(EXIF_TRANSPOSE[orientation])
+    return image
+
+
+def prepare_image_for_model(
+    image: Image.Image,
+    short_side: Optional[int] = None,
+    encoded_size: Optional[int] = None
+) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+    """
+    Validate, orient, convert and downscale an image with a single decode.
+
+    Format, dimensions and size are checked from the header before any
+    pixel is decoded; the decode then runs once, at reduced scale
+    (load_image_for_model).
+
+    Args:
+        image: Freshly opened PIL image
+        short_side: Target length of the shorter side (None: checks and metadata only, no decode)
+        encoded_size: Size of the encoded image in bytes, if known
+
+    Returns:
+        Upright RGB uint8 array of shape (height, width, 3) (None without
+        short_side), and metadata: width and height as displayed (after
+        orientation), format and EXIF orientation
+
+    Raises:
+        ImageRejectedError: If the image fails the checks
+    """
+    check_image_header(image, encoded_size)
+    orientation = exif_orientation(image)
+    width, height = image.size
+    if orientation >= 5:  # 5-8 swap width and height
+        width, height = height, width
+    info = {"width": width, "height": height, "format": image.format, "orientation": orientation}
+
+    if short_side is None:
+        return None, info
+    return np.asarray(load_image_for_model(image, short_side)), info
+
+
 def resize_image(image_path: str, max_size: int = 1024) -> str:
     """
     Resize image if larger than max_size while maintaining aspect ratio.
@@ -89,8 +314,12 @@ def resize_image(image_path: str, max_size: int = 1024) -> str:
                 new_height = max_size
                 new_width = int((max_size / height) * width)
 
-            # Resize and save
-            resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # Decode at reduced scale (JPEG) and shrink by integer steps before
+            # the final LANCZOS pass, instead of resampling the full bitmap
+            img.draft("RGB", (new_width, new_height))
+            resized_img = img.resize(
+                (new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=2.0
+            )
             resized_path = image_path.replace(".jpg", "_resized.jpg").replace(".png", "_resized.png")
             resized_img.save(resized_path, quality=85, optimize=True)
 
@@ -102,6 +331,34 @@ def resize_image(image_path: str, max_size: int = 1024) -> str:
         return image_path
 
 
+def dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """
+    Difference hash of an image: similar pictures get hashes a few bits apart.
+    For JPEGs the image is decoded at reduced scale, so this is much cheaper
+    than a full decode. The image object is modified (draft mode) and should
+    not be reused for full-resolution work.
+
+    Args:
+        image: Freshly opened PIL image
+        hash_size: Hash is hash_size * hash_size bits
+
+    Returns:
+        Hash as an unsigned integer
+    """
+    width, height = hash_size + 1, hash_size
+    # Let the JPEG decoder skip most of the work (DCT scaling)
+    image.draft("L", (width * 8, height * 8))
+    small = image.convert("L").resize((width, height), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+
+    value = 0
+    for row in range(height):
+        offset = row * width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
 def encode_image_base64(image_path: str) -> str:
     """
     Encode image to base64 string for API transmission.
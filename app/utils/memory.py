@@ -0,0 +1,40 @@
+"""
+Process memory accounting (Linux /proc).
+"""
+import os
+from typing import Dict, Union
+
+
+def process_memory(pid: Union[int, str] = "self") -> Dict[str, float]:
+    """
+    Resident memory of a process, split into shared and unique pages.
+
+    USS (private pages) is what a process would free on exit; PSS charges
+    each shared page proportionally to the processes mapping it, so the PSS
+    of all workers adds up to their real combined footprint.
+
+    Args:
+        pid: Process ID (default: the current process)
+
+    Returns:
+        rss_mb, pss_mb, uss_mb and shared_mb, or an empty dict where
+        /proc/<pid>/smaps_rollup is not available
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return {}
+
+    private_kb = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {
+        "pid": os.getpid() if pid == "self" else int(pid),
+        "rss_mb": round(fields.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(fields.get("Pss", 0) / 1024, 1),
+        "uss_mb": round(private_kb / 1024, 1),
+        "shared_mb": round((fields.get("Rss", 0) - private_kb) / 1024, 1),
+    }
@@ -0,0 +1,177 @@
+"""
+Client-side rate limiting for quota-limited upstream APIs.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would have to wait longer than allowed for a token."""
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations.
+
+    Tokens refill continuously at rate_per_second up to capacity. A caller
+    that finds the bucket empty reserves the next token anyway (the balance
+    goes negative) and sleeps until it is due, so waiting callers are served
+    first-come first-served and the projected wait is simply the deficit
+    divided by the refill rate.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate_per_second: Token refill rate
+            capacity: Maximum tokens (burst size)
+            clock: Monotonic time source (injectable for tests)
+        """
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+        self.granted = 0
+        self.rejected = 0
+        self.waiting = 0
+        self.waited = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        """Add tokens earned since the last update (lock held)."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def projected_wait(self) -> float:
+        """Seconds a caller arriving now would wait for a token."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (1.0 - self._tokens) / self.rate_per_second)
+
+    def available(self) -> float:
+        """Tokens available right now (negative while callers are queued)."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve one token.
+
+        Args:
+            max_wait: Longest acceptable wait in seconds (None = no limit)
+
+        Returns:
+            Seconds to wait before using the token, or None if the wait
+            would exceed max_wait (nothing is reserved then)
+        """
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (1.0 - self._tokens) / self.rate_per_second)
+            if max_wait is not None and wait > max_wait:
+                self.rejected += 1
+                return None
+
+            self._tokens -= 1.0
+            self.granted += 1
+            if wait > 0:
+                self.waited += 1
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            return wait
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available without waiting."""
+        return self.reserve(max_wait=0.0) is not None
+
+    def try_take(self) -> bool:
+        """
+        Take a token if one is available right now, for optional work.
+
+        Unlike try_acquire, an empty bucket is not counted as rejected, so
+        skipped optional calls (hedges) do not show up as turned-away callers.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self.granted += 1
+            return True
+
+    def _cancel_reservation(self) -> None:
+        """Return a reserved token that will not be used."""
+        with self._lock:
+            self._tokens += 1.0
+            self.granted -= 1
+
+    async def acquire(self, max_wait: Optional[float] = None) -> None:
+        """
+        Wait for a token without blocking the event loop.
+
+        Args:
+            max_wait: Longest acceptable wait in seconds (None = no limit)
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            raise RateLimitExceeded(f"Rate limit wait exceeds {max_wait:.2f}s")
+        if wait <= 0:
+            return
+
+        self.waiting += 1
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._cancel_reservation()
+            raise
+        finally:
+            self.waiting -= 1
+
+    def acquire_blocking(self, max_wait: Optional[float] = None) -> None:
+        """
+        Wait for a token, blocking the calling thread.
+
+        Args:
+            max_wait: Longest acceptable wait in seconds (None = no limit)
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            raise RateLimitExceeded(f"Rate limit wait exceeds {max_wait:.2f}s")
+        if wait > 0:
+            time.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return remaining tokens and queueing counters."""
+        return {
+            "tokens_available": round(self.available(), 2),
+            "capacity": self.capacity,
+            "rate_per_hour": round(self.rate_per_second * 3600, 1),
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "waiting": self.waiting,
+            "waited": self.waited,
+            "avg_wait_ms": round(self.total_wait_seconds / self.waited * 1000, 1) if self.waited else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+        }
@@ -0,0 +1,65 @@
+"""
+Request coalescing for concurrent identical async calls.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one in-flight call per key; concurrent callers for the same
+    key await the same result (or exception) instead of repeating the work.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() for key, or join the call already in flight for key.
+
+        Args:
+            key: Identity of the call (e.g. normalized food name)
+            fn: Zero-argument coroutine function doing the real work
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            # Run as a task so one caller being cancelled does not cancel the others
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self.executions += 1
+        else:
+            self._waiters[key] += 1
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished call so the next caller starts a fresh one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Mark the exception retrieved; callers re-raise it themselves
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return execution and coalescing counters."""
+        return {
+            "in_flight": len(self._calls),
+            "waiting": sum(self._waiters.values()),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
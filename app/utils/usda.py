@@ -0,0 +1,44 @@
+"""
+Lean parsing of USDA FoodData Central API responses.
+"""
+import json
+import re
+from typing import Any, Dict, Optional
+
+_DECODER = json.JSONDecoder()
+_FOODS_ARRAY = re.compile(r'"foods"\s*:\s*\[\s*')
+
+
+def first_search_result(body: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Decode only the first element of "foods" in a /foods/search response.
+    The search criteria, paging fields, remaining results and aggregations
+    are skipped without being parsed.
+
+    Args:
+        body: Raw response body
+
+    Returns:
+        First food result, or None if there are no results
+    """
+    text = body.decode("utf-8")
+
+    for match in _FOODS_ARRAY.finditer(text):
+        # Skip an escaped occurrence inside a string (e.g. the echoed query)
+        if match.start() > 0 and text[match.start() - 1] == "\\":
+            continue
+        if text[match.end():match.end() + 1] == "]":
+            return None
+        try:
+            food, _ = _DECODER.raw_decode(text, match.end())
+        except json.JSONDecodeError:
+            break
+        if isinstance(food, dict):
+            return food
+        break
+
+    # Unexpected layout: fall back to a full parse
+    foods = json.loads(text).get("foods")
+    if isinstance(foods, list) and foods and isinstance(foods[0], dict):
+        return foods[0]
+    return None
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the offline FoodData Central engine: bulk import and lookup latency.
+
+Without arguments a synthetic SR Legacy-sized CSV dump is generated. Pass real
+download directories / JSON files to benchmark against the actual data:
+
+    python benchmarks/bench_fdc_import.py
+    python benchmarks/bench_fdc_import.py ~/Downloads/FoodData_Central_sr_legacy_food_csv_2018-04
+"""
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.nutrients import USDA_NUTRIENT_MAPPING
+from app.services.fdc_import import build_database
+from app.services.food_database import FoodDatabase
+
+WORDS = [
+    "rice", "brown", "white", "chicken", "breast", "grilled", "broccoli", "steamed",
+    "beef", "ground", "raw", "cooked", "boiled", "salmon", "atlantic", "apple", "banana",
+    "pasta", "whole", "wheat", "bread", "potato", "baked", "carrot", "cheese", "cheddar",
+    "milk", "egg", "yogurt", "plain", "pork", "loin", "spinach", "tomato", "lentils", "beans",
+]
+QUERIES = ["Brown Rice", "Grilled Chicken Breast", "Steamed Broccoli", "Baked Potato", "Plain Yogurt"]
+
+
+def write_synthetic_csv_dump(directory: Path, foods: int, nutrients_per_food: int) -> None:
+    """Write a CSV dump shaped like the FDC SR Legacy download."""
+    rng = random.Random(42)
+    directory.mkdir(parents=True)
+    mapped = [int(nutrient_id) for nutrient_id in USDA_NUTRIENT_MAPPING]
+    unmapped = list(range(1200, 1200 + max(0, nutrients_per_food - len(mapped))))
+
+    with open(directory / "food.csv", "w") as fp:
+        fp.write('"fdc_id","data_type","description","food_category_id","publication_date"\n')
+        for fdc_id in range(1, foods + 1):
+            description = ", ".join(rng.sample(WORDS, 4)).capitalize()
+            fp.write(f'"{fdc_id}","sr_legacy_food","{description}","1","2019-04-01"\n')
+
+    with open(directory / "food_nutrient.csv", "w") as fp:
+        fp.write('"id","fdc_id","nutrient_id","amount"\n')
+        row_id = 0
+        for fdc_id in range(1, foods + 1):
+            for nutrient_id in mapped + unmapped:
+                row_id += 1
+                fp.write(f'"{row_id}","{fdc_id}","{nutrient_id}","{rng.uniform(0, 100):.2f}"\n')
+
+
+def benchmark_lookups(db_path: str, rounds: int = 2000) -> None:
+    """Measure search latency (search + nutrient fetch) for typical labels."""
+    db = FoodDatabase(db_path)
+    db.search("warmup")
+
+    timings = []
+    for i in range(rounds):
+        query = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        db.search(query)
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    timings.sort()
+    print(f"Catalogue size:        {db.count_foods()} foods")
+    print(f"Lookup p50:            {statistics.median(timings):.0f} us")
+    print(f"Lookup p99:            {timings[int(len(timings) * 0.99)]:.0f} us")
+    db.close()
+
+
+def main():
+    """Main entry point."""
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = sys.argv[1:]
+        if not sources:
+            dump = Path(tmp) / "sr_legacy_csv"
+            print("Generating synthetic dump (8,000 foods x 100 nutrients)...")
+            write_synthetic_csv_dump(dump, foods=8000, nutrients_per_food=100)
+            sources = [str(dump)]
+
+        db_path = str(Path(tmp) / "fdc.db")
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        summary = build_database(db_path, sources)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        print(f"Imported:              {summary['foods']} foods, {summary['nutrient_rows']} nutrient rows")
+        print(f"Import time:           {summary['seconds']:.2f} s")
+        print(f"Peak RSS:              {rss_after / 1024:.1f} MB "
+              f"(+{(rss_after - rss_before) / 1024:.1f} MB during import)")
+        print(f"Database size:         {summary['size_bytes'] / (1024 * 1024):.1f} MB")
+        benchmark_lookups(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark fuzzy food-name matching: build time, memory and lookup latency.
+
+Without arguments a synthetic 12,000-entry catalogue is used. Pass a local
+FoodData Central database (see app.services.fdc_import) to use real data:
+
+    python benchmarks/bench_food_index.py
+    python benchmarks/bench_food_index.py data/fdc.db
+"""
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.food_index import FoodMatchIndex
+
+FOODS = [
+    "rice", "chicken", "broccoli", "beef", "salmon", "apple", "banana", "pasta", "bread",
+    "potato", "carrot", "cheese", "milk", "egg", "yogurt", "pork", "spinach", "tomato",
+    "lentils", "beans", "oats", "tuna", "turkey", "shrimp", "avocado", "quinoa", "lettuce",
+]
+QUALIFIERS = [
+    "brown", "white", "breast", "thigh", "ground", "whole", "wheat", "baked", "boiled",
+    "grilled", "steamed", "raw", "cooked", "fried", "roasted", "drained", "without salt",
+    "with skin", "lean", "long-grain", "canned", "frozen", "fresh", "dried", "plain",
+]
+LABELS = [
+    "Brown Rice", "Grilled Chicken Breast", "Steamed Broccoli", "Baked Potato",
+    "Plain Yogurt", "Roasted Turkey", "Fried Egg", "Whole Wheat Bread",
+]
+
+
+def synthetic_catalogue(size: int):
+    """Generate FDC-style descriptions ("Food, qualifier, qualifier, ...")."""
+    rng = random.Random(7)
+    return [
+        (fdc_id, ", ".join([rng.choice(FOODS).capitalize()] + rng.sample(QUALIFIERS, rng.randint(2, 5))))
+        for fdc_id in range(100000, 100000 + size)
+    ]
+
+
+def load_catalogue():
+    """Load the catalogue from a database path argument, or synthesize one."""
+    if len(sys.argv) > 1:
+        from app.services.food_database import FoodDatabase
+        return FoodDatabase(sys.argv[1]).list_foods()
+    return synthetic_catalogue(12000)
+
+
+def main():
+    """Main entry point."""
+    catalogue = load_catalogue()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = FoodMatchIndex(catalogue)
+    build_seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for i in range(3000):
+        label = LABELS[i % len(LABELS)]
+        start = time.perf_counter()
+        index.search(label, limit=5)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+
+    print(f"Catalogue size:        {len(index)} foods")
+    print(f"Build time:            {build_seconds * 1000:.0f} ms")
+    print(f"Index memory:          {current / (1024 * 1024):.1f} MB retained "
+          f"({index.memory_bytes() / (1024 * 1024):.1f} MB packed postings), "
+          f"{peak / (1024 * 1024):.1f} MB peak during build")
+    print(f"Lookup p50:            {statistics.median(timings):.0f} us")
+    print(f"Lookup p99:            {timings[int(len(timings) * 0.99)]:.0f} us")
+    for label in LABELS[:3]:
+        best = index.search(label, limit=1)[0]
+        print(f"  {label!r:26} -> {best.description!r} ({best.score:.2f})")
+
+
+if __name__ == "__main__":
+    main()
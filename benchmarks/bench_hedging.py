@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark hedged requests against a simulated USDA latency profile.
+
+Most searches answer in 20-40ms; a small share stall for 500ms (the tail that
+dominates p99). Reports latency percentiles and the extra upstream requests
+spent on hedges, with and without hedging.
+
+    python benchmarks/bench_hedging.py
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.hedging import HedgePolicy, hedged_call
+
+CALLS = 2000
+CONCURRENCY = 50
+STALL_PROBABILITY = 0.03
+STALL_SECONDS = 0.5
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, int(round(percent / 100.0 * len(ordered))) - 1)]
+
+
+async def run(policy, seed: int):
+    """Issue CALLS lookups, CONCURRENCY at a time; return (latencies, upstream requests)."""
+    rng = random.Random(seed)
+    upstream_requests = 0
+    latencies = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def upstream():
+        nonlocal upstream_requests
+        upstream_requests += 1
+        stalled = rng.random() < STALL_PROBABILITY
+        await asyncio.sleep(STALL_SECONDS if stalled else rng.uniform(0.02, 0.04))
+        return True
+
+    async def lookup():
+        async with semaphore:
+            started = time.perf_counter()
+            if policy is None:
+                await upstream()
+            else:
+                await hedged_call(upstream, policy)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(lookup() for _ in range(CALLS)))
+    return latencies, upstream_requests
+
+
+def report(name, latencies, upstream_requests):
+    print(
+        f"{name:<22} p50 {statistics.median(latencies) * 1000:6.1f}ms   "
+        f"p95 {percentile(latencies, 95) * 1000:6.1f}ms   "
+        f"p99 {percentile(latencies, 99) * 1000:6.1f}ms   "
+        f"max {max(latencies) * 1000:6.1f}ms   "
+        f"extra requests {(upstream_requests - CALLS) / CALLS:5.1%}"
+    )
+
+
+def main():
+    print(f"{CALLS} lookups, {CONCURRENCY} concurrent, {STALL_PROBABILITY:.0%} stall for "
+          f"{STALL_SECONDS * 1000:.0f}ms\n")
+
+    latencies, requests = asyncio.run(run(None, seed=1))
+    report("no hedging", latencies, requests)
+
+    for ratio in (0.02, 0.05, 0.10):
+        policy = HedgePolicy(percentile=95, max_hedge_ratio=ratio, min_samples=20)
+        latencies, requests = asyncio.run(run(policy, seed=1))
+        report(f"hedge p95, cap {ratio:.0%}", latencies, requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark decoding phone photos for the vision model: full decode vs
+reduced-scale decode (JPEG draft + reduce).
+
+Each mode runs in a fresh process and reports its peak RSS (VmHWM, Linux)
+next to the post-import high-water mark, so the difference is the decode:
+
+  full:          convert("RGB") at full resolution, then resize to the
+                 model's short side (the classifier's previous preprocessing)
+  draft:         load_image_for_model (what the pipeline does now)
+  resize, old:   resize_image's previous in-memory step (LANCZOS to 1024px
+                 from the full bitmap)
+  resize, new:   draft + reducing_gap, as resize_image does now
+
+    python benchmarks/bench_image_decode.py
+"""
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+ROOT = Path(__file__).parent.parent
+RUNS = 5
+SHORT_SIDE = 256  # 224px model input, resized to 256 then center-cropped
+
+WORKER = """
+import json, os, statistics, sys, time
+sys.path.insert(0, {root!r})
+for name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+             "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(name, "benchmark")
+from PIL import Image
+from app.utils.image import load_image_for_model
+
+def peak_rss_kb():
+    # VmHWM is reset on exec (ru_maxrss would include the parent's peak)
+    for line in open("/proc/self/status"):
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+
+def full(img):
+    img = img.convert("RGB")
+    w, h = img.size
+    scale = {short} / min(w, h)
+    return img.resize((round(w * scale), round(h * scale)), Image.Resampling.BILINEAR)
+
+def draft(img):
+    return load_image_for_model(img, {short})
+
+def resize_old(img):
+    w, h = img.size
+    return img.resize((1024, int(1024 / w * h)), Image.Resampling.LANCZOS)
+
+def resize_new(img):
+    w, h = img.size
+    img.draft("RGB", (1024, int(1024 / w * h)))
+    return img.resize((1024, int(1024 / w * h)), Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+mode = {{"full": full, "draft": draft, "resize, old": resize_old, "resize, new": resize_new}}[{mode!r}]
+baseline = peak_rss_kb()
+times = []
+for _ in range({runs}):
+    started = time.perf_counter()
+    with Image.open({path!r}) as img:
+        mode(img)
+    times.append(time.perf_counter() - started)
+peak = peak_rss_kb()
+print(json.dumps({{"ms": statistics.median(times) * 1000, "baseline_mb": baseline / 1024, "peak_mb": peak / 1024}}))
+"""
+
+
+def write_photo(directory: Path, width: int, height: int) -> Path:
+    """Photo-like JPEG (smooth noise, so it compresses like a real picture)."""
+    rng = np.random.default_rng(0)
+    small = Image.fromarray(rng.integers(0, 255, (height // 4, width // 4, 3), dtype=np.uint8))
+    photo = small.resize((width, height), Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+    path = directory / f"photo_{width}x{height}.jpg"
+    photo.save(path, "JPEG", quality=90)
+    return path
+
+
+def measure(path: Path, mode: str) -> dict:
+    """Run one mode on one photo in a fresh interpreter."""
+    script = WORKER.format(root=str(ROOT), short=SHORT_SIDE, mode=mode, runs=RUNS, path=str(path))
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = [write_photo(Path(tmp), 4032, 3024), write_photo(Path(tmp), 1600, 1200)]
+        print(f"{'photo':<22}{'mode':<14}{'decode':>10}{'peak RSS':>12}{'after import':>14}")
+        for photo in photos:
+            size_kb = photo.stat().st_size / 1024
+            label = f"{photo.stem[6:]} ({size_kb:.0f}KB)"
+            for mode in ("full", "draft", "resize, old", "resize, new"):
+                result = measure(photo, mode)
+                print(f"{label:<22}{mode:<14}{result['ms']:>8.1f}ms{result['peak_mb']:>10.1f}MB"
+                      f"{result['baseline_mb']:>12.1f}MB")
+                label = ""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark preparing a photo for the model: three separate opens vs one pass.
+
+  three opens:  validate_image (header), resize_image (decode, LANCZOS to
+                1024px, re-encode to disk), then the vision pool's own open
+                and reduced-scale decode for the model
+  one pass:     prepare_image_for_model (header checks, one reduced-scale
+                decode, EXIF orientation), as the vision pool does now
+
+The 4032x3024 photo carries EXIF orientation 6 (phone held upright); only
+the one-pass result is upright.
+
+    python benchmarks/bench_image_prepare.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+for _name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+              "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+
+from app.services.food_classifier import FoodClassifier
+from app.utils.image import load_image_for_model, prepare_image_for_model, resize_image, validate_image
+
+RUNS = 7
+classifier = FoodClassifier("unused.onnx")  # 224px input; preprocessing only
+
+
+def write_photo(directory: Path, width: int, height: int, image_format: str, orientation: int = 1) -> Path:
+    """Photo-like image (smooth noise, so it compresses like a real picture)."""
+    rng = np.random.default_rng(0)
+    small = Image.fromarray(rng.integers(0, 255, (height // 4, width // 4, 3), dtype=np.uint8))
+    photo = small.resize((width, height), Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+    exif = Image.Exif()
+    if orientation != 1:
+        exif[0x0112] = orientation
+    path = directory / f"photo_{width}x{height}.{'jpg' if image_format == 'JPEG' else 'png'}"
+    photo.save(path, image_format, exif=exif, **({"quality": 90} if image_format == "JPEG" else {}))
+    return path
+
+
+def three_opens(path: str) -> np.ndarray:
+    """The previous pipeline (first open: validate; second: resize; third: vision)."""
+    valid, error = validate_image(path)
+    if not valid:
+        raise ValueError(error)
+    resized = resize_image(path)
+    if resized != path:
+        os.remove(resized)
+    with Image.open(path) as img:
+        img.size, img.format
+        img.getexif = Image.Exif  # Previous preprocessing ignored EXIF orientation
+        return classifier.to_model_input(np.asarray(load_image_for_model(img, classifier.resize_side)))
+
+
+def one_pass(path: str) -> np.ndarray:
+    """prepare_image_for_model, as in vision_worker.prepare_image."""
+    with Image.open(path) as img:
+        pixels, info = prepare_image_for_model(img, classifier.resize_side, os.path.getsize(path))
+    return classifier.to_model_input(pixels)
+
+
+def upright(model_input: np.ndarray, photo: Path) -> bool:
+    """Whether the model input is closer to the photo as displayed than as stored."""
+    with Image.open(photo) as img:
+        stored = img.convert("RGB")
+    displayed = ImageOps.exif_transpose(stored)
+    stored.getexif = Image.Exif
+
+    def difference(reference: Image.Image) -> float:
+        expected = classifier.to_model_input(np.asarray(load_image_for_model(reference, classifier.resize_side)))
+        if expected.shape != model_input.shape:
+            return float("inf")
+        return float(np.abs(expected - model_input).mean())
+
+    return difference(displayed) <= difference(stored)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = [
+            write_photo(Path(tmp), 4032, 3024, "JPEG", orientation=6),
+            write_photo(Path(tmp), 1600, 1200, "JPEG"),
+            write_photo(Path(tmp), 2000, 1500, "PNG"),
+        ]
+        print(f"{'photo':<26}{'mode':<14}{'median':>10}{'opens':>7}  upright")
+        for photo in photos:
+            label = f"{photo.name[6:]} ({photo.stat().st_size / 1024:.0f}KB)"
+            for mode, prepare, opens in (("three opens", three_opens, 3), ("one pass", one_pass, 1)):
+                times = []
+                for _ in range(RUNS):
+                    started = time.perf_counter()
+                    model_input = prepare(str(photo))
+                    times.append(time.perf_counter() - started)
+                print(f"{label:<26}{mode:<14}{statistics.median(times) * 1000:>8.1f}ms{opens:>7}  "
+                      f"{'yes' if upright(model_input, photo) else 'no'}")
+                label = ""
+
+
+if __name__ == "__main__":
+    main()
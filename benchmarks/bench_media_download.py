@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark WhatsApp media downloads: buffered (response.content, then
+checks) vs streamed with StreamingImageValidator (what download_image does
+now), over a simulated 20 Mbit/s link (httpx MockTransport, 64KB chunks).
+
+  header:       format and dimensions known (validation can fail here)
+  first pixel:  download done + reduced-scale decode for the model
+  peak:         Python heap high-water mark during the download (tracemalloc)
+
+The "oversized" case is a 4032x3024 PNG sent without Content-Length
+against the 10MB cap: buffered reads it all before the size check,
+streamed stops at the cap.
+
+    python benchmarks/bench_media_download.py
+"""
+import asyncio
+import io
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+import numpy as np
+from PIL import Image, ImageFilter
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+for _name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+              "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.config import settings
+from app.services import whatsapp
+from app.utils.image import StreamingImageValidator, load_image_for_model
+
+BANDWIDTH_BYTES_PER_SECOND = 20_000_000 / 8
+CHUNK = 64 * 1024
+SHORT_SIDE = 256
+HTTPX_CLIENT = httpx.AsyncClient
+
+
+def photo(width: int, height: int) -> Image.Image:
+    """Photo-like picture (smooth noise, so it compresses like a real one)."""
+    rng = np.random.default_rng(0)
+    small = Image.fromarray(rng.integers(0, 255, (height // 4, width // 4, 3), dtype=np.uint8))
+    return small.resize((width, height), Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+
+
+def encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **({"quality": 90} if image_format == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+class Link:
+    """Mock Graph API + CDN serving one media body at the simulated bandwidth."""
+
+    def __init__(self, media: bytes, content_length: bool):
+        self.media = media
+        self.content_length = content_length
+        self.bytes_sent = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host != "media.example":
+            return httpx.Response(200, json={"url": "https://media.example/photo"})
+
+        async def body():
+            for i in range(0, len(self.media), CHUNK):
+                chunk = self.media[i:i + CHUNK]
+                await asyncio.sleep(len(chunk) / BANDWIDTH_BYTES_PER_SECOND)
+                self.bytes_sent += len(chunk)
+                yield chunk
+
+        headers = {"Content-Length": str(len(self.media))} if self.content_length else {}
+        return httpx.Response(200, headers=headers, content=body())
+
+    def client(self, **kwargs) -> httpx.AsyncClient:
+        return HTTPX_CLIENT(transport=httpx.MockTransport(self.handle), **kwargs)
+
+
+async def buffered(link: Link, marks: dict):
+    """The previous download_image: read the whole body, then check it."""
+    async with link.client() as client:
+        response = await client.get("https://media.example/photo")
+        data = response.content
+    if len(data) > settings.max_image_size_bytes:
+        return None
+    with Image.open(io.BytesIO(data)) as img:
+        img.size
+    marks["header"] = time.perf_counter()
+    return data
+
+
+async def streamed(link: Link, marks: dict):
+    """download_image as it is now (header time recorded by the validator)."""
+
+    class TimedValidator(StreamingImageValidator):
+        def _check_header(self, img):
+            marks["header"] = time.perf_counter()
+            super()._check_header(img)
+
+    whatsapp.StreamingImageValidator = TimedValidator
+    whatsapp.httpx.AsyncClient = link.client
+    return await whatsapp.whatsapp_service.download_image("photo")
+
+
+async def measure(download, media: bytes, content_length: bool) -> dict:
+    link = Link(media, content_length)
+    marks = {}
+    tracemalloc.start()
+    started = time.perf_counter()
+    data = await download(link, marks)
+    finished = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    first_pixel = None
+    if data is not None:
+        with Image.open(io.BytesIO(data)) as img:
+            load_image_for_model(img, SHORT_SIDE)
+        first_pixel = time.perf_counter() - started
+    return {
+        "header_ms": (marks["header"] - started) * 1000 if "header" in marks else None,
+        "done_ms": (finished - started) * 1000,
+        "first_pixel_ms": first_pixel * 1000 if first_pixel is not None else None,
+        "read_mb": link.bytes_sent / 2**20,
+        "peak_mb": peak / 2**20,
+        "accepted": data is not None,
+    }
+
+
+def cell(value, unit="ms"):
+    return f"{value:>9.0f}{unit}" if value is not None else f"{'-':>11}"
+
+
+async def main():
+    logging.getLogger("app.services.whatsapp").setLevel(logging.CRITICAL)  # Expected rejections
+    picture = photo(4032, 3024)
+    cases = [
+        ("phone JPEG", encode(picture, "JPEG"), True),
+        ("phone JPEG, chunked", encode(picture, "JPEG"), False),
+        ("oversized PNG, chunked", encode(picture, "PNG"), False),
+    ]
+    print(f"Link: {BANDWIDTH_BYTES_PER_SECOND * 8 / 1e6:.0f} Mbit/s, cap {settings.max_image_size_mb}MB\n")
+    print(f"{'case':<32}{'mode':<10}{'header':>11}{'done':>11}{'1st pixel':>11}"
+          f"{'read':>10}{'peak':>10}  result")
+    for name, media, content_length in cases:
+        label = f"{name} ({len(media) / 2**20:.1f}MB)"
+        for mode, download in (("buffered", buffered), ("streamed", streamed)):
+            result = await measure(download, media, content_length)
+            httpx.AsyncClient = HTTPX_CLIENT
+            print(f"{label:<32}{mode:<10}{cell(result['header_ms'])}{cell(result['done_ms'])}"
+                  f"{cell(result['first_pixel_ms'])}{result['read_mb']:>8.1f}MB{result['peak_mb']:>8.1f}MB"
+                  f"  {'ok' if result['accepted'] else 'rejected'}")
+            label = ""
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
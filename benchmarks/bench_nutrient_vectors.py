@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark fixed-layout nutrient vectors against the previous per-call dicts.
+
+Measures per-meal CPU time (extract -> scale -> sum -> %DV for a three-item
+plate) and the memory needed to hold cached per-100g profiles.
+
+    python benchmarks/bench_nutrient_vectors.py
+"""
+import logging
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Settings are required at import time; benchmarks never touch the network
+for _var in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+             "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_var, "benchmark")
+
+from app.models.nutrients import USDA_NUTRIENT_MAPPING
+from app.models.nutrition import MicroNutrients
+from app.services.calculator import NutritionCalculator
+from app.services.nutrition import NutritionService
+
+PROFILES = 10000
+
+# Same logger the service uses, so both paths pay for the same log formatting
+logger = logging.getLogger("app.services.nutrition")
+
+
+def usda_food(rng: random.Random) -> dict:
+    """USDA search result with ~60 nutrients, 11 of which we map."""
+    nutrient_ids = [int(nutrient_id) for nutrient_id in USDA_NUTRIENT_MAPPING] + list(range(1200, 1250))
+    return {
+        "description": "Synthetic food",
+        "foodNutrients": [
+            {"nutrientId": nutrient_id, "nutrientName": "x", "unitName": "G", "value": rng.uniform(0, 2)}
+            for nutrient_id in nutrient_ids
+        ],
+    }
+
+
+# --- Previous implementation (dict per call), kept here for comparison -----
+
+LEGACY_KEYS = ['protein', 'carbs', 'fat', 'fiber', 'calories', 'vitamin_a', 'vitamin_c',
+               'vitamin_b12', 'iron', 'magnesium', 'potassium']
+LEGACY_DV = {'vitamin_a': 900, 'vitamin_c': 90, 'vitamin_b12': 2.4, 'iron': 18,
+             'magnesium': 420, 'potassium': 4700}
+
+
+def legacy_extract(food_data):
+    nutrients = {key: 0.0 for key in LEGACY_KEYS}
+    for nutrient in food_data['foodNutrients']:
+        nutrient_id = str(nutrient.get('nutrientId', ''))
+        if nutrient_id in USDA_NUTRIENT_MAPPING:
+            nutrients[USDA_NUTRIENT_MAPPING[nutrient_id]] = float(nutrient.get('value', 0.0))
+    logger.debug(f"Extracted nutrients: {nutrients}")
+    return nutrients
+
+
+def legacy_total(total):
+    logger.info(f"Total meal nutrition: {total}")
+    return MicroNutrients(**{
+        f"{key}_dv": round(total.get(key, 0.0) / dv * 100.0, 0) for key, dv in LEGACY_DV.items()
+    })
+
+
+def legacy_meal(foods, grams):
+    total = {key: 0.0 for key in LEGACY_KEYS}
+    for food_data, portion in zip(foods, grams):
+        scale = portion / 100.0
+        scaled = {key: value * scale for key, value in legacy_extract(food_data).items()}
+        for key in total:
+            total[key] += scaled.get(key, 0.0)
+    return legacy_total(total)
+
+
+# --- Current implementation -------------------------------------------------
+
+SERVICE = NutritionService()
+SERVICE._store = None
+CALCULATOR = NutritionCalculator()
+
+
+def vector_meal(foods, grams):
+    scaled = [
+        SERVICE._scale_to_portion(SERVICE._extract_nutrients(food_data), portion)
+        for food_data, portion in zip(foods, grams)
+    ]
+    return CALCULATOR.calculate_micronutrients(SERVICE._sum_nutrition(scaled))
+
+
+def vector_meal_cached(profiles, grams):
+    """Per-meal work once profiles come from the cache (no extraction)."""
+    total = SERVICE._sum_nutrition([profile.scaled(portion / 100.0) for profile, portion in zip(profiles, grams)])
+    return CALCULATOR.calculate_micronutrients(total)
+
+
+def legacy_meal_cached(profiles, grams):
+    total = {key: 0.0 for key in LEGACY_KEYS}
+    for profile, portion in zip(profiles, grams):
+        scale = portion / 100.0
+        scaled = {key: value * scale for key, value in profile.items()}
+        for key in total:
+            total[key] += scaled.get(key, 0.0)
+    return legacy_total(total)
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    profiles = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del profiles
+    return current / PROFILES
+
+
+def main():
+    """Main entry point."""
+    rng = random.Random(1)
+    foods = [usda_food(rng) for _ in range(3)]
+    grams = [150.0, 100.0, 120.0]
+    legacy_profiles = [legacy_extract(food) for food in foods]
+    vector_profiles = [SERVICE._extract_nutrients(food) for food in foods]
+    rounds = 20000
+
+    def per_call_us(fn, *args):
+        return min(timeit.repeat(lambda: fn(*args), number=rounds, repeat=3)) / rounds * 1e6
+
+    print(f"{'':34}{'dicts (before)':>16}{'vectors (after)':>18}")
+    print(f"{'Per meal, incl. USDA extraction':34}"
+          f"{per_call_us(legacy_meal, foods, grams):>13.1f} us"
+          f"{per_call_us(vector_meal, foods, grams):>15.1f} us")
+    print(f"{'Per meal, profiles from cache':34}"
+          f"{per_call_us(legacy_meal_cached, legacy_profiles, grams):>13.1f} us"
+          f"{per_call_us(vector_meal_cached, vector_profiles, grams):>15.1f} us")
+
+    legacy_bytes = measure_memory(lambda: [legacy_extract(usda_food(rng)) for _ in range(PROFILES)])
+    vector_bytes = measure_memory(lambda: [SERVICE._extract_nutrients(usda_food(rng)) for _ in range(PROFILES)])
+    print(f"{'Memory per cached profile':34}{legacy_bytes:>14.0f} B{vector_bytes:>16.0f} B")
+
+
+if __name__ == "__main__":
+    main()
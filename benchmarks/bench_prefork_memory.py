@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-worker memory: `uvicorn --workers N` vs `python -m app.prefork`.
+
+Both servers run the ONNX vision backend with a stand-in model that has
+~70MB of weights, and a local FoodData Central database of FOODS synthetic
+foods (for the food match index). Once every worker has finished startup
+(model loaded and warmed up, index built), the script reads
+/proc/<pid>/smaps_rollup for each worker:
+
+  USS  pages only this worker uses (freed if it exits)
+  PSS  shared pages split between the processes that map them; the sum
+       over master + workers is the real combined footprint
+
+    python benchmarks/bench_prefork_memory.py
+    python benchmarks/bench_prefork_memory.py --workers 4
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+
+# Add app to path
+sys.path.insert(0, str(ROOT))
+
+for _name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+              "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+
+from bench_fdc_import import write_synthetic_csv_dump
+from app.services.fdc_import import build_database
+from app.utils.memory import process_memory
+
+FOODS = 50000
+HIDDEN_UNITS = 50000  # 256 -> 50000 -> 101 head: ~70MB of float32 weights
+
+
+def build_heavy_model(directory: Path) -> Path:
+    """Stand-in CNN with a wide classifier head (~70MB of weights)."""
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(0)
+    nodes, initializers = [], []
+    previous, in_channels = "pixel_values", 3
+    for stage, out_channels in enumerate([32, 64, 128, 256]):
+        initializers.append(numpy_helper.from_array(
+            (rng.standard_normal((out_channels, in_channels, 3, 3)) * 0.1).astype(np.float32), f"conv{stage}_w"
+        ))
+        nodes += [
+            helper.make_node("Conv", [previous, f"conv{stage}_w"], [f"conv{stage}"],
+                             strides=[2, 2], pads=[1, 1, 1, 1]),
+            helper.make_node("Relu", [f"conv{stage}"], [f"relu{stage}"]),
+        ]
+        previous, in_channels = f"relu{stage}", out_channels
+
+    for name, shape in (("hidden_w", (HIDDEN_UNITS, in_channels)), ("fc_w", (101, HIDDEN_UNITS))):
+        initializers.append(numpy_helper.from_array(
+            (rng.standard_normal(shape) * 0.01).astype(np.float32), name
+        ))
+    nodes += [
+        helper.make_node("GlobalAveragePool", [previous], ["pooled"]),
+        helper.make_node("Flatten", ["pooled"], ["features"]),
+        helper.make_node("Gemm", ["features", "hidden_w"], ["hidden"], transB=1),
+        helper.make_node("Relu", ["hidden"], ["hidden_relu"]),
+        helper.make_node("Gemm", ["hidden_relu", "fc_w"], ["logits"], transB=1),
+    ]
+    graph = helper.make_graph(
+        nodes, "food101_heavy_stand_in",
+        [helper.make_tensor_value_info("pixel_values", TensorProto.FLOAT, ["batch", 3, 224, 224])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", 101])],
+        initializer=initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+
+    path = directory / "food101_heavy.onnx"
+    onnx.save(model, str(path))
+    path.with_suffix(".labels.txt").write_text("\n".join(f"food_{i}" for i in range(101)) + "\n")
+    return path
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def children_of(pid: int):
+    """Direct child PIDs (excluding multiprocessing helpers)."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids = [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+    workers = []
+    for child in pids:
+        with open(f"/proc/{child}/cmdline", "rb") as f:
+            if b"resource_tracker" not in f.read():
+                workers.append(child)
+    return workers
+
+
+def measure(command, env, workers: int, port: int):
+    """Start a server, wait until all workers are up, return (master, [workers]) memory."""
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        deadline = time.monotonic() + 180
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(server.stderr.read().decode()[-2000:])
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+                if len(children_of(server.pid)) == workers:
+                    break
+            except OSError:
+                pass
+            time.sleep(0.5)
+        time.sleep(5)  # Let every worker finish its lifespan startup (model warmup)
+        return process_memory(server.pid), [process_memory(pid) for pid in children_of(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes (default: 2)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        model = build_heavy_model(tmp)
+        write_synthetic_csv_dump(tmp / "fdc_csv", FOODS, 12)
+        build_database(str(tmp / "fdc.db"), [str(tmp / "fdc_csv")])
+
+        env = dict(
+            os.environ,
+            VISION_BACKEND="onnx",
+            VISION_MODEL_PATH=str(model),
+            NUTRITION_SOURCE="local",
+            FDC_DATABASE_PATH=str(tmp / "fdc.db"),
+            NUTRITION_STORE_PATH=str(tmp / "store.db"),
+            LOG_LEVEL="WARNING",
+        )
+        print(f"Model: {model.stat().st_size / 2**20:.0f}MB   catalogue: {FOODS} foods   "
+              f"workers: {args.workers}")
+        print(f"\n{'server':<24}{'process':<10}{'RSS':>9}{'PSS':>9}{'USS':>9}")
+
+        modes = [
+            ("uvicorn --workers", [sys.executable, "-m", "uvicorn", "app.main:app",
+                                   "--workers", str(args.workers)]),
+            ("app.prefork", [sys.executable, "-m", "app.prefork", "--workers", str(args.workers)]),
+        ]
+        for label, command in modes:
+            port = free_port()
+            command = command + ["--host", "127.0.0.1", "--port", str(port)]
+            master, workers = measure(command, env, args.workers, port)
+            rows = [("master", master)] + [(f"worker {i + 1}", worker) for i, worker in enumerate(workers)]
+            for name, memory in rows:
+                print(f"{label:<24}{name:<10}{memory['rss_mb']:>7.1f}MB{memory['pss_mb']:>7.1f}MB"
+                      f"{memory['uss_mb']:>7.1f}MB")
+                label = ""
+            total_pss = sum(memory["pss_mb"] for _, memory in rows)
+            print(f"{'':<24}{'total PSS':<10}{'':>9}{total_pss:>7.1f}MB\n")
+
+
+if __name__ == "__main__":
+    main()
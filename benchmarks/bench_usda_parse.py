@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark USDA search payload size and parse time: full fetch vs trimmed fetch.
+
+  full:    pageSize=5, json.loads of the whole body, keep foods[0]
+  trimmed: pageSize=1, decode only foods[0] (USDA_TRIMMED_FETCH=true)
+
+Both then run the same nutrient extraction. By default the payloads are
+synthetic but shaped like real SR Legacy search results (~100 nutrients per
+food with all their metadata). With --live the real API is queried instead
+(needs USDA_API_KEY and network access):
+
+    python benchmarks/bench_usda_parse.py
+    python benchmarks/bench_usda_parse.py --live "Brown Rice" "Grilled Chicken Breast"
+"""
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+for _name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+              "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+
+from app.models.nutrients import USDA_NUTRIENT_SLOTS
+from app.services.nutrition import NutritionService
+from app.utils.usda import first_search_result
+
+ITERATIONS = 2000
+NUTRIENTS_PER_FOOD = 100
+
+
+def synthetic_food(rng: random.Random, fdc_id: int) -> dict:
+    """One search result in the shape USDA returns for SR Legacy foods."""
+    nutrient_ids = [nid for nid in USDA_NUTRIENT_SLOTS if isinstance(nid, int)]
+    nutrient_ids += list(range(1200, 1200 + NUTRIENTS_PER_FOOD - len(nutrient_ids)))
+    return {
+        "fdcId": fdc_id,
+        "description": "Rice, brown, long-grain, cooked",
+        "commonNames": "",
+        "additionalDescriptions": "",
+        "dataType": "SR Legacy",
+        "ndbNumber": 20037,
+        "publishedDate": "2019-04-01",
+        "foodCategory": "Cereal Grains and Pasta",
+        "allHighlightFields": "",
+        "score": rng.uniform(200, 900),
+        "microbes": [],
+        "foodNutrients": [
+            {
+                "nutrientId": nid,
+                "nutrientName": f"Nutrient {nid}, total",
+                "nutrientNumber": str(nid - 700),
+                "unitName": "MG",
+                "derivationCode": "A",
+                "derivationDescription": "Analytical",
+                "derivationId": 1,
+                "value": round(rng.uniform(0, 100), 3),
+                "foodNutrientSourceId": 1,
+                "foodNutrientSourceCode": "1",
+                "foodNutrientSourceDescription": "Analytical or derived from analytical",
+                "rank": rng.randint(100, 9000),
+                "indentLevel": 1,
+                "foodNutrientId": rng.randint(1_000_000, 9_000_000),
+                "dataPoints": rng.randint(1, 20),
+            }
+            for nid in nutrient_ids
+        ],
+        "finalFoodInputFoods": [],
+        "foodMeasures": [],
+        "foodAttributes": [],
+        "foodAttributeTypes": [],
+        "foodVersionIds": [],
+    }
+
+
+def synthetic_body(page_size: int) -> bytes:
+    """A /foods/search response body with page_size results."""
+    rng = random.Random(0)
+    return json.dumps({
+        "totalHits": 87,
+        "currentPage": 1,
+        "totalPages": 87 // page_size + 1,
+        "pageList": list(range(1, 11)),
+        "foodSearchCriteria": {
+            "dataType": ["Foundation", "SR Legacy"],
+            "query": "Brown Rice",
+            "generalSearchInput": "Brown Rice",
+            "pageNumber": 1,
+            "numberOfResultsPerPage": 50,
+            "pageSize": page_size,
+            "requireAllWords": False,
+            "foodTypes": ["Foundation", "SR Legacy"],
+        },
+        "foods": [synthetic_food(rng, 168000 + i) for i in range(page_size)],
+        "aggregations": {"dataType": {"SR Legacy": 80, "Foundation": 7}, "nutrients": {}},
+    }).encode("utf-8")
+
+
+def live_body(service: NutritionService, label: str, page_size: int) -> bytes:
+    """Fetch a real search response body."""
+    import requests
+
+    params = service._search_params(label)
+    params["pageSize"] = page_size
+    response = requests.get(f"{service.base_url}/foods/search", params=params, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def time_us(fn, iterations: int = ITERATIONS) -> float:
+    """Mean microseconds per call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def compare(service: NutritionService, label: str, full_body: bytes, trimmed_body: bytes) -> None:
+    def full():
+        foods = json.loads(full_body)["foods"]
+        return service._extract_nutrients(foods[0])
+
+    def trimmed():
+        return service._extract_nutrients(first_search_result(trimmed_body))
+
+    def page_size_only():
+        return service._extract_nutrients(json.loads(trimmed_body)["foods"][0])
+
+    assert full() == trimmed(), "trimmed fetch must yield the same nutrients"
+    full_us, trimmed_us = time_us(full), time_us(trimmed)
+    page_size_only_us = time_us(page_size_only)
+
+    print(f"\n{label}")
+    print(f"{'':<26}{'full (before)':>16}{'trimmed (after)':>18}")
+    print(f"{'Payload bytes':<26}{len(full_body):>16,}{len(trimmed_body):>18,}")
+    print(f"{'Parse + extract per lookup':<26}{full_us:>14.0f}us{trimmed_us:>16.0f}us")
+    print(f"(pageSize=1 with a full json.loads: {page_size_only_us:.0f}us)")
+
+
+def main():
+    import logging
+    logging.disable(logging.CRITICAL)
+    service = NutritionService()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--live":
+        for label in sys.argv[2:] or ["Brown Rice"]:
+            compare(service, label, live_body(service, label, 5), live_body(service, label, 1))
+    else:
+        compare(service, f"Synthetic SR Legacy result ({NUTRIENTS_PER_FOOD} nutrients per food)",
+                synthetic_body(5), synthetic_body(1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local ONNX food classifier: cold start and per-image latency.
+
+  cold start:  fresh process -> import, load session, (warmup), first image
+  per image:   decode + preprocess + inference with the session loaded once,
+               for several intra-op thread counts
+  per request: the anti-pattern this backend avoids (new session per image)
+
+Pass a real model (labels in <model>.labels.txt or --labels), or let the
+script build a stand-in: a 4-stage strided CNN over 224x224 input with 101
+outputs (~185M MACs, in the range of MobileNet-class food-101 models). The
+stand-in needs the `onnx` package; timings of a real model will differ.
+
+    python benchmarks/bench_vision_backend.py
+    python benchmarks/bench_vision_backend.py --model models/food101.onnx
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+
+# Add app to path
+sys.path.insert(0, str(ROOT))
+
+for _name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+              "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+
+from app.services.food_classifier import FoodClassifier
+
+IMAGES = 50
+COLD_STARTS = 3
+PER_REQUEST_LOADS = 10
+
+COLD_START_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from PIL import Image
+from app.services.food_classifier import FoodClassifier
+imported = time.perf_counter()
+classifier = FoodClassifier({model!r}, {labels!r}, intra_op_threads={threads})
+classifier.load()
+loaded = time.perf_counter()
+if {warmup}:
+    classifier.warmup()
+warmed = time.perf_counter()
+with Image.open({image!r}) as img:
+    classifier.predict(img)
+done = time.perf_counter()
+print(imported - started, loaded - imported, warmed - loaded, done - warmed)
+"""
+
+
+def build_stand_in_model(directory: Path) -> Path:
+    """Write a MobileNet-sized random-weight CNN with 101 outputs."""
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(0)
+    nodes, initializers = [], []
+    channels, previous = [32, 64, 128, 256], "pixel_values"
+    in_channels = 3
+    for stage, out_channels in enumerate(channels):
+        weight = f"conv{stage}_w"
+        initializers.append(numpy_helper.from_array(
+            (rng.standard_normal((out_channels, in_channels, 3, 3)) * 0.1).astype(np.float32), weight
+        ))
+        nodes.append(helper.make_node(
+            "Conv", [previous, weight], [f"conv{stage}"], strides=[2, 2], pads=[1, 1, 1, 1]
+        ))
+        nodes.append(helper.make_node("Relu", [f"conv{stage}"], [f"relu{stage}"]))
+        previous, in_channels = f"relu{stage}", out_channels
+
+    initializers.append(numpy_helper.from_array(
+        (rng.standard_normal((101, in_channels)) * 0.1).astype(np.float32), "fc_w"
+    ))
+    initializers.append(numpy_helper.from_array(np.zeros(101, dtype=np.float32), "fc_b"))
+    nodes += [
+        helper.make_node("GlobalAveragePool", [previous], ["pooled"]),
+        helper.make_node("Flatten", ["pooled"], ["features"]),
+        helper.make_node("Gemm", ["features", "fc_w", "fc_b"], ["logits"], transB=1),
+    ]
+    graph = helper.make_graph(
+        nodes, "food101_stand_in",
+        [helper.make_tensor_value_info("pixel_values", TensorProto.FLOAT, ["batch", 3, 224, 224])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", 101])],
+        initializer=initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+
+    path = directory / "food101_stand_in.onnx"
+    onnx.save(model, str(path))
+    path.with_suffix(".labels.txt").write_text("\n".join(f"food_{i}" for i in range(101)) + "\n")
+    return path
+
+
+def write_photo(directory: Path) -> Path:
+    """A 1600x1200 JPEG, roughly what WhatsApp delivers."""
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, 255, (1200, 1600, 3), dtype=np.uint8)
+    path = directory / "meal.jpg"
+    Image.fromarray(pixels).save(path, "JPEG", quality=85)
+    return path
+
+
+def cold_start(model, labels, image, threads, warmup):
+    """Median (import, load, warmup, first image) seconds over fresh processes."""
+    script = COLD_START_SCRIPT.format(
+        root=str(ROOT), model=str(model), labels=labels, image=str(image), threads=threads, warmup=warmup
+    )
+    runs = []
+    for _ in range(COLD_STARTS):
+        output = subprocess.run(
+            [sys.executable, "-c", script], check=True, capture_output=True, text=True
+        ).stdout
+        runs.append([float(value) for value in output.split()])
+    return [statistics.median(column) for column in zip(*runs)]
+
+
+def per_image(classifier, image, count):
+    """Latencies of decode + preprocess + inference with a loaded session."""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        with Image.open(image) as img:
+            classifier.predict(img)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, int(round(percent / 100.0 * len(ordered))) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", help="ONNX model (default: build a stand-in)")
+    parser.add_argument("--labels", help="Labels file (default: <model>.labels.txt)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        model = Path(args.model) if args.model else build_stand_in_model(tmp)
+        image = write_photo(tmp)
+        cpus = os.cpu_count() or 1
+        print(f"Model: {model.name}   CPUs: {cpus}   image: 1600x1200 JPEG")
+
+        print("\nCold start (fresh process, median of 3)")
+        print(f"{'':<18}{'import':>9}{'load':>9}{'warmup':>9}{'1st image':>11}{'total':>9}")
+        for warmup in (False, True):
+            timings = cold_start(model, args.labels, image, min(2, cpus), warmup)
+            row = "".join(f"{value * 1000:>7.0f}ms" for value in timings[:3])
+            print(f"{'with warmup' if warmup else 'no warmup':<18}{row}"
+                  f"{timings[3] * 1000:>9.0f}ms{sum(timings) * 1000:>7.0f}ms")
+
+        print(f"\nPer image, session loaded once ({IMAGES} images)")
+        print(f"{'intra-op threads':<18}{'p50':>9}{'p95':>9}{'img/s':>9}")
+        for threads in sorted({1, 2, 4, cpus}):
+            classifier = FoodClassifier(str(model), args.labels, intra_op_threads=threads)
+            classifier.warmup()
+            latencies = per_image(classifier, image, IMAGES)
+            print(f"{threads:<18}{percentile(latencies, 50) * 1000:>7.1f}ms"
+                  f"{percentile(latencies, 95) * 1000:>7.1f}ms{len(latencies) / sum(latencies):>9.1f}")
+
+        latencies = []
+        for _ in range(PER_REQUEST_LOADS):
+            started = time.perf_counter()
+            classifier = FoodClassifier(str(model), args.labels, intra_op_threads=min(2, cpus))
+            with Image.open(image) as img:
+                classifier.predict(img)
+            latencies.append(time.perf_counter() - started)
+        print(f"\nSession created per request ({PER_REQUEST_LOADS} images): "
+              f"p50 {percentile(latencies, 50) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark micro-batching of concurrent food recognition: throughput vs latency.
+
+Runs VisionService.analyze_food_image end to end (decode, preprocess,
+inference on the decode pool) with the local ONNX backend, for several
+(max batch size, max wait) settings:
+
+  burst:  CONCURRENCY users send photos back to back (closed loop)
+  single: one user at a time -- the latency cost of waiting for company
+
+Uses the stand-in model from bench_vision_backend.py unless --model is given.
+
+    python benchmarks/bench_vision_batching.py
+    python benchmarks/bench_vision_batching.py --model models/food101.onnx
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+for _name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+              "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+
+from bench_vision_backend import build_stand_in_model, percentile
+from app.services.food_classifier import FoodClassifier
+from app.services.vision import VisionService
+from app.utils.batching import MicroBatcher
+
+IMAGES = 192
+SINGLE_IMAGES = 30
+CONCURRENCY = 16
+SETTINGS = [(1, 0.0), (4, 5.0), (8, 5.0), (8, 10.0), (16, 20.0)]
+
+
+def write_photos(directory: Path, count: int = 8):
+    """Distinct 800x600 JPEGs (WhatsApp-compressed size)."""
+    rng = np.random.default_rng(2)
+    paths = []
+    for i in range(count):
+        path = directory / f"meal_{i}.jpg"
+        Image.fromarray(rng.integers(0, 255, (600, 800, 3), dtype=np.uint8)).save(path, "JPEG", quality=80)
+        paths.append(str(path))
+    return paths
+
+
+def make_service(classifier, max_batch_size, max_wait_ms):
+    """VisionService on the ONNX backend with the given batching settings."""
+    service = VisionService()
+    service.demo_mode = False
+    service.classifier = classifier
+    service._batcher = None
+    if max_batch_size > 1:
+        service._batcher = MicroBatcher(
+            service._classify_batch, max_batch_size=max_batch_size, max_wait_seconds=max_wait_ms / 1000
+        )
+    return service
+
+
+async def run(service, photos, total, concurrency):
+    """Analyze total photos with concurrency users; return (latencies, wall seconds)."""
+    latencies = []
+    queue = list(range(total))
+
+    async def user():
+        while queue:
+            index = queue.pop()
+            started = time.perf_counter()
+            await service.analyze_food_image(photos[index % len(photos)])
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", help="ONNX model (default: build a stand-in)")
+    parser.add_argument("--labels", help="Labels file (default: <model>.labels.txt)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        model = Path(args.model) if args.model else build_stand_in_model(tmp)
+        photos = write_photos(tmp)
+        classifier = FoodClassifier(str(model), args.labels, intra_op_threads=os.cpu_count() or 1)
+        classifier.warmup()
+        print(f"Model: {model.name}   CPUs: {os.cpu_count()}   photos: 800x600 JPEG")
+
+        print(f"\n{'batch, wait':<14}{'burst img/s':>12}{'p50':>9}{'p95':>9}{'avg batch':>11}"
+              f"{'single p50':>12}{'p95':>9}")
+        for max_batch_size, max_wait_ms in SETTINGS:
+            service = make_service(classifier, max_batch_size, max_wait_ms)
+            await service.startup()
+            await run(service, photos, CONCURRENCY, CONCURRENCY)  # warm the pool
+
+            latencies, wall = await run(service, photos, IMAGES, CONCURRENCY)
+            batching = service.stats()["batching"]
+            avg_batch = batching["avg_batch_size"] if batching else 1.0
+            single, _ = await run(service, photos, SINGLE_IMAGES, 1)
+            await service.shutdown()
+
+            label = "off" if max_batch_size == 1 else f"{max_batch_size}, {max_wait_ms:.0f}ms"
+            print(f"{label:<14}{len(latencies) / wall:>12.1f}"
+                  f"{percentile(latencies, 50) * 1000:>7.0f}ms{percentile(latencies, 95) * 1000:>7.0f}ms"
+                  f"{avg_batch:>11.1f}"
+                  f"{percentile(single, 50) * 1000:>10.1f}ms{percentile(single, 95) * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark thread-pool vs process-pool vision execution: meals per second
+against worker count, and how much the event loop stalls meanwhile.
+
+Each run pushes PHOTOS 1600x1200 JPEGs through VisionService.analyze_food_image
+(decode, preprocess, ONNX inference) with CONCURRENCY requests in flight.
+A ticker task sleeping 5ms in a loop records the worst event-loop lag,
+which is what webhook acknowledgement would feel. Worker counts go up to
+the number of CPUs (at least 2); intra-op threads are CPUs / workers.
+
+Uses the stand-in model from bench_vision_backend.py unless --model is given.
+
+    python benchmarks/bench_vision_executor.py
+    python benchmarks/bench_vision_executor.py --model models/food101.onnx
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+for _name in ("WHATSAPP_API_TOKEN", "WHATSAPP_PHONE_NUMBER_ID", "WHATSAPP_VERIFY_TOKEN",
+              "WHATSAPP_BUSINESS_ACCOUNT_ID", "USDA_API_KEY"):
+    os.environ.setdefault(_name, "benchmark")
+
+from bench_vision_backend import build_stand_in_model
+from app.config import settings
+from app.services.food_classifier import FoodClassifier
+from app.services.vision import VisionService
+
+PHOTOS = 64
+CONCURRENCY = 16
+
+
+def write_photos(directory: Path, count: int = 8):
+    """Distinct photo-like 1600x1200 JPEGs."""
+    rng = np.random.default_rng(3)
+    paths = []
+    for i in range(count):
+        small = Image.fromarray(rng.integers(0, 255, (300, 400, 3), dtype=np.uint8))
+        photo = small.resize((1600, 1200), Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+        path = directory / f"meal_{i}.jpg"
+        photo.save(path, "JPEG", quality=85)
+        paths.append(str(path))
+    return paths
+
+
+async def run(mode, workers, model, labels, photos):
+    """Return (meals/sec, worst event-loop lag in ms)."""
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # Spawned workers build their classifier from the environment
+    os.environ.update({"VISION_MODEL_PATH": str(model), "VISION_INTRA_OP_THREADS": str(threads)})
+    if labels:
+        os.environ["VISION_MODEL_LABELS_PATH"] = labels
+    settings.vision_decode_workers = workers
+
+    service = VisionService()
+    service.demo_mode = False
+    service.classifier = FoodClassifier(str(model), labels, intra_op_threads=threads)
+    service._process_mode = mode == "process"
+    service._batcher = None
+    service._result_cache = None
+    await service.startup()
+
+    worst_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal worst_lag
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            worst_lag = max(worst_lag, time.perf_counter() - started - 0.005)
+
+    queue = list(range(PHOTOS))
+
+    async def user():
+        while queue:
+            await service.analyze_food_image(photos[queue.pop() % len(photos)])
+
+    tick = asyncio.ensure_future(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    running = False
+    await tick
+    await service.shutdown()
+    return PHOTOS / elapsed, worst_lag * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", help="ONNX model (default: build a stand-in)")
+    parser.add_argument("--labels", help="Labels file (default: <model>.labels.txt)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        model = Path(args.model) if args.model else build_stand_in_model(tmp)
+        photos = write_photos(tmp)
+        cpus = os.cpu_count() or 1
+        print(f"Model: {model.name}   CPUs: {cpus}   photos: 1600x1200 JPEG   concurrency: {CONCURRENCY}")
+
+        print(f"\n{'workers':<9}{'thread meals/s':>16}{'worst lag':>11}{'process meals/s':>17}{'worst lag':>11}")
+        for workers in sorted({1, 2, cpus}):
+            row = f"{workers:<9}"
+            for mode in ("thread", "process"):
+                meals_per_second, lag_ms = await run(mode, workers, model, args.labels, photos)
+                row += f"{meals_per_second:>{16 if mode == 'thread' else 17}.1f}{lag_ms:>9.1f}ms"
+            print(row)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
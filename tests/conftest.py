@@ -2,11 +2,72 @@
 Pytest configuration and fixtures for testing.
 """
 import pytest
+import numpy as np
 from typing import Generator
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.models.nutrition import FoodItem, MacroNutrients, MicroNutrients
+from app.services.nutrition import nutrition_service
+from app.services.nutrition_store import NutritionStore
+
+
+class FakeClock:
+    """Manually advanced clock, injected where code takes a clock callable."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    """Clock that only moves when a test sets or advances its `now`."""
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def isolated_nutrition_store(tmp_path, monkeypatch):
+    """Keep the global nutrition service's on-disk store out of the repo."""
+    store = NutritionStore(str(tmp_path / "nutrition_cache.db"), ttl_seconds=3600)
+    monkeypatch.setattr(nutrition_service, "_store", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def onnx_food_model(tmp_path) -> str:
+    """
+    Tiny ONNX classifier (32x32 input) whose top label is the image's
+    dominant colour channel: red_apple, green_salad or blue_cheese.
+    Writes the labels next to it as <model>.labels.txt.
+    """
+    pytest.importorskip("onnxruntime")
+    onnx = pytest.importorskip("onnx")
+    from onnx import TensorProto, helper, numpy_helper
+
+    weights = numpy_helper.from_array(np.eye(3, dtype=np.float32) * 4.0, "weights")
+    bias = numpy_helper.from_array(np.zeros(3, dtype=np.float32), "bias")
+    graph = helper.make_graph(
+        [
+            helper.make_node("GlobalAveragePool", ["pixel_values"], ["pooled"]),
+            helper.make_node("Flatten", ["pooled"], ["features"]),
+            helper.make_node("Gemm", ["features", "weights", "bias"], ["logits"], transB=1),
+        ],
+        "food_colour_classifier",
+        [helper.make_tensor_value_info("pixel_values", TensorProto.FLOAT, ["batch", 3, 32, 32])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", 3])],
+        initializer=[weights, bias],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+
+    model_path = tmp_path / "food.onnx"
+    onnx.save(model, str(model_path))
+    (tmp_path / "food.labels.txt").write_text("red_apple\ngreen_salad\nblue_cheese\n")
+    return str(model_path)
 
 
 @pytest.fixture
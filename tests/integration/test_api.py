@@ -31,6 +31,18 @@ class TestHealthEndpoints:
         assert "description" in data
         assert data["docs"] == "/docs"
 
+    def test_metrics_endpoint(self, client: TestClient):
+        """Test metrics endpoint exposes nutrition cache counters."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert "hits" in data["nutrition"]["cache"]
+        assert "misses" in data["nutrition"]["cache"]
+        assert "loop_blocking_ms_max" in data["vision"]
+        assert "process" in data
+
 
 class TestWebhookEndpoints:
     """Test cases for webhook endpoints."""
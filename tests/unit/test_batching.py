@@ -0,0 +1,65 @@
+"""
+Unit tests for micro-batching.
+"""
+import asyncio
+import pytest
+from app.utils.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test cases for MicroBatcher."""
+
+    def setup_method(self):
+        """Set up a batch recorder."""
+        self.batches = []
+
+    async def _double(self, items):
+        self.batches.append(list(items))
+        await asyncio.sleep(0)
+        return [item * 2 for item in items]
+
+    async def test_concurrent_items_share_a_batch(self):
+        """Concurrent submissions run as one batch; each caller gets its own result."""
+        batcher = MicroBatcher(self._double, max_batch_size=8, max_wait_seconds=0.01)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert results == [0, 2, 4, 6, 8]
+        assert self.batches == [[0, 1, 2, 3, 4]]
+        assert batcher.stats()["avg_batch_size"] == 5
+
+    async def test_full_batch_dispatches_without_waiting(self):
+        """Reaching max_batch_size dispatches immediately; the rest wait for the timer."""
+        batcher = MicroBatcher(self._double, max_batch_size=3, max_wait_seconds=10.0)
+
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(6))), 1.0)
+
+        assert results == [0, 2, 4, 6, 8, 10]
+        assert self.batches == [[0, 1, 2], [3, 4, 5]]
+
+    async def test_lone_item_dispatched_after_max_wait(self):
+        """A single item is not held longer than max_wait_seconds."""
+        batcher = MicroBatcher(self._double, max_batch_size=8, max_wait_seconds=0.01)
+
+        assert await asyncio.wait_for(batcher.submit(21), 1.0) == 42
+        assert self.batches == [[21]]
+
+    async def test_batch_failure_reaches_every_caller(self):
+        """An exception from the batch is raised in each caller."""
+        async def fail(items):
+            raise ValueError("model crashed")
+
+        batcher = MicroBatcher(fail, max_batch_size=4, max_wait_seconds=0.01)
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    async def test_cancelled_caller_dropped_from_batch(self):
+        """A caller cancelled before dispatch is not processed."""
+        batcher = MicroBatcher(self._double, max_batch_size=8, max_wait_seconds=0.02)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.submit(1), 0.001)
+        assert await batcher.submit(2) == 4
+
+        assert self.batches == [[2]]
@@ -0,0 +1,105 @@
+"""
+Unit tests for in-process caches.
+"""
+import pytest
+from app.utils.cache import LRUCache, PerceptualHashCache
+
+
+class TestLRUCache:
+    """Test cases for LRUCache."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_clock):
+        """Set up a small cache with a controllable clock."""
+        self.clock = fake_clock
+        self.cache = LRUCache(max_entries=2, ttl_seconds=60, clock=self.clock)
+
+    def test_get_set_counts_hits_and_misses(self):
+        """Test hits and misses are counted."""
+        assert self.cache.get("rice") is None
+        self.cache.set("rice", {"protein": 2.6})
+
+        assert self.cache.get("rice") == {"protein": 2.6}
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted first."""
+        self.cache.set("rice", 1)
+        self.cache.set("chicken", 2)
+        self.cache.get("rice")  # chicken is now least recently used
+        self.cache.set("broccoli", 3)
+
+        assert self.cache.get("chicken") is None
+        assert self.cache.get("rice") == 1
+        assert self.cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        self.cache.set("rice", 1)
+        self.cache.set("chicken", 2, ttl_seconds=5)
+        self.clock.now = 10.0
+
+        assert self.cache.get("chicken") is None
+        assert self.cache.get("rice") == 1
+        assert self.cache.stats()["expirations"] == 1
+        assert len(self.cache) == 1
+
+
+class TestPerceptualHashCache:
+    """Test cases for PerceptualHashCache."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_clock):
+        """Set up a small hash cache with a controllable clock."""
+        self.clock = fake_clock
+        self.cache = PerceptualHashCache(max_entries=2, ttl_seconds=60, max_distance=4, clock=self.clock)
+
+    def test_exact_and_near_hits(self):
+        """Hashes a few bits away hit; counts near hits separately."""
+        self.cache.set(0b1010_1010, "rice")
+
+        assert self.cache.get(0b1010_1010) == "rice"
+        assert self.cache.get(0b1010_0101) == "rice"  # 4 bits differ
+        stats = self.cache.stats()
+        assert stats["hits"] == 2
+        assert stats["near_hits"] == 1
+
+    def test_distant_hash_misses(self):
+        """Hashes beyond max_distance miss."""
+        self.cache.set(0, "rice")
+
+        assert self.cache.get(0b11111) is None
+        assert self.cache.stats()["hit_rate"] == 0.0
+
+    def test_closest_entry_wins(self):
+        """The nearest stored hash is returned."""
+        self.cache.set(0b0000, "rice")
+        self.cache.set(0b1110, "chicken")
+
+        assert self.cache.get(0b1100) == "chicken"
+
+    def test_expired_entries_not_matched(self):
+        """Near matches ignore and drop expired entries."""
+        self.cache.set(0, "rice")
+        self.clock.now = 61
+
+        assert self.cache.get(1) is None
+        assert len(self.cache) == 0
+        assert self.cache.stats()["expirations"] == 1
+
+    def test_low_detail_hashes_bypass_cache(self):
+        """Near-flat hashes (few bits set or clear) are neither stored nor matched."""
+        cache = PerceptualHashCache(max_entries=2, ttl_seconds=60, min_detail_bits=8, clock=self.clock)
+        detailed = 0x0F0F_0F0F_0F0F_0F0F
+
+        cache.set(0, "rice")
+        cache.set(2**64 - 1, "soup")
+        cache.set(detailed, "chicken")
+
+        assert len(cache) == 1
+        assert cache.get(0b1) is None
+        assert cache.get(detailed) == "chicken"
+        assert cache.stats()["low_detail"] == 1
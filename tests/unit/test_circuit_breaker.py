@@ -0,0 +1,75 @@
+"""
+Unit tests for the circuit breaker.
+"""
+import pytest
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_clock):
+        """Set up a small-window breaker on a fake clock."""
+        self.clock = fake_clock
+        self.breaker = CircuitBreaker(
+            name="test",
+            window_size=4,
+            min_calls=4,
+            failure_rate_threshold=0.5,
+            slow_call_seconds=1.0,
+            slow_call_rate_threshold=0.75,
+            open_seconds=10.0,
+            clock=self.clock
+        )
+
+    def _record(self, outcomes):
+        for failed, duration in outcomes:
+            assert self.breaker.allow_request()
+            if failed:
+                self.breaker.record_failure(duration)
+            else:
+                self.breaker.record_success(duration)
+
+    def test_opens_on_failure_rate(self):
+        """Test the circuit opens once the failure share reaches the threshold."""
+        self._record([(False, 0.1), (True, 0.1), (False, 0.1)])
+        assert self.breaker.state == CircuitBreaker.CLOSED
+
+        self._record([(True, 0.1)])
+
+        assert self.breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            self.breaker.check()
+        assert self.breaker.stats()["rejected"] == 1
+
+    def test_opens_on_slow_calls(self):
+        """Test successful but slow calls also open the circuit."""
+        self._record([(False, 1.5), (False, 2.0), (False, 0.1), (False, 3.0)])
+
+        assert self.breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_allows_single_trial(self):
+        """Test one trial call after open_seconds; success closes the circuit."""
+        self._record([(True, 0.1)] * 4)
+        self.clock.now = 10.0
+
+        assert self.breaker.state == CircuitBreaker.HALF_OPEN
+        assert self.breaker.allow_request()
+        assert not self.breaker.allow_request()
+
+        self.breaker.record_success(0.2)
+
+        assert self.breaker.state == CircuitBreaker.CLOSED
+        assert self.breaker.stats()["window_calls"] == 0
+
+    def test_failed_trial_reopens(self):
+        """Test a failed or slow trial call opens the circuit again."""
+        self._record([(True, 0.1)] * 4)
+        self.clock.now = 10.0
+        assert self.breaker.allow_request()
+
+        self.breaker.record_success(5.0)
+
+        assert self.breaker.state == CircuitBreaker.OPEN
+        assert self.breaker.stats()["times_opened"] == 2
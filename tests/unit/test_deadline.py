@@ -0,0 +1,39 @@
+"""
+Unit tests for request deadlines.
+"""
+import pytest
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+
+class TestDeadline:
+    """Test cases for Deadline."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_clock):
+        """Set up an 8 second deadline on a fake clock."""
+        self.clock = fake_clock
+        self.deadline = Deadline(8.0, clock=self.clock)
+
+    def test_remaining_shrinks_and_never_goes_negative(self):
+        """Test remaining budget tracks the clock."""
+        self.clock.now += 3.0
+        assert self.deadline.remaining() == 5.0
+        assert self.deadline.elapsed() == 3.0
+
+        self.clock.now += 10.0
+        assert self.deadline.remaining() == 0.0
+        assert self.deadline.expired()
+
+    def test_timeout_is_capped_by_remaining_budget(self):
+        """Test per-operation timeouts never outlive the deadline."""
+        assert self.deadline.timeout(10.0) == 8.0
+        assert self.deadline.timeout(5.0) == 5.0
+        assert self.deadline.timeout(10.0, reserve_seconds=1.0) == 7.0
+
+    def test_check_raises_when_budget_is_spent(self):
+        """Test stages refuse to start without budget (including reserve)."""
+        self.clock.now += 7.5
+        self.deadline.check("download")
+
+        with pytest.raises(DeadlineExceeded, match="vision"):
+            self.deadline.check("vision", reserve_seconds=1.0)
@@ -0,0 +1,97 @@
+"""
+Unit tests for the FoodData Central importer and local food database.
+"""
+import io
+import json
+import pytest
+import httpx
+
+from app.services.nutrition import NutritionService
+from app.services.fdc_import import build_database, iter_json_array_items
+from app.services.food_database import FoodDatabase
+
+
+def _write_csv_download(directory):
+    """Write a tiny FDC CSV download (food.csv + food_nutrient.csv)."""
+    directory.mkdir()
+    (directory / "food.csv").write_text(
+        '"fdc_id","data_type","description","food_category_id","publication_date"\n'
+        '"1","sr_legacy_food","Rice, brown, long-grain, cooked","20","2019-04-01"\n'
+        '"2","sr_legacy_food","Rice, white, long-grain, cooked","20","2019-04-01"\n'
+        '"3","sub_sample_food","Rice, brown, sample 17","20","2019-04-01"\n'
+    )
+    (directory / "food_nutrient.csv").write_text(
+        '"id","fdc_id","nutrient_id","amount"\n'
+        '"10","1","1003","2.56"\n'
+        '"11","1","1008","123"\n'
+        '"12","1","1253","0"\n'
+        '"13","2","1003","2.69"\n'
+        '"14","3","1003","9.99"\n'
+    )
+
+
+def _write_json_download(path):
+    """Write a tiny FDC Foundation JSON download."""
+    path.write_text(json.dumps({"FoundationFoods": [
+        {
+            "fdcId": 100,
+            "dataType": "Foundation",
+            "description": "Broccoli, raw",
+            "foodNutrients": [
+                {"nutrient": {"id": 1003, "number": "203"}, "amount": 2.57},
+                {"nutrient": {"id": 1162, "number": "401"}, "amount": 89.2},
+                {"nutrient": {"id": 2047, "number": "957"}, "amount": 39.0},
+            ],
+        },
+    ]}))
+
+
+class TestFdcImport:
+    """Test cases for the FDC bulk importer."""
+
+    def test_iter_json_array_items_streams_across_chunks(self):
+        """Test array elements decode correctly with tiny read chunks."""
+        document = json.dumps({"SRLegacyFoods": [{"a": [1, 2]}, {"b": "x]"}, {"c": {}}]})
+
+        items = list(iter_json_array_items(io.StringIO(document), chunk_chars=3))
+
+        assert items == [{"a": [1, 2]}, {"b": "x]"}, {"c": {}}]
+
+    def test_build_database_from_csv_and_json(self, tmp_path):
+        """Test CSV and JSON downloads import into one searchable database."""
+        _write_csv_download(tmp_path / "sr_legacy")
+        _write_json_download(tmp_path / "foundation.json")
+        db_path = str(tmp_path / "fdc.db")
+
+        summary = build_database(db_path, [str(tmp_path / "sr_legacy"), str(tmp_path / "foundation.json")])
+
+        # Sub-sample rows and unmapped nutrients are dropped
+        assert summary["foods"] == 3
+        assert summary["nutrient_rows"] == 5
+
+        db = FoodDatabase(db_path)
+        best = db.search("Brown Rice")[0]
+        assert best["description"] == "Rice, brown, long-grain, cooked"
+        assert {"nutrientId": 1003, "value": 2.56} in best["foodNutrients"]
+        assert db.search("Steamed Broccoli")[0]["fdcId"] == 100
+        assert db.search("???") == []
+        db.close()
+
+    async def test_nutrition_service_local_mode(self, tmp_path):
+        """Test NutritionService answers from the local database without network."""
+        _write_csv_download(tmp_path / "sr_legacy")
+        build_database(str(tmp_path / "fdc.db"), [str(tmp_path / "sr_legacy")])
+
+        def no_network(request):
+            raise AssertionError("network used in local mode")
+
+        service = NutritionService()
+        service._store = None
+        service._food_db = FoodDatabase(str(tmp_path / "fdc.db"))
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(no_network))
+
+        nutrients = await service.get_food_nutrients_async("Brown Rice")
+
+        assert nutrients['protein'] == 2.56
+        assert nutrients['calories'] == 123.0
+        await service.shutdown()
@@ -0,0 +1,89 @@
+"""
+Unit tests for the local ONNX food classifier.
+"""
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services.food_classifier import ClassifierUnavailableError, FoodClassifier
+
+
+class TestPreprocessing:
+    """Test cases for image preprocessing (no model needed)."""
+
+    def setup_method(self):
+        """Classifier with the default 224px input (session stubbed out)."""
+        self.classifier = FoodClassifier("unused.onnx")
+        self.classifier._session = object()
+
+    def test_preprocess_shape_and_dtype(self):
+        """Landscape photos are resized and center-cropped to the model input."""
+        pixels = self.classifier.preprocess(Image.new("RGB", (640, 480)))
+
+        assert pixels.shape == (3, 224, 224)
+        assert pixels.dtype == np.float32
+
+    def test_preprocess_normalizes_and_converts_mode(self):
+        """Grayscale input becomes 3 ImageNet-normalized channels."""
+        pixels = self.classifier.preprocess(Image.new("L", (300, 500), 255))
+
+        assert pixels.shape == (3, 224, 224)
+        expected = (1 - np.array([0.485, 0.456, 0.406])) / np.array([0.229, 0.224, 0.225])
+        np.testing.assert_allclose(pixels[:, 0, 0], expected, rtol=1e-5)
+
+    def test_missing_model_raises(self, tmp_path):
+        """Loading a model that does not exist fails clearly."""
+        classifier = FoodClassifier(str(tmp_path / "missing.onnx"))
+
+        with pytest.raises(ClassifierUnavailableError):
+            classifier.load()
+
+
+class TestFoodClassifier:
+    """Test cases for inference with a tiny ONNX model."""
+
+    def test_load_once_and_adopt_model_input_size(self, onnx_food_model):
+        """The session is created once and the static input size is used."""
+        classifier = FoodClassifier(onnx_food_model)
+        classifier.load()
+        session = classifier._session
+        classifier.load()
+
+        assert classifier._session is session
+        assert classifier.input_size == 32
+        assert classifier.labels == ["red_apple", "green_salad", "blue_cheese"]
+
+    def test_predict_returns_ranked_label_score_dicts(self, onnx_food_model):
+        """Predictions look like Hugging Face output, best first, softmaxed."""
+        classifier = FoodClassifier(onnx_food_model, top_k=2)
+        classifier.warmup()
+
+        predictions = classifier.predict(Image.new("RGB", (80, 60), (20, 200, 30)))
+
+        assert [p["label"] for p in predictions][0] == "green_salad"
+        assert len(predictions) == 2
+        assert predictions[0]["score"] > predictions[1]["score"]
+        assert 0 < sum(p["score"] for p in predictions) <= 1.0
+        assert classifier.stats()["warmup_ms"] is not None
+
+    def test_classify_batch(self, onnx_food_model):
+        """A batch returns one prediction list per image."""
+        classifier = FoodClassifier(onnx_food_model, top_k=1)
+        classifier.load()
+        batch = np.stack([
+            classifier.preprocess(Image.new("RGB", (32, 32), colour))
+            for colour in [(255, 0, 0), (0, 0, 255)]
+        ])
+
+        results = classifier.classify(batch)
+
+        assert [r[0]["label"] for r in results] == ["red_apple", "blue_cheese"]
+        assert classifier.stats()["images"] == 2
+
+    def test_label_count_mismatch_raises(self, onnx_food_model, tmp_path):
+        """Labels must match the model's outputs."""
+        labels = tmp_path / "short.txt"
+        labels.write_text("red_apple\n")
+
+        with pytest.raises(ClassifierUnavailableError):
+            FoodClassifier(onnx_food_model, labels_path=str(labels)).load()
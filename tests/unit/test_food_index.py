@@ -0,0 +1,52 @@
+"""
+Unit tests for the fuzzy food-name matching index.
+"""
+import pytest
+from app.services.food_index import FoodMatchIndex, trigrams
+
+
+CATALOGUE = [
+    (1, "Rice, white, long-grain, cooked"),
+    (2, "Rice, brown, long-grain, cooked"),
+    (3, "Chicken, broilers or fryers, breast, meat only, cooked, grilled"),
+    (4, "Chicken, broilers or fryers, thigh, meat only, cooked, fried"),
+    (5, "Broccoli, cooked, boiled, drained, without salt"),
+    (6, "Broccoli raab, raw"),
+    (7, "Beef, ground, 85% lean meat, cooked"),
+]
+
+
+class TestFoodMatchIndex:
+    """Test cases for FoodMatchIndex."""
+
+    def setup_method(self):
+        """Build index over a small catalogue."""
+        self.index = FoodMatchIndex(CATALOGUE)
+
+    def test_trigrams_are_padded(self):
+        """Test word boundaries produce distinct trigrams."""
+        assert trigrams(["rice"]) == {"  r", " ri", "ric", "ice", "ce "}
+
+    def test_resolves_vision_labels(self):
+        """Test typical vision labels resolve to the right catalogue entry."""
+        assert self.index.search("Brown Rice")[0].food_id == 2
+        assert self.index.search("Grilled Chicken Breast")[0].food_id == 3
+        assert self.index.search("Steamed Broccoli")[0].food_id in (5, 6)
+
+    def test_tolerates_typos_and_plurals(self):
+        """Test near-miss spellings still match."""
+        assert self.index.search("grilled chiken breasts")[0].food_id == 3
+
+    def test_scores_sorted_and_thresholded(self):
+        """Test candidates are ordered by score and filtered by min_score."""
+        matches = self.index.search("Chicken", limit=5)
+        scores = [match.score for match in matches]
+
+        assert scores == sorted(scores, reverse=True)
+        assert self.index.search("zzzz qqqq", min_score=0.35) == []
+
+    def test_deterministic_tie_break(self):
+        """Test equal scores break on shorter description, then lower ID."""
+        index = FoodMatchIndex([(9, "Apples, raw"), (8, "Apples, raw"), (7, "Apples, raw, peeled")])
+
+        assert [match.food_id for match in index.search("apples raw")] == [8, 9, 7]
@@ -70,6 +70,20 @@ class TestFormatting:
         assert "65%" in message
         # Should not have vitamin sections
         assert message.count("Vitamins:") == 0
+        assert "temporarily unavailable" not in message
+
+    def test_format_nutrition_message_degraded(self):
+        """Test degraded results tell the user values are estimates."""
+        result = NutritionResult(
+            total_calories=200.0,
+            macros=MacroNutrients(protein=15.0, carbohydrates=25.0, fat=8.0, fiber=3.0),
+            overall_confidence=0.5,
+            degraded=True
+        )
+
+        message = format_nutrition_message(result)
+
+        assert "temporarily unavailable" in message
 
     def test_format_error_message_known_type(self):
         """Test formatting known error types."""
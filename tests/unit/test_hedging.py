@@ -0,0 +1,79 @@
+"""
+Unit tests for hedged requests.
+"""
+import asyncio
+import pytest
+from app.utils.hedging import HedgePolicy, LatencyTracker, hedged_call
+
+
+class TestLatencyTracker:
+    """Test cases for LatencyTracker."""
+
+    def test_percentile_over_window(self):
+        """Test nearest-rank percentiles over the most recent samples only."""
+        tracker = LatencyTracker(window_size=100)
+        for ms in range(1, 201):
+            tracker.record(ms / 1000.0)
+
+        assert len(tracker) == 100
+        assert tracker.percentile(50) == 0.150
+        assert tracker.percentile(95) == 0.195
+        assert LatencyTracker().percentile(95) is None
+
+
+class TestHedgedCall:
+    """Test cases for hedged_call."""
+
+    def setup_method(self):
+        """Set up a policy warmed with 10ms latencies and full hedge credit."""
+        self.policy = HedgePolicy(percentile=95, max_hedge_ratio=1.0, min_samples=5, max_burst=1.0)
+        for _ in range(5):
+            self.policy.latency.record(0.01)
+        self.calls = []
+
+    def _upstream(self, delays):
+        """Return a call whose n-th invocation sleeps delays[n]."""
+        async def call():
+            attempt = len(self.calls)
+            self.calls.append(attempt)
+            delay = delays[attempt]
+            if isinstance(delay, Exception):
+                raise delay
+            await asyncio.sleep(delay)
+            return attempt
+        return call
+
+    async def test_fast_primary_sends_no_hedge(self):
+        """Test calls faster than the hedge delay go out once."""
+        result = await hedged_call(self._upstream([0.0]), self.policy)
+
+        assert result == 0
+        assert self.policy.stats()["hedges"] == 0
+
+    async def test_slow_primary_is_hedged(self):
+        """Test a slow primary loses to the hedge, which is counted as a win."""
+        result = await hedged_call(self._upstream([1.0, 0.0]), self.policy)
+
+        assert result == 1
+        assert self.calls == [0, 1]
+        assert self.policy.stats()["hedge_wins"] == 1
+
+    async def test_failed_hedge_falls_back_to_primary(self):
+        """Test a failing hedge does not fail the call while the primary can still answer."""
+        result = await hedged_call(self._upstream([0.05, RuntimeError("boom")]), self.policy)
+
+        assert result == 0
+
+    async def test_hedge_ratio_is_capped(self):
+        """Test hedges are only sent once enough primary calls have earned credit."""
+        self.policy.max_hedge_ratio = 0.5
+        upstream = self._upstream([0.05, 0.5, 0.0])
+
+        first = await hedged_call(upstream, self.policy)
+        second = await hedged_call(upstream, self.policy)
+
+        assert (first, second) == (0, 2)
+        stats = self.policy.stats()
+        assert stats["hedges_denied"] == 1
+        assert stats["hedges"] == 1
+        assert stats["hedge_ratio"] == 0.5
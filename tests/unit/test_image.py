@@ -0,0 +1,222 @@
+"""
+Unit tests for image utilities.
+"""
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.utils.image import (
+    ImageRejectedError,
+    StreamingImageValidator,
+    dhash,
+    load_image_for_model,
+    prepare_image_for_model,
+    resize_image,
+)
+
+
+def meal_photo(rotation: int = 0) -> Image.Image:
+    """A smooth RGB test picture (gradients, like a real photo)."""
+    gray = Image.radial_gradient("L").resize((640, 480)).rotate(rotation)
+    return Image.merge("RGB", (gray, Image.linear_gradient("L").resize((640, 480)), gray))
+
+
+def reopen_as_jpeg(image: Image.Image, quality: int = 85, size=None) -> Image.Image:
+    """Round-trip through JPEG, optionally resized (like a forwarded photo)."""
+    if size:
+        image = image.resize(size)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+def distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class TestDhash:
+    """Test cases for the perceptual difference hash."""
+
+    def test_recompressed_and_resized_copies_stay_close(self):
+        """Forwarded copies (re-encoded, downscaled) hash within a few bits."""
+        original = dhash(reopen_as_jpeg(meal_photo()))
+
+        assert distance(original, dhash(reopen_as_jpeg(meal_photo(), quality=40))) <= 4
+        assert distance(original, dhash(reopen_as_jpeg(meal_photo(), size=(320, 240)))) <= 4
+
+    def test_different_pictures_far_apart(self):
+        """Different content produces a distant hash."""
+        assert distance(dhash(reopen_as_jpeg(meal_photo())), dhash(reopen_as_jpeg(meal_photo(90)))) > 10
+
+    def test_hash_fits_64_bits(self):
+        """Default hash is 64 bits."""
+        assert dhash(reopen_as_jpeg(meal_photo())) < 2 ** 64
+
+
+class TestLoadImageForModel:
+    """Test cases for reduced-scale decoding."""
+
+    def test_large_jpeg_decoded_to_target(self):
+        """A phone-sized JPEG comes out RGB with the requested short side."""
+        image = reopen_as_jpeg(meal_photo(), size=(4032, 3024))
+
+        result = load_image_for_model(image, 256)
+
+        assert result.mode == "RGB"
+        assert result.size == (341, 256)
+
+    def test_png_reduced_to_target(self):
+        """Non-JPEG formats are shrunk too."""
+        buffer = io.BytesIO()
+        meal_photo().convert("L").save(buffer, "PNG")
+        buffer.seek(0)
+
+        result = load_image_for_model(Image.open(buffer), 120)
+
+        assert result.mode == "RGB"
+        assert result.size == (160, 120)
+
+    def test_small_image_scaled_up(self):
+        """Images smaller than the target are resized up to it."""
+        result = load_image_for_model(reopen_as_jpeg(meal_photo(), size=(160, 120)), 240)
+
+        assert result.size == (320, 240)
+
+
+class TestResizeImage:
+    """Test cases for resize_image."""
+
+    def test_resizes_large_photo(self, tmp_path):
+        """Large photos are saved downscaled next to the original."""
+        path = tmp_path / "meal.jpg"
+        meal_photo().resize((4032, 3024)).save(path, "JPEG")
+
+        resized = resize_image(str(path), max_size=1024)
+
+        assert resized.endswith("_resized.jpg")
+        with Image.open(resized) as img:
+            assert img.size == (1024, 768)
+
+    def test_small_photo_untouched(self, tmp_path):
+        """Photos within max_size are returned as is."""
+        path = tmp_path / "meal.jpg"
+        meal_photo().save(path, "JPEG")
+
+        assert resize_image(str(path), max_size=1024) == str(path)
+
+
+def encoded_photo(image_format: str = "JPEG", size=(1200, 900)) -> bytes:
+    """Encode a photo-sized picture."""
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 40).convert("RGB").save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def chunks(data: bytes, size: int = 16 * 1024):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestStreamingImageValidator:
+    """Test cases for validating images while they download."""
+
+    def test_header_checked_from_first_chunk(self):
+        """Format and dimensions are known long before the last chunk."""
+        data = encoded_photo()
+        validator = StreamingImageValidator(max_bytes=len(data), declared_size=len(data))
+        parts = chunks(data)
+
+        validator.feed(parts[0])
+        assert validator.header_checked
+        assert (validator.format, validator.width, validator.height) == ("JPEG", 1200, 900)
+
+        for part in parts[1:]:
+            validator.feed(part)
+        assert validator.finish() == data
+
+    def test_declared_size_over_cap_rejected_upfront(self):
+        """A Content-Length over the cap fails before any byte is read."""
+        with pytest.raises(ImageRejectedError, match="too large"):
+            StreamingImageValidator(max_bytes=1000, declared_size=5000)
+
+    def test_stream_over_cap_aborted_at_the_cap(self):
+        """Without a Content-Length, the chunk crossing the cap fails."""
+        data = encoded_photo("PNG")
+        validator = StreamingImageValidator(max_bytes=100 * 1024)
+        fed = 0
+        with pytest.raises(ImageRejectedError, match="too large"):
+            for part in chunks(data):
+                validator.feed(part)
+                fed += len(part)
+
+        assert fed <= 100 * 1024 < len(data)
+
+    def test_small_image_rejected_by_header(self):
+        """Dimensions under the minimum fail as soon as the header is parsed."""
+        validator = StreamingImageValidator(max_bytes=10 * 1024 * 1024)
+        with pytest.raises(ImageRejectedError, match="too small"):
+            validator.feed(encoded_photo(size=(120, 90)))
+
+    def test_unsupported_format_rejected(self):
+        """Formats other than JPEG and PNG are refused."""
+        validator = StreamingImageValidator(max_bytes=10 * 1024 * 1024)
+        with pytest.raises(ImageRejectedError, match="Unsupported format"):
+            validator.feed(encoded_photo("GIF"))
+
+    def test_non_image_rejected(self):
+        """Data without an image header fails at the end of the download."""
+        validator = StreamingImageValidator(max_bytes=1024)
+        validator.feed(b"<html>not found</html>")
+        with pytest.raises(ImageRejectedError, match="Not a recognizable image"):
+            validator.finish()
+
+
+def sideways_photo() -> io.BytesIO:
+    """
+    Landscape JPEG (400x300, left half red) stored the way a phone held
+    upright saves it: EXIF orientation 6, to be rotated 90 degrees clockwise.
+    """
+    image = Image.new("RGB", (400, 300), (20, 20, 220))
+    image.paste((220, 20, 20), (0, 0, 200, 300))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", exif=exif)
+    buffer.seek(0)
+    return buffer
+
+
+class TestPrepareImageForModel:
+    """Test cases for single-pass validation, orientation and resizing."""
+
+    def test_exif_orientation_applied(self):
+        """A sideways-stored photo comes out upright, at the target short side."""
+        with Image.open(sideways_photo()) as img:
+            pixels, info = prepare_image_for_model(img, short_side=120)
+
+        assert (info["width"], info["height"], info["orientation"]) == (300, 400, 6)
+        assert pixels.shape == (160, 120, 3) and pixels.dtype == np.uint8
+        # The stored left half (red) is now on top
+        assert pixels[10, 60, 0] > 200 and pixels[150, 60, 2] > 200
+
+    def test_header_only_without_short_side(self):
+        """Without a target size the image is checked but never decoded."""
+        with Image.open(sideways_photo()) as img:
+            pixels, info = prepare_image_for_model(img)
+            assert img.im is None
+
+        assert pixels is None
+        assert info["format"] == "JPEG"
+
+    def test_rejected_from_header(self):
+        """Size, format and dimension checks fail before decoding."""
+        with Image.open(sideways_photo()) as img:
+            with pytest.raises(ImageRejectedError, match="too large"):
+                prepare_image_for_model(img, 120, encoded_size=50 * 1024 * 1024)
+
+        with Image.open(io.BytesIO(encoded_photo(size=(150, 150)))) as img:
+            with pytest.raises(ImageRejectedError, match="too small"):
+                prepare_image_for_model(img, 120)
+            assert img.im is None
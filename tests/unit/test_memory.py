@@ -0,0 +1,26 @@
+"""
+Unit tests for process memory accounting.
+"""
+import os
+import sys
+
+import pytest
+
+from app.utils.memory import process_memory
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Reads /proc")
+class TestProcessMemory:
+    """Test cases for process_memory."""
+
+    def test_current_process(self):
+        """The current process reports consistent RSS, PSS and USS."""
+        memory = process_memory()
+
+        assert memory["pid"] == os.getpid()
+        assert 0 < memory["uss_mb"] <= memory["pss_mb"] <= memory["rss_mb"]
+        assert memory["shared_mb"] >= 0
+
+    def test_missing_process(self):
+        """An unknown PID gives an empty result instead of raising."""
+        assert process_memory(2 ** 31) == {}
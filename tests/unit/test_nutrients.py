@@ -0,0 +1,81 @@
+"""
+Unit tests for the nutrient registry and fixed-layout nutrient vectors.
+"""
+import pytest
+from app.models.nutrients import (
+    MINERAL,
+    NUTRIENT_KEYS,
+    NUTRIENT_REGISTRY,
+    USDA_NUTRIENT_SLOTS,
+    NutrientSpec,
+    NutrientVector,
+    compile_registry,
+)
+
+
+class TestNutrientVector:
+    """Test cases for NutrientVector."""
+
+    def test_from_dict_fills_missing_with_zero(self):
+        """Test dict conversion uses the fixed slot layout."""
+        vector = NutrientVector.from_dict({'protein': 31.0, 'calories': 165.0})
+
+        assert list(vector) == list(NUTRIENT_KEYS)
+        assert vector['protein'] == 31.0
+        assert vector.get('iron') == 0.0
+        assert vector.to_dict()['calories'] == 165.0
+
+    def test_scaled_and_sum(self):
+        """Test scaling and summing are element-wise."""
+        rice = NutrientVector.from_dict({'protein': 2.6, 'calories': 112.0})
+        chicken = NutrientVector.from_dict({'protein': 31.0, 'calories': 165.0})
+
+        total = NutrientVector.sum([rice.scaled(2.0), chicken.scaled(1.5)])
+
+        assert total['protein'] == pytest.approx(5.2 + 46.5)
+        assert total['calories'] == pytest.approx(224.0 + 247.5)
+        assert NutrientVector.sum([]) == NutrientVector.zeros()
+
+    def test_immutable(self):
+        """Test cached vectors cannot be modified in place."""
+        vector = NutrientVector.zeros()
+
+        with pytest.raises(ValueError):
+            vector.values[0] = 1.0
+
+    def test_usda_slots_accept_int_and_str_ids(self):
+        """Test the precomputed USDA ID -> slot map covers both ID forms."""
+        assert USDA_NUTRIENT_SLOTS[1003] == USDA_NUTRIENT_SLOTS['1003'] == NUTRIENT_KEYS.index('protein')
+
+
+class TestNutrientRegistry:
+    """Test cases for compiling the nutrient registry."""
+
+    def test_default_tables_follow_registry(self):
+        """Test slots, USDA lookups and %DV arrays come from the registry."""
+        tables = compile_registry(NUTRIENT_REGISTRY)
+
+        assert tables.keys == NUTRIENT_KEYS
+        assert tables.usda_slots[1089] == tables.index['iron']
+        assert tables.usda_mapping['1008'] == 'calories'
+        assert 'calories' not in tables.dv_keys
+        assert [title for title, _ in tables.dv_sections] == ['Vitamins', 'Minerals']
+
+    def test_added_nutrient_is_one_entry(self):
+        """Test a new registry entry gets a slot, USDA mapping, DV and display line."""
+        sodium = NutrientSpec('sodium', (1093,), 'mg', 'Sodium', MINERAL, 2300, 400.0)
+        tables = compile_registry(NUTRIENT_REGISTRY + (sodium,))
+
+        assert tables.keys[-1] == 'sodium'
+        assert tables.usda_slots['1093'] == len(NUTRIENT_REGISTRY)
+        assert tables.dv_fields[-1] == 'sodium_dv'
+        assert tables.dv_reference[-1] == 2300
+        assert tables.dv_sections[-1][1][-1] == ('sodium_dv', 'Sodium')
+        assert tables.defaults[-1] == 400.0
+
+    def test_duplicate_usda_id_rejected(self):
+        """Test two nutrients cannot claim the same USDA ID."""
+        duplicate = NutrientSpec('energy_alt', (1008,), 'kcal', 'Energy', 'energy')
+
+        with pytest.raises(ValueError):
+            compile_registry(NUTRIENT_REGISTRY + (duplicate,))
@@ -0,0 +1,326 @@
+"""
+Unit tests for the USDA nutrition service.
+"""
+import asyncio
+import threading
+import pytest
+import httpx
+
+from app.config import settings
+from app.services.nutrition import NutritionService
+from app.services.nutrition_store import NutritionStore
+from app.models.nutrition import FoodItem
+from app.utils.deadline import Deadline
+
+
+def _usda_food(description: str, protein: float, calories: float) -> dict:
+    """Build a minimal USDA search result entry."""
+    return {
+        "description": description,
+        "foodNutrients": [
+            {"nutrientId": 1003, "value": protein},
+            {"nutrientId": 1008, "value": calories},
+        ]
+    }
+
+
+class TestNutritionService:
+    """Test cases for NutritionService."""
+
+    def setup_method(self):
+        """Set up a service whose HTTP client is served by a mock transport."""
+        self.requests_seen = []
+        self.page_sizes = []
+        self.service = NutritionService()
+        self.service._store = None
+        self.service._client = httpx.AsyncClient(
+            base_url=self.service.base_url,
+            transport=httpx.MockTransport(self._handle_request)
+        )
+
+    def _handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer USDA searches from a small in-memory catalogue."""
+        query = request.url.params["query"]
+        self.requests_seen.append(query)
+        self.page_sizes.append(request.url.params["pageSize"])
+        catalogue = {
+            "Brown Rice": _usda_food("Rice, brown, cooked", 2.6, 112.0),
+            "Grilled Chicken Breast": _usda_food("Chicken, breast, grilled", 31.0, 165.0),
+        }
+        foods = [catalogue[query]] if query in catalogue else []
+        return httpx.Response(200, json={"foods": foods})
+
+    async def test_search_food_async_returns_best_match(self):
+        """Test async search returns the first USDA result."""
+        food = await self.service.search_food_async("Brown Rice")
+
+        assert food["description"] == "Rice, brown, cooked"
+        assert self.page_sizes == ["1"]
+        assert self.requests_seen == ["Brown Rice"]
+
+    async def test_search_food_async_no_match(self):
+        """Test async search returns None when USDA has no match."""
+        assert await self.service.search_food_async("Unobtainium") is None
+
+    async def test_search_food_async_http_error(self):
+        """Test async search returns None on upstream errors."""
+        self.service._client = httpx.AsyncClient(
+            base_url=self.service.base_url,
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+
+        assert await self.service.search_food_async("Brown Rice") is None
+
+    async def test_aggregate_meal_nutrition_async(self):
+        """Test async aggregation scales and sums items, defaulting unknowns."""
+        foods = [
+            FoodItem(name="Brown Rice", quantity=200.0, confidence=0.9),
+            FoodItem(name="Grilled Chicken Breast", quantity=100.0, confidence=0.9),
+        ]
+
+        total = await self.service.aggregate_meal_nutrition_async(foods)
+
+        assert total['protein'] == pytest.approx(2.6 * 2 + 31.0)
+        assert total['calories'] == pytest.approx(112.0 * 2 + 165.0)
+
+    async def test_aggregate_meal_nutrition_async_concurrent_and_ordered(self, monkeypatch):
+        """Test lookups overlap, respect the cap, and sum deterministically."""
+        monkeypatch.setattr(settings, "usda_max_concurrent_lookups", 2)
+        delays = {"Slow": 0.03, "Medium": 0.02, "Fast": 0.0}
+        in_flight = []
+        max_in_flight = []
+
+        async def fake_lookup(food_item, deadline=None):
+            in_flight.append(food_item.name)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(delays[food_item.name])
+            in_flight.remove(food_item.name)
+            return {'protein': food_item.quantity / 10.0, 'calories': 0.1}
+
+        monkeypatch.setattr(self.service, "get_nutrition_for_food_async", fake_lookup)
+        foods = [
+            FoodItem(name=name, quantity=quantity, confidence=0.9)
+            for name, quantity in [("Slow", 10.0), ("Medium", 20.0), ("Fast", 30.0)]
+        ]
+
+        first = await self.service.aggregate_meal_nutrition_async(foods)
+        second = await self.service.aggregate_meal_nutrition_async(list(reversed(foods)))
+
+        assert max(max_in_flight) == 2
+        assert first['protein'] == pytest.approx(6.0)
+        # Summed in input order, not completion order ("Fast" finishes first)
+        assert first['protein'] == ((0.0 + 1.0) + 2.0) + 3.0
+        assert second['protein'] == ((0.0 + 3.0) + 2.0) + 1.0
+
+    async def test_food_nutrients_cached_by_normalized_name(self):
+        """Test repeated lookups are served from the per-100g cache."""
+        first = await self.service.get_food_nutrients_async("Brown Rice")
+        second = await self.service.get_food_nutrients_async("  brown   RICE ")
+
+        assert first['protein'] == 2.6
+        assert second is first
+        assert self.requests_seen == ["Brown Rice"]
+        assert self.service.stats()["cache"]["hits"] == 1
+
+    async def test_concurrent_misses_coalesce_into_one_request(self):
+        """Test simultaneous lookups of one food make a single USDA call."""
+        results = await asyncio.gather(*(
+            self.service.get_food_nutrients_async(name)
+            for name in ["Brown Rice", "brown rice", "Brown  Rice"]
+        ))
+
+        assert all(result['protein'] == 2.6 for result in results)
+        assert self.requests_seen == ["Brown Rice"]
+        assert self.service.stats()["single_flight"]["coalesced"] == 2
+
+    async def test_unknown_food_is_negatively_cached(self):
+        """Test a label with no match is not searched again within the negative TTL."""
+        food = FoodItem(name="Unobtainium", quantity=100.0, confidence=0.5)
+
+        first = await self.service.get_nutrition_for_food_async(food)
+        second = await self.service.get_nutrition_for_food_async(food)
+
+        assert first['calories'] == second['calories'] == 200.0
+        assert self.requests_seen == ["Unobtainium"]
+        stats = self.service.stats()
+        assert stats["lookups"]["not_found"] == 1
+        assert stats["lookups"]["negative_cache_hits"] == 1
+        assert stats["lookups"]["defaults_used"] == 2
+        assert stats["top_fallback_labels"] == [{"label": "unobtainium", "count": 2}]
+
+    async def test_upstream_errors_are_not_negatively_cached(self):
+        """Test a failed lookup is retried on the next request."""
+        self.service._client = httpx.AsyncClient(
+            base_url=self.service.base_url,
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+
+        assert await self.service.get_food_nutrients_async("Brown Rice") is None
+        assert await self.service.get_food_nutrients_async("Brown Rice") is None
+
+        stats = self.service.stats()
+        assert stats["lookups"]["errors"] == 2
+        assert stats["negative_cache"]["size"] == 0
+
+    async def test_open_circuit_answers_with_degraded_defaults(self):
+        """Test failing USDA calls open the breaker and later items skip the network."""
+        self.service._client = httpx.AsyncClient(
+            base_url=self.service.base_url,
+            transport=httpx.MockTransport(self._failing_request)
+        )
+        self.service._breaker.min_calls = 2
+        foods = [
+            FoodItem(name=name, quantity=100.0, confidence=0.5)
+            for name in ["Rice", "Beans", "Corn", "Kale"]
+        ]
+
+        results = [await self.service.get_nutrition_for_food_async(food) for food in foods]
+
+        assert all(result.degraded for result in results)
+        assert results[0]['calories'] == 200.0
+        assert self.requests_seen == ["Rice", "Beans"]
+        stats = self.service.stats()
+        assert stats["circuit_breaker"]["state"] == "open"
+        assert stats["lookups"]["short_circuited"] == 2
+        assert stats["negative_cache"]["size"] == 0
+
+        total = self.service._sum_nutrition(results)
+        assert total.degraded
+
+    async def test_degraded_answers_are_not_fallback_labels(self):
+        """Test lookups skipped by an open breaker stay out of the fallback report."""
+        self.service._client = httpx.AsyncClient(
+            base_url=self.service.base_url,
+            transport=httpx.MockTransport(self._failing_request)
+        )
+        self.service._breaker.min_calls = 2
+        food = FoodItem(name="Brown Rice", quantity=100.0, confidence=0.9)
+
+        for _ in range(4):
+            await self.service.get_nutrition_for_food_async(food)
+
+        stats = self.service.stats()
+        assert stats["circuit_breaker"]["state"] == "open"
+        assert stats["lookups"]["degraded"] == 4
+        assert stats["lookups"]["defaults_used"] == 0
+        assert stats["top_fallback_labels"] == []
+
+    def _failing_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests_seen.append(request.url.params["query"])
+        return httpx.Response(503)
+
+    async def test_deadline_falls_back_and_late_answer_fills_cache(self, monkeypatch):
+        """Test a lookup past the deadline uses defaults but still caches the late result."""
+        monkeypatch.setattr(settings, "response_reply_reserve_seconds", 0.0)
+
+        async def slow_request(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.05)
+            return self._handle_request(request)
+
+        self.service._client = httpx.AsyncClient(
+            base_url=self.service.base_url,
+            transport=httpx.MockTransport(slow_request)
+        )
+        food = FoodItem(name="Brown Rice", quantity=100.0, confidence=0.9)
+
+        result = await self.service.get_nutrition_for_food_async(food, Deadline(0.01))
+
+        assert result.degraded
+        assert result['calories'] == 200.0
+        assert self.service.stats()["lookups"]["deadline_exceeded"] == 1
+
+        await asyncio.sleep(0.1)
+        cached = await self.service.get_nutrition_for_food_async(food, Deadline(0.0))
+        assert not cached.degraded
+        assert cached['calories'] == 112.0
+        assert self.requests_seen == ["Brown Rice"]
+
+    async def test_quota_wait_beyond_deadline_skips_lookup(self):
+        """Test an exhausted quota sends deadline-bound lookups straight to defaults."""
+        while self.service._quota.try_acquire():
+            pass
+        food = FoodItem(name="Brown Rice", quantity=100.0, confidence=0.9)
+
+        result = await self.service.get_nutrition_for_food_async(food, Deadline(2.0))
+
+        assert result.degraded
+        assert self.requests_seen == []
+        stats = self.service.stats()
+        assert stats["lookups"]["quota_skipped"] == 1
+        assert stats["quota"]["tokens_available"] < 1
+
+    def test_quota_split_between_workers(self, monkeypatch):
+        """Test each worker process gets an equal share of the hourly quota."""
+        monkeypatch.setattr(settings, "usda_quota_per_hour", 1000)
+        monkeypatch.setattr(settings, "usda_quota_burst", 20)
+        monkeypatch.setattr(settings, "usda_quota_workers", 4)
+
+        quota = NutritionService().stats()["quota"]
+
+        assert quota["capacity"] + quota["rate_per_hour"] == 250
+
+    def test_fallback_label_report_is_bounded(self, monkeypatch):
+        """Test only the most frequent fallback labels are kept."""
+        monkeypatch.setattr(settings, "nutrition_fallback_labels_tracked", 2)
+
+        for name in ["Stew", "Stew", "Mash", "Gruel"]:
+            self.service._record_fallback(name)
+
+        assert dict(self.service._fallback_labels) == {"stew": 2, "gruel": 1}
+
+    async def test_store_tier_survives_restart(self, tmp_path):
+        """Test profiles resolved by one service are served from disk to the next."""
+        self.service._store = NutritionStore(str(tmp_path / "n.db"), ttl_seconds=3600)
+        await self.service.get_food_nutrients_async("Brown Rice")
+        await self.service.shutdown()
+
+        restarted = NutritionService()
+        restarted._store = NutritionStore(str(tmp_path / "n.db"), ttl_seconds=3600)
+        restarted._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+
+        nutrients = await restarted.get_food_nutrients_async("brown rice")
+
+        assert nutrients['protein'] == 2.6
+        assert restarted.stats()["store"]["hits"] == 1
+        restarted._store.close()
+
+    async def test_store_io_runs_off_event_loop(self, tmp_path):
+        """Store reads, writes and the final flush never run on the event loop thread."""
+        store = NutritionStore(str(tmp_path / "n.db"), ttl_seconds=3600, batch_size=1)
+        threads = []
+        for name in ("get", "put", "close"):
+            method = getattr(store, name)
+
+            def traced(*args, _method=method, **kwargs):
+                threads.append(threading.current_thread())
+                return _method(*args, **kwargs)
+            setattr(store, name, traced)
+        self.service._store = store
+
+        await self.service.get_food_nutrients_async("Brown Rice")
+        await self.service.shutdown()
+
+        assert len(threads) == 3
+        assert threading.main_thread() not in threads
+        assert store.writes == 1
+
+    async def test_shutdown_closes_client(self):
+        """Test shutdown releases the pooled client."""
+        client = self.service._get_client()
+
+        await self.service.shutdown()
+
+        assert client.is_closed
+        assert self.service._client is None
+
+    def test_aggregate_meal_nutrition_sync_uses_defaults_offline(self, monkeypatch):
+        """Test the blocking API still works and falls back to defaults."""
+        monkeypatch.setattr(self.service, "_fetch_food", lambda name: None)
+        food = FoodItem(name="Mystery Stew", quantity=100.0, confidence=0.5)
+
+        total = self.service.aggregate_meal_nutrition([food])
+
+        assert total['calories'] == 200.0
+        assert total['protein'] == 15.0
@@ -0,0 +1,63 @@
+"""
+Unit tests for the persistent nutrition store.
+"""
+import sqlite3
+import pytest
+from app.models.nutrients import NutrientVector
+from app.services.nutrition_store import NutritionStore
+
+RICE = NutrientVector.from_dict({"protein": 2.6, "calories": 112.0})
+BROCCOLI = NutrientVector.from_dict({"protein": 2.8})
+
+
+class TestNutritionStore:
+    """Test cases for NutritionStore."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_clock):
+        """Set up clock; stores are created per test in tmp_path."""
+        self.clock = fake_clock
+
+    def _store(self, path, **kwargs) -> NutritionStore:
+        options = {"ttl_seconds": 60, "batch_size": 2, "flush_interval_seconds": 30}
+        options.update(kwargs)
+        return NutritionStore(str(path / "nutrition.db"), clock=self.clock, **options)
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test writes are held until the batch fills, but still readable."""
+        store = self._store(tmp_path)
+
+        store.put("brown rice", RICE)
+        assert store.stats()["pending_writes"] == 1
+        assert store.get("brown rice") is RICE
+
+        store.put("broccoli", BROCCOLI)
+        assert store.stats()["pending_writes"] == 0
+        assert store.stats()["flushes"] == 1
+        store.close()
+
+    def test_shared_between_connections_in_wal_mode(self, tmp_path):
+        """Test a second worker's connection sees flushed rows."""
+        writer = self._store(tmp_path)
+        reader = self._store(tmp_path)
+
+        writer.put("brown rice", RICE)
+        assert reader.get("brown rice") is None
+        writer.flush()
+
+        assert reader.get("brown rice") == RICE
+        mode = sqlite3.connect(writer.path).execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+        writer.close()
+        reader.close()
+
+    def test_expiry_and_purge(self, tmp_path):
+        """Test expired rows are not served and can be purged."""
+        store = self._store(tmp_path)
+        store.put("brown rice", RICE)
+        store.flush()
+
+        self.clock.now += 61
+        assert store.get("brown rice") is None
+        assert store.purge_expired() == 1
+        store.close()
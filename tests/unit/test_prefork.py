@@ -0,0 +1,41 @@
+"""
+Unit tests for the preload-then-fork server's worker supervision.
+"""
+import os
+
+import pytest
+
+from app import prefork
+from app.config import settings
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Forks workers")
+class TestServe:
+    """Test cases for serve()."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        """Skip preloading and signal handlers; workers are plain forked children."""
+        self.forked = []
+        monkeypatch.setattr(prefork, "preload", lambda: None)
+        monkeypatch.setattr(prefork.signal, "signal", lambda signum, handler: None)
+        monkeypatch.setattr(prefork, "RESTART_BACKOFF_SECONDS", 0.01)
+        monkeypatch.setattr(settings, "usda_quota_workers", settings.usda_quota_workers)
+        monkeypatch.setattr(settings, "server_worker_min_uptime_seconds", 10.0)
+        monkeypatch.setattr(settings, "server_max_worker_crashes", 3)
+
+    def _fork_crashing_worker(self, app, sock):
+        """Worker whose startup fails at once."""
+        pid = os.fork()
+        if pid == 0:
+            os._exit(1)
+        self.forked.append(pid)
+        return pid
+
+    def test_crash_loop_stops_with_error(self, monkeypatch):
+        """Workers dying right after start are retried a few times, then the master gives up."""
+        monkeypatch.setattr(prefork, "_fork_worker", self._fork_crashing_worker)
+
+        assert prefork.serve(workers=1, host="127.0.0.1", port=0) == 1
+        assert len(self.forked) == 3
+        assert settings.usda_quota_workers == 1
@@ -0,0 +1,73 @@
+"""
+Unit tests for the token-bucket rate limiter.
+"""
+import asyncio
+import pytest
+from app.utils.rate_limit import RateLimitExceeded, TokenBucket
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, fake_clock):
+        """Set up a 2-token bucket refilling one token per second."""
+        self.clock = fake_clock
+        self.bucket = TokenBucket(rate_per_second=1.0, capacity=2, clock=self.clock)
+
+    def test_burst_then_queued_reservations(self):
+        """Test the burst is free and later callers queue in arrival order."""
+        assert self.bucket.reserve() == 0.0
+        assert self.bucket.reserve() == 0.0
+        assert self.bucket.reserve() == 1.0
+        assert self.bucket.reserve() == 2.0
+        assert self.bucket.projected_wait() == 3.0
+
+    def test_refill_is_capped_at_capacity(self):
+        """Test idle time never banks more than the burst size."""
+        self.bucket.reserve()
+        self.clock.now = 100.0
+
+        assert self.bucket.available() == 2.0
+
+    def test_reserve_rejects_waits_beyond_max(self):
+        """Test an over-long wait reserves nothing."""
+        self.bucket.reserve()
+        self.bucket.reserve()
+
+        assert self.bucket.reserve(max_wait=0.5) is None
+        assert not self.bucket.try_acquire()
+        assert self.bucket.projected_wait() == 1.0
+        assert self.bucket.stats()["rejected"] == 2
+
+    def test_try_take_does_not_count_rejections(self):
+        """Test optional takes from an empty bucket leave the rejected counter alone."""
+        assert self.bucket.try_take()
+        assert self.bucket.try_take()
+
+        assert not self.bucket.try_take()
+        stats = self.bucket.stats()
+        assert stats["granted"] == 2
+        assert stats["rejected"] == 0
+
+    async def test_acquire_raises_when_wait_too_long(self):
+        """Test async acquire raises instead of waiting past max_wait."""
+        self.bucket.reserve()
+        self.bucket.reserve()
+
+        with pytest.raises(RateLimitExceeded):
+            await self.bucket.acquire(max_wait=0.5)
+
+    async def test_cancelled_waiter_returns_its_token(self):
+        """Test a waiter cancelled while queued gives its reservation back."""
+        bucket = TokenBucket(rate_per_second=10.0, capacity=1)
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert bucket.available() > 0.0
+        assert bucket.stats()["waiting"] == 0
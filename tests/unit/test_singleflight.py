@@ -0,0 +1,63 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+import asyncio
+import pytest
+from app.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def setup_method(self):
+        """Set up a fresh coalescer and call counter."""
+        self.flight = SingleFlight()
+        self.calls = 0
+
+    async def _slow_lookup(self, value):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return value
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test identical concurrent calls run once and share the result."""
+        results = await asyncio.gather(*(
+            self.flight.do("brown rice", lambda: self._slow_lookup("rice"))
+            for _ in range(5)
+        ))
+
+        assert results == ["rice"] * 5
+        assert self.calls == 1
+        assert self.flight.stats()["coalesced"] == 4
+        assert self.flight.stats()["in_flight"] == 0
+
+    async def test_errors_are_shared(self):
+        """Test all waiters receive the leader's exception."""
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("USDA down")
+
+        results = await asyncio.gather(
+            self.flight.do("rice", failing),
+            self.flight.do("rice", failing),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert self.flight.stats()["executions"] == 1
+
+    async def test_sequential_calls_run_again(self):
+        """Test a finished call is not reused by later callers."""
+        await self.flight.do("rice", lambda: self._slow_lookup(1))
+        await self.flight.do("rice", lambda: self._slow_lookup(2))
+
+        assert self.calls == 2
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test cancelling one caller leaves the shared call running."""
+        first = asyncio.ensure_future(self.flight.do("rice", lambda: self._slow_lookup("rice")))
+        second = asyncio.ensure_future(self.flight.do("rice", lambda: self._slow_lookup("rice")))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "rice"
@@ -0,0 +1,40 @@
+"""
+Unit tests for lean USDA response parsing.
+"""
+import json
+from app.utils.usda import first_search_result
+
+
+def _search_body(query: str, foods: list) -> bytes:
+    """Build a /foods/search response body in USDA key order."""
+    return json.dumps({
+        "totalHits": len(foods),
+        "foodSearchCriteria": {"query": query, "pageSize": 1},
+        "foods": foods,
+        "aggregations": {"dataType": {"SR Legacy": len(foods)}},
+    }).encode("utf-8")
+
+
+class TestFirstSearchResult:
+    """Test cases for first_search_result."""
+
+    def test_returns_first_food_only(self):
+        """Test only foods[0] is returned."""
+        foods = [{"fdcId": 1, "description": "Rice"}, {"fdcId": 2, "description": "Rice, wild"}]
+
+        assert first_search_result(_search_body("rice", foods)) == foods[0]
+
+    def test_no_results(self):
+        """Test an empty result list gives None."""
+        assert first_search_result(_search_body("unobtainium", [])) is None
+
+    def test_ignores_foods_key_inside_query_string(self):
+        """Test a quoted "foods":[ inside the echoed query is not mistaken for the array."""
+        body = _search_body('"foods":[{"fdcId": 9}]', [{"fdcId": 1}])
+
+        assert first_search_result(body) == {"fdcId": 1}
+
+    def test_falls_back_to_full_parse(self):
+        """Test unexpected layouts still parse."""
+        assert first_search_result(b'{"foods": "not a list"}') is None
+        assert first_search_result(b'{"totalHits": 0}') is None
@@ -0,0 +1,161 @@
+"""
+Unit tests for the vision service.
+"""
+import asyncio
+import threading
+
+import pytest
+from PIL import Image
+
+from app.services.food_classifier import FoodClassifier
+from app.services.vision import VisionService
+from app.utils.batching import MicroBatcher
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+
+@pytest.fixture
+def meal_image(tmp_path):
+    """Write a small JPEG to disk."""
+    path = tmp_path / "meal.jpg"
+    Image.new("RGB", (320, 240), (200, 120, 40)).save(path, "JPEG")
+    return str(path)
+
+
+class TestVisionService:
+    """Test cases for off-event-loop image decoding."""
+
+    def setup_method(self):
+        """Fresh service per test."""
+        self.service = VisionService()
+
+    def teardown_method(self):
+        """Stop the decoding pool."""
+        if self.service._executor is not None:
+            self.service._executor.shutdown(wait=True)
+
+    async def test_analyze_decodes_and_reports_timings(self, meal_image):
+        """Analysis returns foods and records decode and loop-blocking times."""
+        foods = await self.service.analyze_food_image(meal_image)
+
+        assert foods
+        stats = self.service.stats()
+        assert stats["images"] == 1
+        assert stats["loop_blocking_ms_max"] >= 0
+        assert stats["decode_ms_max"] >= 0
+
+    async def test_decoding_runs_in_pool_thread(self, meal_image):
+        """Image decoding never runs on the event loop thread."""
+        decode_threads = []
+        prepare = self.service._prepare_image
+
+        def recording_prepare(*args):
+            decode_threads.append(threading.current_thread().name)
+            return prepare(*args)
+
+        self.service._prepare_image = recording_prepare
+        await self.service.analyze_food_image(meal_image)
+
+        assert decode_threads
+        assert decode_threads[0].startswith("vision-decode")
+        assert decode_threads[0] != threading.current_thread().name
+
+    async def test_analyze_in_memory_bytes(self, meal_image, tmp_path):
+        """Downloaded bytes (or a view of them) are analyzed without a file."""
+        with open(meal_image, "rb") as f:
+            data = f.read()
+        self.service._result_cache = None
+
+        from_bytes = await self.service.analyze_food_image(data)
+        from_view = await self.service.analyze_food_image(memoryview(data))
+
+        assert from_bytes and [food.name for food in from_view] == [food.name for food in from_bytes]
+        assert self.service.stats()["images"] == 2
+        assert list(tmp_path.iterdir()) == [tmp_path / "meal.jpg"]
+
+    async def test_resent_photo_reuses_detections(self, meal_image, tmp_path):
+        """A re-sent (re-compressed) photo is answered from the hash cache without decoding."""
+        Image.radial_gradient("L").resize((320, 240)).convert("RGB").save(meal_image, "JPEG")
+        first = await self.service.analyze_food_image(meal_image)
+        copy = tmp_path / "forwarded.jpg"
+        Image.open(meal_image).save(copy, "JPEG", quality=50)
+
+        prepared = []
+        self.service._prepare_image = lambda *args: prepared.append(args)
+        second = await self.service.analyze_food_image(str(copy))
+
+        assert [food.name for food in second] == [food.name for food in first]
+        assert prepared == []
+        cache = self.service.stats()["result_cache"]
+        assert cache["hits"] == 1
+        assert cache["hit_rate"] == 0.5
+
+    async def test_flat_photos_do_not_share_detections(self, onnx_food_model, tmp_path):
+        """Flat photos hash alike, so they bypass the hash cache."""
+        self.service.demo_mode = False
+        self.service.classifier = FoodClassifier(onnx_food_model, top_k=1)
+        results = []
+        for name, colour in (("red", (230, 10, 10)), ("green", (10, 230, 10))):
+            path = tmp_path / f"{name}.jpg"
+            Image.new("RGB", (320, 240), colour).save(path, "JPEG")
+            results.append(await self.service.analyze_food_image(str(path)))
+
+        assert [[food.name for food in foods] for foods in results] == [["Red Apple"], ["Green Salad"]]
+        cache = self.service.stats()["result_cache"]
+        assert cache["hits"] == 0
+        assert cache["low_detail"] == 2
+        assert len(self.service._result_cache) == 0
+
+    async def test_expired_deadline_skips_decoding(self, meal_image):
+        """No decoding is queued once the deadline is spent."""
+        with pytest.raises(DeadlineExceeded):
+            await self.service.analyze_food_image(meal_image, deadline=Deadline(0.0))
+
+        assert self.service.stats()["images"] == 0
+
+    async def test_missing_image_fails(self, tmp_path):
+        """Decode errors in the pool surface as vision failures."""
+        with pytest.raises(Exception, match="Vision analysis failed"):
+            await self.service.analyze_food_image(str(tmp_path / "missing.jpg"))
+
+    async def test_onnx_backend_uses_classifier_predictions(self, onnx_food_model, tmp_path):
+        """With a local model, detections come from its predictions."""
+        self.service.demo_mode = False
+        self.service.classifier = FoodClassifier(onnx_food_model, top_k=3)
+        await self.service.startup()
+        path = tmp_path / "apple.png"
+        Image.new("RGB", (320, 240), (230, 10, 10)).save(path)
+
+        foods = await self.service.analyze_food_image(str(path))
+
+        assert [food.name for food in foods] == ["Red Apple"]
+        assert self.service.stats()["classifier"]["warmup_ms"] is not None
+
+    def test_preload_loads_single_threaded_session(self, onnx_food_model):
+        """Preloading before fork creates the session with one intra-op thread."""
+        self.service.classifier = FoodClassifier(onnx_food_model, intra_op_threads=4)
+
+        self.service.preload()
+
+        assert self.service.classifier.loaded
+        assert self.service.classifier.intra_op_threads == 1
+
+    async def test_concurrent_images_share_one_forward_pass(self, onnx_food_model, tmp_path):
+        """Concurrent analyses are micro-batched and each gets its own foods."""
+        self.service.demo_mode = False
+        self.service.classifier = FoodClassifier(onnx_food_model, top_k=1)
+        self.service._batcher = MicroBatcher(
+            self.service._classify_batch, max_batch_size=3, max_wait_seconds=0.5
+        )
+        colours = {"red": (230, 10, 10), "green": (10, 230, 10), "blue": (10, 10, 230)}
+        paths = []
+        for name, colour in colours.items():
+            path = tmp_path / f"{name}.png"
+            Image.new("RGB", (200, 200), colour).save(path)
+            paths.append(str(path))
+
+        results = await asyncio.gather(*(self.service.analyze_food_image(path) for path in paths))
+
+        assert [[food.name for food in foods] for foods in results] == [
+            ["Red Apple"], ["Green Salad"], ["Blue Cheese"]
+        ]
+        assert self.service.stats()["batching"]["batches"] == 1
@@ -0,0 +1,119 @@
+"""
+Unit tests for vision pool work and the process-pool mode.
+"""
+import pytest
+from PIL import Image
+
+from app.services import vision_worker
+from app.services.food_classifier import FoodClassifier
+from app.services.vision import VisionService
+from app.utils.image import ImageRejectedError
+
+
+@pytest.fixture
+def red_photo(tmp_path):
+    """Path and bytes of a red JPEG."""
+    path = tmp_path / "apple.jpg"
+    Image.new("RGB", (320, 240), (230, 10, 10)).save(path, "JPEG")
+    return str(path)
+
+
+@pytest.fixture
+def textured_photo(tmp_path):
+    """Path of a JPEG with enough texture for a meaningful perceptual hash."""
+    path = tmp_path / "plate.jpg"
+    Image.radial_gradient("L").resize((320, 240)).convert("RGB").save(path, "JPEG")
+    return str(path)
+
+
+class TestSharedImage:
+    """Test cases for shared memory image handoff."""
+
+    def test_shared_image_matches_file(self, red_photo):
+        """An image read from shared memory equals the file."""
+        with open(red_photo, "rb") as f:
+            data = f.read()
+
+        with vision_worker.share_image(data) as source:
+            info = vision_worker.prepare_image(source, 0.0)
+            assert vision_worker.hash_image(source) == vision_worker.hash_image(red_photo)
+
+        assert (info["width"], info["height"], info["format"]) == (320, 240, "JPEG")
+
+    def test_rejected_image_is_not_hashed(self, tmp_path, monkeypatch):
+        """Header checks run before any pixels are decoded for the hash."""
+        path = tmp_path / "small.gif"
+        Image.new("RGB", (100, 100), (230, 10, 10)).save(path, "GIF")
+        decoded = []
+        monkeypatch.setattr(vision_worker, "dhash", lambda img: decoded.append(img))
+
+        with pytest.raises(ImageRejectedError):
+            vision_worker.hash_image(str(path))
+
+        assert decoded == []
+
+    def test_segment_removed_after_use(self, red_photo):
+        """The shared memory segment is unlinked on exit."""
+        with vision_worker.share_image(b"not an image") as (name, size):
+            pass
+
+        with pytest.raises(FileNotFoundError):
+            vision_worker.shared_memory.SharedMemory(name=name)
+
+
+class TestProcessPoolMode:
+    """Test cases for VISION_EXECUTOR=process."""
+
+    async def test_workers_load_model_and_classify(self, onnx_food_model, red_photo, monkeypatch):
+        """Worker processes load the model once and return predictions."""
+        # Spawned workers read their settings from the environment
+        monkeypatch.setenv("VISION_MODEL_PATH", onnx_food_model)
+        service = VisionService()
+        service.demo_mode = False
+        service.classifier = FoodClassifier(onnx_food_model)
+        service._process_mode = True
+        service._result_cache = None
+        try:
+            await service.startup()
+            foods = await service.analyze_food_image(red_photo)
+
+            with open(red_photo, "rb") as f, vision_worker.share_image(f.read()) as source:
+                image_info = await service._prepare_image_off_loop(source)
+        finally:
+            await service.shutdown()
+
+        assert [food.name for food in foods] == ["Red Apple"]
+        assert image_info["predictions"][0]["label"] == "red_apple"
+        assert service.stats()["executor"] == "process"
+        assert not service.classifier.loaded  # The parent never loads the model
+
+    async def test_result_cache_hashes_in_workers(self, textured_photo):
+        """With the default result cache, hashing runs in worker processes too."""
+        service = VisionService()
+        service._process_mode = True
+        assert service._result_cache is not None
+        try:
+            await service.startup()
+            first = await service.analyze_food_image(textured_photo)
+            second = await service.analyze_food_image(textured_photo)
+        finally:
+            await service.shutdown()
+
+        assert first and [food.name for food in second] == [food.name for food in first]
+        assert service.stats()["result_cache"]["hits"] == 1
+
+    async def test_in_memory_image_through_shared_memory(self, textured_photo):
+        """Downloaded bytes reach worker processes (hashing and decoding) without a file."""
+        with open(textured_photo, "rb") as f:
+            data = f.read()
+        service = VisionService()
+        service._process_mode = True
+        try:
+            await service.startup()
+            first = await service.analyze_food_image(data)
+            second = await service.analyze_food_image(memoryview(data))
+        finally:
+            await service.shutdown()
+
+        assert first and [food.name for food in second] == [food.name for food in first]
+        assert service.stats()["result_cache"]["hits"] == 1
@@ -0,0 +1,94 @@
+"""
+Unit tests for the WhatsApp media download.
+"""
+import asyncio
+import io
+import time
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app.services import whatsapp
+from app.services.whatsapp import WhatsAppService
+from app.utils.deadline import Deadline, DeadlineExceeded
+
+
+def photo_bytes(size=(800, 600)) -> bytes:
+    """Encode a noisy (large) JPEG."""
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 40).convert("RGB").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class TestDownloadImage:
+    """Test cases for streaming media downloads."""
+
+    def setup_method(self):
+        """Service whose HTTP clients are served by a mock transport."""
+        self.service = WhatsAppService()
+        self.media = b""
+        self.content_length = True
+        self.chunks_sent = 0
+        self.chunk_delay = 0.0
+
+    @pytest.fixture(autouse=True)
+    def mock_graph_api(self, monkeypatch):
+        """Route httpx.AsyncClient in the WhatsApp service through _handle_request."""
+        client_class = httpx.AsyncClient
+        transport = httpx.MockTransport(self._handle_request)
+        monkeypatch.setattr(
+            whatsapp.httpx, "AsyncClient",
+            lambda **kwargs: client_class(transport=transport, **kwargs)
+        )
+
+    def _handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer the media URL lookup, then stream the media in 16KB chunks."""
+        if request.url.host != "media.example":
+            return httpx.Response(200, json={"url": "https://media.example/media-1"})
+
+        async def body():
+            for i in range(0, len(self.media), 16 * 1024):
+                await asyncio.sleep(self.chunk_delay)
+                self.chunks_sent += 1
+                yield self.media[i:i + 16 * 1024]
+
+        headers = {"Content-Length": str(len(self.media))} if self.content_length else {}
+        return httpx.Response(200, headers=headers, content=body())
+
+    async def test_downloads_image_into_memory(self):
+        """The image comes back as bytes."""
+        self.media = photo_bytes()
+
+        assert await self.service.download_image("media-1") == self.media
+
+    async def test_oversized_announced_image_not_downloaded(self, monkeypatch):
+        """A Content-Length over the cap is refused before reading the body."""
+        self.media = photo_bytes()
+        monkeypatch.setattr(settings, "max_image_size_mb", 0)
+
+        assert await self.service.download_image("media-1") is None
+        assert self.chunks_sent == 0
+
+    async def test_oversized_stream_abandoned_at_cap(self, monkeypatch):
+        """Without a Content-Length the download stops once past the cap."""
+        self.media = photo_bytes((3000, 2000))
+        self.content_length = False
+        monkeypatch.setattr(settings, "max_image_size_mb", 1)
+
+        assert await self.service.download_image("media-1") is None
+        assert self.chunks_sent * 16 * 1024 < len(self.media)
+
+    async def test_trickling_download_stops_at_deadline(self, monkeypatch):
+        """A server sending slowly cannot hold the download past the deadline."""
+        monkeypatch.setattr(settings, "response_reply_reserve_seconds", 0.0)
+        self.media = photo_bytes()
+        self.chunk_delay = 0.1  # Every read is well within httpx's timeout
+
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded, match="image download"):
+            await self.service.download_image("media-1", Deadline(0.3))
+
+        assert time.monotonic() - started < 0.6
+        assert self.chunks_sent * 16 * 1024 < len(self.media)
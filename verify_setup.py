@@ -88,6 +88,7 @@ def check_dependencies():
         "requests",
         "huggingface_hub",
         "PIL",
+        "numpy",
     ]
 
     all_installed = True